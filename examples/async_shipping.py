@@ -0,0 +1,72 @@
+"""
+Ships records from an asyncio application to a local asyncio HTTP server.
+
+The server runs on its own loop in a background thread, answers every POST with 200 and counts
+the records it received. Records are logged from coroutines and from a worker thread; whatever
+is still queued is sent when `asyncio.run` shuts the application loop down.
+
+    python examples/async_shipping.py
+"""
+import asyncio
+import logging
+import threading
+
+from logease.handlers.shipper import AsyncHTTPShipper, AsyncHTTPHandler
+
+received = []
+
+
+async def serve(reader, writer):
+    while True:
+        request_line = await reader.readline()
+        if not request_line:
+            break
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        body = await reader.readexactly(length)
+        received.extend(body.splitlines())
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+        await writer.drain()
+    writer.close()
+
+
+def run_server(started):
+    async def server_main():
+        await asyncio.start_server(serve, "127.0.0.1", 8089)
+        started.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(server_main())
+
+
+async def main(handler, logger):
+    handler.start()
+
+    worker = threading.Thread(target=lambda: [logger.info("from a thread %d", i) for i in range(1000)])
+    worker.start()
+    for i in range(5000):
+        logger.info("from a coroutine %d", i)
+        if i % 500 == 0:
+            await asyncio.sleep(0)
+    await asyncio.to_thread(worker.join)
+    print("before shutdown:", handler.metrics())
+
+
+if __name__ == "__main__":
+    started = threading.Event()
+    threading.Thread(target=run_server, args=(started,), daemon=True).start()
+    started.wait()
+
+    logger = logging.getLogger("async_example")
+    logger.setLevel(logging.INFO)
+    handler = AsyncHTTPHandler(AsyncHTTPShipper("http://127.0.0.1:8089/logs", batch_size=200))
+    logger.addHandler(handler)
+    asyncio.run(main(handler, logger))
+    print("after shutdown:", handler.metrics())
+    print("server received", len(received), "records")
@@ -0,0 +1,56 @@
+"""
+Measures the cost of turning one structured record into a line of JSON.
+
+Compares the former `as_json_tracer` path (fields dumped into the message, then formatted with
+colors and, for JSON sinks, wrapped and encoded a second time) with `JSONFormatter`, using each
+available encoder backend.
+
+    python examples/benchmark_encoding.py
+"""
+import json
+import logging
+import timeit
+
+from logease.modules.logger import CustomFormatter
+from logease.utils.encoding import JSONFormatter, JSONEncoder, orjson
+
+RECORDS = 20000
+
+fields = {
+    "func_name": "checkout",
+    "args": (1234, "EUR"),
+    "kwargs": {"coupon": "SPRING", "items": [1, 2, 3]},
+    "return_value": {"status": "ok", "total": 99.95},
+}
+
+
+text_formatter = CustomFormatter()
+
+
+def double_encoded():
+    record = logging.LogRecord(
+        "LoglessLogger", logging.INFO, __file__, 0, json.dumps(fields, default=str), None, None
+    )
+    return json.dumps({"message": text_formatter.format(record)})
+
+
+def single_encoded(formatter):
+    record = logging.LogRecord("LoglessLogger", logging.INFO, __file__, 0, "checkout", None, None)
+    record.fields = fields
+    return formatter.format(record)
+
+
+def report(name, func):
+    seconds = min(timeit.repeat(func, number=RECORDS, repeat=3))
+    print(f"{name:<32} {seconds / RECORDS * 1e6:8.2f} us/record")
+
+
+if __name__ == "__main__":
+    report("message + text format + json", double_encoded)
+    stdlib_formatter = JSONFormatter(JSONEncoder("json"))
+    report("JSONFormatter (json)", lambda: single_encoded(stdlib_formatter))
+    if orjson is not None:
+        orjson_formatter = JSONFormatter(JSONEncoder("orjson"))
+        report("JSONFormatter (orjson)", lambda: single_encoded(orjson_formatter))
+    else:
+        print("orjson is not installed, skipping its backend")
@@ -0,0 +1,66 @@
+"""
+Compares logging from many threads through locked handlers and through per-thread buffers.
+
+Each thread logs the same number of records to a console-style `StreamHandler` and a
+`FileHandler`, first attached directly (every record takes both handler locks), then behind a
+`ThreadBufferHandler` (records go to per-thread buffers and one drainer writes them). Output goes
+to os.devnull so that only the logging path is measured.
+
+    python examples/benchmark_threads.py [threads] [records per thread]
+"""
+import os
+import sys
+import time
+import logging
+import threading
+
+from logease.handlers.threadbuffer import ThreadBufferHandler
+
+
+def sinks():
+    console = logging.StreamHandler(open(os.devnull, "w"))
+    console.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    file_handler = logging.FileHandler(os.devnull)
+    file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    return [console, file_handler]
+
+
+def run(logger, threads, records):
+    def work(n):
+        for i in range(records):
+            logger.info("thread %d record %d", n, i)
+
+    workers = [threading.Thread(target=work, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    logging_done = time.perf_counter() - start
+    for handler in logger.handlers:
+        handler.flush()
+    return logging_done, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    records = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    total = threads * records
+
+    direct = logging.getLogger("benchmark.direct")
+    direct.propagate = False
+    direct.setLevel(logging.INFO)
+    direct.handlers = sinks()
+
+    buffered = logging.getLogger("benchmark.buffered")
+    buffered.propagate = False
+    buffered.setLevel(logging.INFO)
+    buffered.handlers = [ThreadBufferHandler(sinks(), capacity=4096)]
+
+    for name, logger in (("direct", direct), ("thread buffers", buffered)):
+        logging_done, written = run(logger, threads, records)
+        print(
+            f"{name:>15}: {total / logging_done:>10,.0f} records/s on the logging threads, "
+            f"{total / written:>10,.0f} records/s written ({threads} threads)"
+        )
+    print(buffered.handlers[0].metrics())
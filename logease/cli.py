@@ -1,6 +1,11 @@
+import re
+import sys
 import argparse
 from termcolor import colored, cprint
 from logease.config.settings import LogConfig
+from logease.handlers.binary import MAGIC, decode_file, render_entry
+from logease.modules.levels import to_levelno
+from logease.utils.logindex import LEVEL_BITS, LogIndex, parse_time, tail, follow
 
 
 class CommandLineInterface:
@@ -14,8 +19,10 @@ class CommandLineInterface:
     def __init__(self) -> None:
         """
         Initializes the command-line interface.
+
+        The banner is printed by `run` for interactive commands only, so commands that
+        stream records to stdout can be piped.
         """
-        self._print_banner()
 
     def _print_banner(self):
         "Prints the banner when the CLI Initialize"
@@ -43,22 +50,41 @@ This method allows dynamic updating of configuration attributes within the insta
 The `key` parameter determines which configuration attribute to update, and the `value`
 parameter provides the new value for that attribute. 
 
+Changes are saved to the configuration file (LOGEASE_CONFIG_FILE, default ~/.logease/config.json)
+and applied by running processes within LOGEASE_CONFIG_WATCH_INTERVAL seconds.
+
 Supported keys include:
     - "level": Updates the logging level.
+    - "levels": Sets per-module / per-function level overrides ("myapp.payments=DEBUG,myapp.jobs.run=ERROR").
+    - "log_destination": Selects the destination ("console", "splunk", "elasticsearch", "api", "local_file", ...).
     - "log_format": Sets the format for log messages.
     - "splunk_host", "splunk_token": Configures Splunk logging.
     - "elastic_host", "elastic_index": Configures Elasticsearch logging.
     - "api_endpoint", "api_key": Sets the API endpoint and key for external logging.
     - "local_file_path": Updates the file path for local logging.
+    - "local_file_format": Selects "text", "json" (one JSON object per line) or the compact "binary" record format for local logging.
+    - "json_encoder": Selects the JSON encoder of JSON output ("auto", "orjson" or "json").
     - "database_uri": Sets the database URI for log storage.
     - "cloud_storage_bucket": Configures the cloud storage bucket for logs.
     - "syslog_server": Sets the Syslog server address.
     - "log_aggregation_service": Configures the log aggregation service.
+    - "aggregation_interval", "aggregation_escalate_level", "aggregation_latency_threshold_ms":
+        Configures the rollup window and the records still sent raw (a latency threshold of 0 disables it).
     - "email_recipients", "smtp_server", "smtp_port", "email_from", "smtp_username", "smtp_password":
         Configures email settings for log notifications.
-    - "message_queue": Sets the message queue for log handling.
+    - "message_queue": Sets the message queue URL for log handling ("local://name", or a scheme added with `register_transport`).
+    - "mq_batch_size", "mq_max_in_flight": Configures message queue batches and the number of unconfirmed batches.
     - "websocket_url": Configures the WebSocket URL for log streaming.
     - "snmp_trap_receiver", "snmp_community", "snmp_port": Configures SNMP settings.
+    - "dedup_window", "dedup_max_keys": Configures duplicate-message suppression (a window of 0 disables it).
+    - "flight_recorder_size", "flight_recorder_level": Configures the in-memory flight recorder (a size of 0 disables it).
+    - "handler_timeout", "handler_retries", "handler_backoff", "handler_max_backoff": Configures network handler timeouts and retries.
+    - "breaker_threshold", "breaker_reset": Configures the network handler circuit breaker.
+    - "handler_fallback", "spool_path": Selects where unsendable records go ("drop", "spool" or "local_file").
+    - "batch_target_latency", "batch_max_size", "batch_max_queue": Configures adaptive batching of network handlers (a target of 0 disables it).
+    - "offload_workers", "offload_compress": Formats records, console output included, in a pool of worker processes
+        (0 workers disables it), writing the local file gzip-compressed to `<local_file_path>.gz`.
+    - "thread_buffer_size", "thread_buffer_interval": Buffers records per thread and writes them from a single drainer (a size of 0 disables it).
         """
 
         print(description)
@@ -76,9 +102,26 @@ Available Commands:
    - Example: `logease available`
 
 3. **config**: 
-   - Updates the configuration attribute of the instance based on the provided key-value pair.
+   - Updates configuration values and saves them to the configuration file
+     (LOGEASE_CONFIG_FILE, default ~/.logease/config.json). Running processes pick them up.
    - Example: `logease config`
 
+4. **decode**: 
+   - Expands a binary log file (LOCAL_FILE_FORMAT=binary) back to text or JSON lines.
+   - Example: `logease decode logs/app.log --format json`
+
+5. **search**: 
+   - Finds records in the local log file by time range, level and pattern, using a sidecar index.
+   - Example: `logease search --since 15m --level ERROR --grep checkout`
+
+6. **tail**: 
+   - Prints the last lines of the local log file, optionally following new records.
+   - Example: `logease tail -n 50 -f`
+
+7. **level**: 
+   - Changes the root level, or the level of one module or decorated function, in running processes.
+   - Example: `logease level DEBUG myapp.payments.charge` (use `reset` as level to remove an override)
+
 Usage Examples:
 
 - To see the list of commands: `help`
@@ -105,9 +148,82 @@ Use the `available` command to see the full list.
             "help", help="Show available commands."
         )
 
+        decode_command_parser = sub_parsers.add_parser(
+            "decode", help="Expand a binary log file to text or JSON."
+        )
+        decode_command_parser.add_argument("path", help="Binary log file to decode.")
+        decode_command_parser.add_argument(
+            "--format", choices=("text", "json"), default="text", help="Output format."
+        )
+        decode_command_parser.add_argument(
+            "--output", default=None, help="Write to this file instead of stdout."
+        )
+
+        search_command_parser = sub_parsers.add_parser(
+            "search", help="Search the local log file by time, level and pattern."
+        )
+        search_command_parser.add_argument(
+            "--file", default=None, help="Log file to search (default is LOCAL_FILE_PATH)."
+        )
+        search_command_parser.add_argument(
+            "--since", default=None, help="Start time, ISO date or relative like 15m, 2h."
+        )
+        search_command_parser.add_argument(
+            "--until", default=None, help="End time, ISO date or relative like 15m, 2h."
+        )
+        search_command_parser.add_argument(
+            "--level",
+            action="append",
+            default=None,
+            type=str.upper,
+            choices=tuple(LEVEL_BITS),
+            help="Level to include, can be repeated.",
+        )
+        search_command_parser.add_argument(
+            "--grep", default=None, help="Regular expression, e.g. a function name."
+        )
+
+        tail_command_parser = sub_parsers.add_parser(
+            "tail", help="Print the last lines of the local log file."
+        )
+        tail_command_parser.add_argument(
+            "--file", default=None, help="Log file to read (default is LOCAL_FILE_PATH)."
+        )
+        tail_command_parser.add_argument(
+            "-n", "--lines", type=int, default=10, help="Number of lines to print."
+        )
+        tail_command_parser.add_argument(
+            "-f", "--follow", action="store_true", help="Keep printing appended records."
+        )
+
+        level_command_parser = sub_parsers.add_parser(
+            "level", help="Change a level at runtime for running processes."
+        )
+        level_command_parser.add_argument(
+            "level", help="New level (DEBUG, INFO, WARNING, ERROR, CRITICAL) or 'reset'."
+        )
+        level_command_parser.add_argument(
+            "target", nargs="?", default=None, help="Module or function, e.g. myapp.payments.charge."
+        )
+
         args = parser.parse_args()
 
+        if args.command == "decode":
+            self.decode(args.path, args.format, args.output)
+            return
+
+        if args.command == "search":
+            self.search(args.file, args.since, args.until, args.level, args.grep)
+            return
+
+        if args.command == "tail":
+            self.tail(args.file, args.lines, args.follow)
+            return
+
+        self._print_banner()
+
         if args.command == "config":
+            config_instance = LogConfig()
             while True:
                 
                 print(colored("\nConfiguration Field: ", "light_green"), end="")
@@ -119,18 +235,149 @@ Use the `available` command to see the full list.
                 print(colored("Quit (type 'y/yes'): ", "light_green"), end="")
                 quit = input()
 
-                config_instance = LogConfig()
-                config_instance.change_config_values(field, value)
+                try:
+                    config_instance.change_config_values(field, value)
+                except ValueError as e:
+                    cprint(f"\n{e}", "light_red", file=sys.stderr)
 
                 if quit.lower() == "y" or quit.lower() == "yes":
                     break
 
+            config_instance.save()
+            cprint(f"\nConfiguration saved to {config_instance.path}.", "white")
+
+        elif args.command == "level":
+            self.change_level(args.level, args.target)
+
         elif args.command == "available":
             self.show_available_configuration()
 
         elif args.command == "help":
             self.show_commands()
 
+    def change_level(self, level, target=None):
+        """
+        Saves a root level or a per-module / per-function override to the configuration file,
+        from where running processes pick it up.
+
+        Args:
+            level (str): The new level, or "reset" to remove the override of `target`.
+            target (str): The module or function, or None for the root level.
+        """
+        config_instance = LogConfig()
+        try:
+            if target is None:
+                to_levelno(level)
+                config_instance.change_config_values("level", level.upper())
+            else:
+                overrides = dict(config_instance.levels)
+                if level.lower() == "reset":
+                    overrides.pop(target, None)
+                else:
+                    to_levelno(level)
+                    overrides[target] = level.upper()
+                config_instance.change_config_values("levels", overrides)
+        except ValueError as e:
+            cprint(f"\n{e}", "light_red")
+            return
+        config_instance.save()
+        cprint(f"\nLevel saved to {config_instance.path}.", "white")
+
+    def decode(self, path, output_format="text", output=None):
+        """
+        Streams the records of a binary log file as text or JSON lines.
+
+        Args:
+            path (str): The binary log file.
+            output_format (str): "text" or "json".
+            output (str): The file to write to, or None for stdout.
+        """
+        stream = open(output, "w") if output else sys.stdout
+        try:
+            for entry in decode_file(path):
+                stream.write(render_entry(entry, output_format))
+                stream.write("\n")
+        except ValueError as e:
+            cprint(f"\n{path}: {e}", "light_red", file=sys.stderr)
+        finally:
+            if output:
+                stream.close()
+
+    def search(self, path=None, since=None, until=None, levels=None, pattern=None):
+        """
+        Streams the records of a log file matching a time range, levels and a pattern.
+
+        Text and JSON lines files are searched through their sidecar index; binary files are decoded and filtered.
+        Invalid arguments and unreadable files are reported on stderr.
+
+        Args:
+            path (str): The log file, or None for the configured LOCAL_FILE_PATH.
+            since (str): The start time, as an ISO date or a duration such as "15m".
+            until (str): The end time, as an ISO date or a duration such as "15m".
+            levels (list): The levels to include, or None for all.
+            pattern (str): A regular expression records must match.
+        """
+        path = path or LogConfig().local_file_path
+        try:
+            self._search(path, since, until, levels, pattern)
+        except (ValueError, OSError, re.error) as e:
+            cprint(f"\n{path}: {e}", "light_red", file=sys.stderr)
+
+    def _search(self, path, since, until, levels, pattern):
+        start = parse_time(since) if since else None
+        end = parse_time(until) if until else None
+        levels = {level.upper() for level in levels} if levels else None
+        output = sys.stdout.buffer
+
+        with open(path, "rb") as stream:
+            is_binary = stream.read(len(MAGIC)) == MAGIC
+
+        if is_binary:
+            regex = re.compile(pattern) if pattern else None
+            for entry in decode_file(path):
+                if start is not None and entry["timestamp"] < start:
+                    continue
+                if end is not None and entry["timestamp"] >= end:
+                    continue
+                if levels and entry["level"] not in levels:
+                    continue
+                line = render_entry(entry)
+                if regex is not None and not regex.search(line):
+                    continue
+                output.write(line.encode() + b"\n")
+                output.flush()
+            return
+
+        for record in LogIndex(path).search(start, end, levels, pattern.encode() if pattern else None):
+            output.write(record)
+            output.flush()
+
+    def tail(self, path=None, lines=10, keep_following=False):
+        """
+        Prints the last lines of a log file and optionally follows it.
+
+        Args:
+            path (str): The log file, or None for the configured LOCAL_FILE_PATH.
+            lines (int): The number of lines to print.
+            keep_following (bool): Keep printing data appended to the file until interrupted.
+        """
+        path = path or LogConfig().local_file_path
+        output = sys.stdout.buffer
+        try:
+            data, position = tail(path, lines)
+        except (ValueError, OSError) as e:
+            cprint(f"\n{path}: {e}", "light_red", file=sys.stderr)
+            return
+        output.write(data)
+        output.flush()
+        if keep_following:
+            try:
+                for chunk in follow(path, position):
+                    output.write(chunk)
+                    output.flush()
+            except KeyboardInterrupt:
+                pass
+
 
 def main():
     """
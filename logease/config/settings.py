@@ -1,8 +1,58 @@
 import os
-from termcolor import cprint
+import json
+import threading
+from logease.modules.levels import parse_level, parse_overrides
+from logease.utils.errors import report_error
+
+
+def config_file_path():
+    """
+    Returns the path of the persisted configuration file.
+
+    The path is taken from the `LOGEASE_CONFIG_FILE` environment variable and defaults to
+    `~/.logease/config.json`.
+    """
+    return os.getenv('LOGEASE_CONFIG_FILE', os.path.join(os.path.expanduser('~'), '.logease', 'config.json'))
+
+
+def _env(name, default, parse=None):
+    """
+    Returns the environment variable `name` converted with `parse`, or `default` when it is unset.
+
+    An invalid value is reported on stderr and the default is used instead.
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    if parse is None:
+        return value
+    try:
+        return parse(value)
+    except ValueError as e:
+        report_error(f"invalid value {value!r} for {name}: {e}; using {default!r}", exc_info=False)
+        return default
+
+
 class LogConfig:
-    def __init__(self) -> None:
-        self.log_level = os.getenv("LOG_LEVEL", "DEBUG")
+    _snapshot = None
+    _snapshot_signature = None
+    _snapshot_lock = threading.Lock()
+
+    def __init__(self, path=None) -> None:
+        """
+        Reads the configuration from the environment, then applies the values persisted in the
+        configuration file on top of it.
+
+        Creating a `LogConfig` reads every environment variable and the file again; processes
+        that only need the current values should use `LogConfig.current()` instead.
+
+        Args:
+            path (str): The configuration file, defaults to `config_file_path()`.
+        """
+        self.path = path or config_file_path()
+        self._file_values = {}
+        self.log_level = _env("LOG_LEVEL", "DEBUG", parse_level)
+        self.levels = _env("LOG_LEVELS", {}, parse_overrides)
         self.log_format = os.getenv("LOG_FORMAT", '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         
         self.splunk_host = os.getenv('SPLUNK_HOST', None)
@@ -12,13 +62,18 @@ class LogConfig:
         self.api_endpoint = os.getenv('API_ENDPOINT', None)
         self.api_key = os.getenv('API_KEY', None)
         self.local_file_path = os.getenv('LOCAL_FILE_PATH', 'logs/app.log')
+        self.local_file_format = os.getenv('LOCAL_FILE_FORMAT', 'text')
+        self.json_encoder = os.getenv('LOG_JSON_ENCODER', 'auto')
         self.database_uri = os.getenv('DATABASE_URI', None)
         self.cloud_storage_bucket = os.getenv('CLOUD_STORAGE_BUCKET', None)
         self.syslog_server = os.getenv('SYSLOG_SERVER', None)
         self.log_aggregation_service = os.getenv('LOG_AGGREGATION_SERVICE', None)
+        self.aggregation_interval = _env('LOG_AGGREGATION_INTERVAL', 60.0, float)
+        self.aggregation_escalate_level = _env('LOG_AGGREGATION_ESCALATE_LEVEL', 'ERROR', parse_level)
+        self.aggregation_latency_threshold_ms = _env('LOG_AGGREGATION_LATENCY_THRESHOLD_MS', 0.0, float)
         self.email_recipients = os.getenv('EMAIL_RECIPIENTS', None)
         self.smtp_server = os.getenv('SMTP_SERVER', None)
-        self.smtp_port = int(os.getenv('SMTP_PORT', 587))
+        self.smtp_port = _env('SMTP_PORT', 587, int)
         self.email_from = os.getenv('EMAIL_FROM', None)
         self.smtp_username = os.getenv('SMTP_USERNAME', None)
         self.smtp_password = os.getenv('SMTP_PASSWORD', None)
@@ -26,9 +81,32 @@ class LogConfig:
         self.websocket_url = os.getenv('WEBSOCKET_URL', None)
         self.snmp_trap_receiver = os.getenv('SNMP_TRAP_RECEIVER', None)
         self.snmp_community = os.getenv('SNMP_COMMUNITY', 'public')
-        self.snmp_port = int(os.getenv('SNMP_PORT', 162))
+        self.snmp_port = _env('SNMP_PORT', 162, int)
+        self.dedup_window = _env('LOG_DEDUP_WINDOW', 0.0, float)
+        self.dedup_max_keys = _env('LOG_DEDUP_MAX_KEYS', 1024, int)
+        self.flight_recorder_size = _env('LOG_FLIGHT_RECORDER_SIZE', 0, int)
+        self.flight_recorder_level = _env('LOG_FLIGHT_RECORDER_LEVEL', 'WARNING', parse_level)
+        self.handler_timeout = _env('LOG_HANDLER_TIMEOUT', 5.0, float)
+        self.handler_retries = _env('LOG_HANDLER_RETRIES', 2, int)
+        self.handler_backoff = _env('LOG_HANDLER_BACKOFF', 0.1, float)
+        self.handler_max_backoff = _env('LOG_HANDLER_MAX_BACKOFF', 2.0, float)
+        self.breaker_threshold = _env('LOG_BREAKER_THRESHOLD', 5, int)
+        self.breaker_reset = _env('LOG_BREAKER_RESET', 30.0, float)
+        self.handler_fallback = os.getenv('LOG_HANDLER_FALLBACK', 'drop')
+        self.spool_path = os.getenv('LOG_SPOOL_PATH', 'logs/spool.bin')
+        self.batch_target_latency = _env('LOG_BATCH_TARGET_LATENCY', 0.0, float)
+        self.batch_max_size = _env('LOG_BATCH_MAX_SIZE', 500, int)
+        self.batch_max_queue = _env('LOG_BATCH_MAX_QUEUE', 10000, int)
+        self.mq_batch_size = _env('LOG_MQ_BATCH_SIZE', 100, int)
+        self.mq_max_in_flight = _env('LOG_MQ_MAX_IN_FLIGHT', 8, int)
+        self.offload_workers = _env('LOG_OFFLOAD_WORKERS', 0, int)
+        self.offload_compress = os.getenv('LOG_OFFLOAD_COMPRESS', 'false').lower() == 'true'
+        self.thread_buffer_size = _env('LOG_THREAD_BUFFER_SIZE', 0, int)
+        self.thread_buffer_interval = _env('LOG_THREAD_BUFFER_INTERVAL', 0.05, float)
+        self.config_watch_interval = _env('LOGEASE_CONFIG_WATCH_INTERVAL', 2.0, float)
 
         self.override_configs()
+        self.load()
 
     def override_configs(self):
         if os.getenv('USE_SPLUNK', 'false').lower() == 'true':
@@ -58,8 +136,100 @@ class LogConfig:
         else:
             self.log_destination = 'console'
 
+    def __setattr__(self, name, value):
+        if self.__dict__.get('_frozen'):
+            raise AttributeError(f"LogConfig snapshot is read-only, cannot set '{name}'")
+        super().__setattr__(name, value)
+
     def get_log_destination(self):
         return self.log_destination
+
+    def load(self):
+        """
+        Applies the values persisted in the configuration file, if it exists.
+
+        Invalid values are reported on stderr and skipped.
+        """
+        try:
+            with open(self.path) as config_file:
+                values = json.load(config_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            report_error(f"ignoring unreadable configuration file {self.path}: {e}", exc_info=False)
+            return
+        for key, value in values.items():
+            try:
+                self.change_config_values(key, value)
+            except ValueError as e:
+                # The environment or default value is kept, so a bad value cannot break every import.
+                report_error(f"{self.path}: {e}; the value is ignored", exc_info=False)
+
+    def save(self):
+        """
+        Persists the values changed through `change_config_values` to the configuration file.
+
+        The file is replaced atomically, so a process watching it never reads a partial write.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as config_file:
+            json.dump(self._file_values, config_file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def freeze(self):
+        """
+        Makes the instance read-only, so that it can be shared as a snapshot.
+        """
+        self._frozen = True
+        return self
+
+    @classmethod
+    def current(cls):
+        """
+        Returns the shared, read-only configuration snapshot, loading it on first use.
+        """
+        snapshot = cls._snapshot
+        if snapshot is None:
+            with cls._snapshot_lock:
+                if cls._snapshot is None:
+                    cls._snapshot_signature = cls._file_signature(config_file_path())
+                    cls._snapshot = cls().freeze()
+                snapshot = cls._snapshot
+        return snapshot
+
+    @classmethod
+    def refresh(cls):
+        """
+        Reloads the shared snapshot if the configuration file changed since it was loaded.
+
+        The check is a single `stat` call comparing modification time, size and inode. If the new
+        snapshot cannot be built, the previous one is kept until the file changes again.
+
+        Returns:
+            LogConfig | None: The new snapshot, or None if the file did not change.
+        """
+        path = config_file_path()
+        signature = cls._file_signature(path)
+        if cls._snapshot is not None and signature == cls._snapshot_signature:
+            return None
+        with cls._snapshot_lock:
+            try:
+                snapshot = cls(path).freeze()
+            finally:
+                cls._snapshot_signature = signature
+            cls._snapshot = snapshot
+            return snapshot
+
+    @staticmethod
+    def _file_signature(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
     
     def change_config_values(self, key, value):
         """
@@ -69,35 +239,57 @@ class LogConfig:
         The `key` parameter determines which configuration attribute to update, and the `value`
         parameter provides the new value for that attribute. 
 
+        Changed values are remembered and written to the configuration file by `save`.
+
         Supported keys include:
             - "level": Updates the logging level.
+            - "levels": Sets per-module / per-function level overrides ("myapp.payments=DEBUG,myapp.jobs.run=ERROR").
+            - "log_destination": Selects the destination ("console", "splunk", "elasticsearch", "api", "local_file", ...).
             - "log_format": Sets the format for log messages.
             - "splunk_host", "splunk_token": Configures Splunk logging.
             - "elastic_host", "elastic_index": Configures Elasticsearch logging.
             - "api_endpoint", "api_key": Sets the API endpoint and key for external logging.
             - "local_file_path": Updates the file path for local logging.
+            - "local_file_format": Selects "text", "json" (one JSON object per line) or the compact "binary" record format for local logging.
+            - "json_encoder": Selects the JSON encoder of JSON output ("auto", "orjson" or "json").
             - "database_uri": Sets the database URI for log storage.
             - "cloud_storage_bucket": Configures the cloud storage bucket for logs.
             - "syslog_server": Sets the Syslog server address.
             - "log_aggregation_service": Configures the log aggregation service.
+            - "aggregation_interval", "aggregation_escalate_level", "aggregation_latency_threshold_ms":
+                Configures the rollup window and the records still sent raw (a latency threshold of 0 disables it).
             - "email_recipients", "smtp_server", "smtp_port", "email_from", "smtp_username", "smtp_password":
                 Configures email settings for log notifications.
-            - "message_queue": Sets the message queue for log handling.
+            - "message_queue": Sets the message queue URL for log handling ("local://name", or a scheme added with `register_transport`).
+            - "mq_batch_size", "mq_max_in_flight": Configures message queue batches and the number of unconfirmed batches.
             - "websocket_url": Configures the WebSocket URL for log streaming.
             - "snmp_trap_receiver", "snmp_community", "snmp_port": Configures SNMP settings.
+            - "dedup_window", "dedup_max_keys": Configures duplicate-message suppression (a window of 0 disables it).
+            - "flight_recorder_size", "flight_recorder_level": Configures the in-memory flight recorder (a size of 0 disables it).
+            - "handler_timeout", "handler_retries", "handler_backoff", "handler_max_backoff": Configures network handler timeouts and retries.
+            - "breaker_threshold", "breaker_reset": Configures the network handler circuit breaker.
+            - "handler_fallback", "spool_path": Selects where unsendable records go ("drop", "spool" or "local_file").
+            - "batch_target_latency", "batch_max_size", "batch_max_queue": Configures adaptive batching of network handlers (a target of 0 disables it).
+            - "offload_workers", "offload_compress": Formats records, console output included, in a pool of worker processes
+                (0 workers disables it), writing the local file gzip-compressed to `<local_file_path>.gz`.
+            - "thread_buffer_size", "thread_buffer_interval": Buffers records per thread and writes them from a single drainer (a size of 0 disables it).
 
-        If the provided `key` does not match any of the supported attributes, a KeyError is raised.
+        Values are converted and validated before anything is changed: numbers must parse and levels must
+        be supported level names. A `key` that does not match any of the supported attributes is
+        reported on stderr and ignored.
 
         Parameters:
             key (str): The name of the configuration attribute to update.
             value (str): The new value for the configuration attribute.
 
         Raises:
-            KeyError: If the provided `key` does not match any of the supported configuration attributes.
+            ValueError: If the value is not valid for the attribute; the configuration is left unchanged.
     """
         config_map = {
-            "level": lambda v: setattr(self, 'log_level', v),
+            "level": lambda v: setattr(self, 'log_level', parse_level(v)),
+            "levels": lambda v: setattr(self, 'levels', parse_overrides(v)),
             "log_format": lambda v: setattr(self, 'log_format', v),
+            "log_destination": lambda v: setattr(self, 'log_destination', v),
             "splunk_host": lambda v: setattr(self, 'splunk_host', v),
             "splunk_token": lambda v: setattr(self, 'splunk_token', v),
             "elastic_host": lambda v: setattr(self, 'elastic_host', v),
@@ -105,10 +297,15 @@ class LogConfig:
             "api_endpoint": lambda v: setattr(self, 'api_endpoint', v),
             "api_key": lambda v: setattr(self, 'api_key', v),
             "local_file_path": lambda v: setattr(self, 'local_file_path', v),
+            "local_file_format": lambda v: setattr(self, 'local_file_format', v),
+            "json_encoder": lambda v: setattr(self, 'json_encoder', v),
             "database_uri": lambda v: setattr(self, 'database_uri', v),
             "cloud_storage_bucket": lambda v: setattr(self, 'cloud_storage_bucket', v),
             "syslog_server": lambda v: setattr(self, 'syslog_server', v),
             "log_aggregation_service": lambda v: setattr(self, 'log_aggregation_service', v),
+            "aggregation_interval": lambda v: setattr(self, 'aggregation_interval', float(v)),
+            "aggregation_escalate_level": lambda v: setattr(self, 'aggregation_escalate_level', parse_level(v)),
+            "aggregation_latency_threshold_ms": lambda v: setattr(self, 'aggregation_latency_threshold_ms', float(v)),
             "email_recipients": lambda v: setattr(self, 'email_recipients', v),
             "smtp_server": lambda v: setattr(self, 'smtp_server', v),
             "smtp_port": lambda v: setattr(self, 'smtp_port', int(v)),
@@ -120,11 +317,36 @@ class LogConfig:
             "snmp_trap_receiver": lambda v: setattr(self, 'snmp_trap_receiver', v),
             "snmp_community": lambda v: setattr(self, 'snmp_community', v),
             "snmp_port": lambda v: setattr(self, 'snmp_port', int(v)),
+            "dedup_window": lambda v: setattr(self, 'dedup_window', float(v)),
+            "dedup_max_keys": lambda v: setattr(self, 'dedup_max_keys', int(v)),
+            "flight_recorder_size": lambda v: setattr(self, 'flight_recorder_size', int(v)),
+            "flight_recorder_level": lambda v: setattr(self, 'flight_recorder_level', parse_level(v)),
+            "handler_timeout": lambda v: setattr(self, 'handler_timeout', float(v)),
+            "handler_retries": lambda v: setattr(self, 'handler_retries', int(v)),
+            "handler_backoff": lambda v: setattr(self, 'handler_backoff', float(v)),
+            "handler_max_backoff": lambda v: setattr(self, 'handler_max_backoff', float(v)),
+            "breaker_threshold": lambda v: setattr(self, 'breaker_threshold', int(v)),
+            "breaker_reset": lambda v: setattr(self, 'breaker_reset', float(v)),
+            "handler_fallback": lambda v: setattr(self, 'handler_fallback', v),
+            "spool_path": lambda v: setattr(self, 'spool_path', v),
+            "batch_target_latency": lambda v: setattr(self, 'batch_target_latency', float(v)),
+            "batch_max_size": lambda v: setattr(self, 'batch_max_size', int(v)),
+            "batch_max_queue": lambda v: setattr(self, 'batch_max_queue', int(v)),
+            "mq_batch_size": lambda v: setattr(self, 'mq_batch_size', int(v)),
+            "mq_max_in_flight": lambda v: setattr(self, 'mq_max_in_flight', int(v)),
+            "offload_workers": lambda v: setattr(self, 'offload_workers', int(v)),
+            "offload_compress": lambda v: setattr(self, 'offload_compress', str(v).lower() == 'true'),
+            "thread_buffer_size": lambda v: setattr(self, 'thread_buffer_size', int(v)),
+            "thread_buffer_interval": lambda v: setattr(self, 'thread_buffer_interval', float(v)),
         }
         
         if key in config_map:
-            config_map[key](value)
+            try:
+                config_map[key](value)
+            except (TypeError, ValueError, AttributeError) as e:
+                raise ValueError(f"Invalid value {value!r} for {key}: {e}") from None
+            self._file_values[key] = value
         else:
-            cprint(f"\nUnknown configuration key: {key}", "light_red")
+            report_error(f"unknown configuration key: {key}", exc_info=False)
 
 
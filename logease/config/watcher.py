@@ -0,0 +1,40 @@
+import threading
+
+from logease.utils.errors import report_error
+
+
+class ConfigWatcher(threading.Thread):
+    """
+    A daemon thread that periodically calls a reload callback.
+
+    The callback is expected to be cheap when nothing changed, such as `Logger.reload`, which
+    only compares the configuration file's `stat` signature. Exceptions raised by the callback
+    are reported on stderr (see `report_error`) and do not stop the watcher.
+
+    Args:
+        interval (float): The number of seconds between checks.
+        callback (callable): The function called on every check.
+
+    Example:
+        watcher = ConfigWatcher(2.0, logger.reload)
+        watcher.start()
+    """
+
+    def __init__(self, interval, callback):
+        super().__init__(name="logease-config-watcher", daemon=True)
+        self.interval = interval
+        self.callback = callback
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.callback()
+            except Exception:
+                report_error("configuration reload failed")
+
+    def stop(self):
+        """
+        Stops the watcher after the current check.
+        """
+        self._stopped.set()
@@ -1,9 +1,10 @@
 import time
-import json
 import traceback
 from functools import wraps
 
 from logease.modules.logger import Logger
+from logease.utils.fingerprint import traceback_cache
+from logease.utils.encoding import get_encoder
 
 logger = Logger()
 
@@ -21,14 +22,19 @@ def input_output_tracer(level="INFO", format_string="{func_name} called with arg
             return a + b
     """
     def decorator(func):
+        gate = logger.gate(func, level)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             result = func(*args, **kwargs)
-            logger.info(
-                format_string.format(
-                    func_name=func.__name__, args=args, return_value=result
+            if gate():
+                logger.log(
+                    format_string.format(
+                        func_name=func.__name__, args=args, return_value=result
+                    ),
+                    level,
+                    gate.forced,
                 )
-            )
             return result
         return wrapper
     return decorator
@@ -38,6 +44,9 @@ def execution_time_tracer(level="INFO", format_string="{func_name} took {elapsed
     """
     A decorator that logs the execution time of the function.
 
+    Records carry the structured fields "function" (module and qualified name) and "duration_ms",
+    which the log aggregation rollups use for latency percentiles.
+
     Parameters:
         level (str): The logging level (default is "INFO").
         format_string (str): The format string for the log message (default is "{func_name} took {elapsed_time:.4f} seconds").
@@ -49,26 +58,44 @@ def execution_time_tracer(level="INFO", format_string="{func_name} took {elapsed
             return a + b
     """
     def decorator(func):
+        gate = logger.gate(func, level)
+        function = f"{func.__module__}.{func.__qualname__}"
+
         @wraps(func)
         def wrapper(*args, **kwargs):
+            if not gate():
+                return func(*args, **kwargs)
             start_time = time.time()
             result = func(*args, **kwargs)
             elapsed_time = time.time() - start_time
-            logger.info(
-                format_string.format(func_name=func.__name__, elapsed_time=elapsed_time)
+            logger.log(
+                format_string.format(func_name=func.__name__, elapsed_time=elapsed_time),
+                level,
+                gate.forced,
+                fields={"function": function, "duration_ms": elapsed_time * 1000},
             )
             return result
         return wrapper
     return decorator
 
 
-def exception_tracer(level="ERROR", format_string="{func_name} failed with exception: {exception}"):
+def exception_tracer(level="ERROR", format_string="{func_name} failed with exception: {exception}", cache=traceback_cache):
     """
     A decorator that logs any exception raised by the function.
 
+    When the logger's flight recorder is enabled, the records buffered before the failure are
+    replayed to the handlers every time the decorator catches an exception.
+
+    Exceptions are fingerprinted by type and code location. The first occurrence of a fingerprint is
+    logged as is; repeats are counted and reported periodically as "seen N times" summaries instead of
+    being logged one by one, including repeats at the end of a burst (see `Logger.watch_tracebacks`).
+    The traceback itself is never formatted, since only the exception is logged. The format string may
+    also use `{fingerprint}` and `{count}`.
+
     Parameters:
         level (str): The logging level (default is "ERROR").
         format_string (str): The format string for the log message (default is "{func_name} failed with exception: {exception}").
+        cache (TracebackCache): The fingerprint cache to use, or None to log every occurrence (default is the shared cache).
 
     Example:
         @exception_tracer(level="ERROR")
@@ -76,12 +103,37 @@ def exception_tracer(level="ERROR", format_string="{func_name} failed with excep
             return 1 / x
     """
     def decorator(func):
+        gate = logger.gate(func, level)
+        if cache is not None:
+            logger.watch_tracebacks(cache)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                logger.error(format_string.format(func_name=func.__name__, exception=e))
+                logger.dump_flight_recorder()
+                if not gate():
+                    raise
+                if cache is None:
+                    logger.log(
+                        format_string.format(func_name=func.__name__, exception=e, fingerprint=None, count=1),
+                        level,
+                        gate.forced,
+                    )
+                    raise
+                report = cache.observe(e, level)
+                if report is not None:
+                    logger.log(
+                        format_string.format(
+                            func_name=func.__name__,
+                            exception=e if report.first else report.render(),
+                            fingerprint=report.fingerprint,
+                            count=report.count,
+                        ),
+                        level,
+                        gate.forced,
+                    )
                 raise
         return wrapper
     return decorator
@@ -101,12 +153,17 @@ def param_type_tracer(level="DEBUG", format_string="{func_name} called with args
             print(a, b)
     """
     def decorator(func):
+        gate = logger.gate(func, level)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            types = [type(arg).__name__ for arg in args]
-            logger.info(
-                format_string.format(func_name=func.__name__, args=args, types=types)
-            )
+            if gate():
+                types = [type(arg).__name__ for arg in args]
+                logger.log(
+                    format_string.format(func_name=func.__name__, args=args, types=types),
+                    level,
+                    gate.forced,
+                )
             return func(*args, **kwargs)
         return wrapper
     return decorator
@@ -114,14 +171,19 @@ def param_type_tracer(level="DEBUG", format_string="{func_name} called with args
 
 def detailed_tracer(
     level="INFO",
-    format_string="{func_name} executed with args: {args}, kwargs: {kwargs}, returned: {return_value}, exception: {exception}"
+    format_string="{func_name} executed with args: {args}, kwargs: {kwargs}, returned: {return_value}, exception: {exception}",
+    cache=traceback_cache,
 ):
     """
     A decorator that logs detailed information about function execution, including arguments, keyword arguments, return value, and exceptions.
 
+    Tracebacks are cached by exception fingerprint: the full traceback is formatted and logged only for the
+    first occurrence, repeats are reported periodically as a one-line "seen N times" summary.
+
     Parameters:
         level (str): The logging level (default is "INFO").
         format_string (str): The format string for the log message (default is "{func_name} executed with args: {args}, kwargs: {kwargs}, returned: {return_value}, exception: {exception}").
+        cache (TracebackCache): The fingerprint cache to use, or None to format every traceback (default is the shared cache).
 
     Example:
         @detailed_tracer(level="DEBUG")
@@ -129,42 +191,65 @@ def detailed_tracer(
             return a / b
     """
     def decorator(func):
+        gate = logger.gate(func, level)
+        error_gate = logger.gate(func, "ERROR")
+        if cache is not None:
+            logger.watch_tracebacks(cache)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             try:
                 result = func(*args, **kwargs)
-                logger.info(
-                    format_string.format(
-                        func_name=func.__name__,
-                        args=args,
-                        kwargs=kwargs,
-                        return_value=result,
-                        exception=None,
+                if gate():
+                    logger.log(
+                        format_string.format(
+                            func_name=func.__name__,
+                            args=args,
+                            kwargs=kwargs,
+                            return_value=result,
+                            exception=None,
+                        ),
+                        level,
+                        gate.forced,
                     )
-                )
                 return result
             except Exception as e:
-                logger.error(
+                if not error_gate():
+                    raise
+                if cache is None:
+                    exception = traceback.format_exc()
+                else:
+                    report = cache.observe(e)
+                    if report is None:
+                        raise
+                    exception = report.render()
+                logger.log(
                     format_string.format(
                         func_name=func.__name__,
                         args=args,
                         kwargs=kwargs,
                         return_value=None,
-                        exception=traceback.format_exc(),
-                    )
+                        exception=exception,
+                    ),
+                    "ERROR",
+                    error_gate.forced,
                 )
                 raise
         return wrapper
     return decorator
 
 
-def as_json_tracer(level="INFO", format_string="{log_data}"):
+def as_json_tracer(level="INFO", format_string="{func_name}"):
     """
     A decorator that logs the function execution details in JSON format.
 
+    The details (func_name, args, kwargs, return_value) are logged as the structured fields of the
+    record, so JSON sinks receive them as members of the record object, encoded once. The format
+    string builds the message; it may still use `{log_data}`, the details encoded as a JSON string.
+
     Parameters:
         level (str): The logging level (default is "INFO").
-        format_string (str): The format string for the log message (default is "{log_data}").
+        format_string (str): The format string for the log message (default is "{func_name}").
 
     Example:
         @as_json_tracer(level="DEBUG")
@@ -172,19 +257,22 @@ def as_json_tracer(level="INFO", format_string="{log_data}"):
             return a + b
     """
     def decorator(func):
+        gate = logger.gate(func, level)
+        uses_log_data = "{log_data" in format_string
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             result = func(*args, **kwargs)
-            log_data = json.dumps(
-                {
+            if gate():
+                fields = {
                     "func_name": func.__name__,
                     "args": args,
                     "kwargs": kwargs,
                     "return_value": result,
-                },
-                default=str,
-            )
-            logger.info(format_string.format(log_data=log_data))
+                }
+                log_data = get_encoder().dumps(fields) if uses_log_data else None
+                message = format_string.format(func_name=func.__name__, log_data=log_data)
+                logger.log(message, level, gate.forced, fields)
             return result
         return wrapper
     return decorator
@@ -1,4 +1,6 @@
 import time
+import inspect
+from fnmatch import fnmatchcase
 from functools import wraps
 
 from logease.modules.logger import Logger
@@ -14,6 +16,7 @@ def function_tracer(level="INFO", format_string="{func_name} called with args: {
     - The value returned by the function or any exceptions raised.
     - The execution time of the function.
     - The module and file name where the function is defined.
+    The return and exception records carry the structured fields "function" and "duration_ms".
     The logging is done using the Logger instance configured in the logease package.
 
     Args:
@@ -24,8 +27,24 @@ def function_tracer(level="INFO", format_string="{func_name} called with args: {
         function: The wrapped function with added logging functionality.
     """
     def decorator(func):
+        gate = logger.gate(func, level)
+        error_gate = logger.gate(func, "ERROR")
+        function = f"{func.__module__}.{func.__qualname__}"
+
         @wraps(func)
         def wrapper(*args, **kwargs):
+            if not gate():
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if error_gate():
+                        logger.log(
+                            f"{func.__name__} raised an exception: {e}",
+                            "ERROR",
+                            error_gate.forced,
+                            fields={"function": function},
+                        )
+                    raise
             file_name = func.__code__.co_filename
             start_time = time.time()
             log_message = format_string.format(
@@ -33,77 +52,179 @@ def function_tracer(level="INFO", format_string="{func_name} called with args: {
                 args=args,
                 kwargs=kwargs
             )
-            logger.info(f"{file_name} {log_message}")
+            logger.log(f"{file_name} {log_message}", level, gate.forced)
             try:
                 result = func(*args, **kwargs)
                 end_time = time.time()
                 execution_time = end_time - start_time
-                logger.info(f"{func.__name__} returned {result} (Execution time: {execution_time:.4f}s)")
+                logger.log(
+                    f"{func.__name__} returned {result} (Execution time: {execution_time:.4f}s)",
+                    level,
+                    gate.forced,
+                    fields={"function": function, "duration_ms": execution_time * 1000},
+                )
                 return result
             except Exception as e:
-                logger.error(f"{func.__name__} raised an exception: {e}")
+                if error_gate():
+                    logger.log(
+                        f"{func.__name__} raised an exception: {e}",
+                        "ERROR",
+                        error_gate.forced,
+                        fields={"function": function, "duration_ms": (time.time() - start_time) * 1000},
+                    )
                 raise
 
         return wrapper
 
     return decorator
 
-def class_tracer(method):
+def _trace_method(func, level, target, skip_first=True):
     """
-    A decorator that logs the details of class method calls, including arguments and return values.
+    Wraps one method so that its calls are logged at `level` and its exceptions at ERROR.
 
-    This decorator wraps a class method and logs:
+    The level checks are resolved once, when the method is wrapped; while they are disabled a call
+    costs one generation comparison on top of the method itself.
+    """
+    gate = logger.levels.gate(target, level)
+    error_gate = logger.levels.gate(target, "ERROR")
+    name = func.__name__
+    skip = 1 if skip_first else 0
+
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            enabled = gate()
+            if enabled:
+                logger.log(f"Calling method {name} with args: {args[skip:]}, kwargs: {kwargs}", level, gate.forced)
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                if error_gate():
+                    logger.log(f"Method {name} raised an exception: {e}", "ERROR", error_gate.forced)
+                raise
+            if enabled:
+                logger.log(f"Method {name} returned {result}", level, gate.forced)
+            return result
+    else:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            enabled = gate()
+            if enabled:
+                logger.log(f"Calling method {name} with args: {args[skip:]}, kwargs: {kwargs}", level, gate.forced)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if error_gate():
+                    logger.log(f"Method {name} raised an exception: {e}", "ERROR", error_gate.forced)
+                raise
+            if enabled:
+                logger.log(f"Method {name} returned {result}", level, gate.forced)
+            return result
+
+    wrapper.__logease_traced__ = True
+    return wrapper
+
+def _selected(name, include, exclude, private):
+    if name.startswith("__") and name.endswith("__"):
+        return False
+    if name.startswith("_") and not private:
+        return False
+    if not any(fnmatchcase(name, pattern) for pattern in include):
+        return False
+    return not any(fnmatchcase(name, pattern) for pattern in exclude)
+
+def _instrument_class(cls, level, include, exclude, private):
+    prefix = f"{cls.__module__}.{cls.__qualname__}"
+    for name, member in list(vars(cls).items()):
+        if not _selected(name, include, exclude, private):
+            continue
+        if isinstance(member, staticmethod):
+            func, kind, skip_first = member.__func__, staticmethod, False
+        elif isinstance(member, classmethod):
+            func, kind, skip_first = member.__func__, classmethod, True
+        elif inspect.isfunction(member):
+            func, kind, skip_first = member, None, True
+        else:
+            continue
+        if getattr(func, "__logease_traced__", False):
+            continue
+        wrapper = _trace_method(func, level, f"{prefix}.{name}", skip_first)
+        setattr(cls, name, kind(wrapper) if kind else wrapper)
+    return cls
+
+def class_tracer(target=None, *, level="INFO", include=("*",), exclude=(), private=False):
+    """
+    A decorator that logs the details of method calls, including arguments and return values.
+
+    Applied to a class, it instruments the selected methods of the class in place, when the class
+    is created: the class itself is returned unchanged, so its name, `__mro__`, `__slots__` and
+    `isinstance` checks are not affected. Plain methods, class methods, static methods and
+    coroutine methods defined on the class are selected by name with `include` / `exclude` glob
+    patterns; private (`_name`) methods only when `private` is True, dunder methods never (see
+    `constructor_tracer`). Inherited methods are left to the class that defines them.
+
+    Applied to a single method, it instruments that method only.
+
+    Each method resolves its level checks once; they follow `set_level` for the method
+    ("module.Class.method"), its class or its module. While its level is disabled, an
+    instrumented method costs a single cached comparison per call.
+
+    This decorator logs:
     - The name of the method being called.
     - The arguments (`args` and `kwargs`) passed to the method.
     - The value returned by the method or any exceptions raised.
 
     Args:
-        method (function): The class method to be decorated.
+        target (type | function): The class or method to be decorated.
+        level (str): The log level of the call and return records. Default is "INFO".
+        include (tuple): Glob patterns of the method names to instrument. Default is every name.
+        exclude (tuple): Glob patterns of the method names to leave alone.
+        private (bool): Also instrument methods whose name starts with an underscore.
 
     Returns:
-        function: The wrapped method with added logging functionality.
+        type | function: The instrumented class, or the wrapped method.
 
     Example:
-        class MyClass:
-            @class_tracer
-            def my_method(self, a):
-                return a + 1
+        @class_tracer(level="DEBUG", exclude=("health*",))
+        class OrderService:
+            def place(self, order_id):
+                return order_id
 
-        obj = MyClass()
-        obj.my_method(5)
+        OrderService().place(5)
         # Logs:
-        # [INFO] Calling method my_method with args (5,), kwargs {}
-        # [INFO] Method my_method returned 6
+        # [DEBUG] Calling method place with args: (5,), kwargs: {}
+        # [DEBUG] Method place returned 5
     """
-    def decorator(method):
-        @wraps(method)
-        def wrapper(self, *args, **kwargs):
-            log_message = f"Calling method {method.__name__} with args {args}, kwargs: {kwargs}:"
-            logger.info(log_message)
-            try:
-                result = method(self, *args, **kwargs)
-                logger.log(f"Method {method.__name__} returned {result}")
-                return result
-            except Exception as e:
-                logger.error(f"Method {method.__name__} raised an exception: {e}")
-                raise
-        return wrapper
-    return decorator
+    if isinstance(include, str):
+        include = (include,)
+    if isinstance(exclude, str):
+        exclude = (exclude,)
+
+    def decorator(target):
+        if isinstance(target, type):
+            return _instrument_class(target, level, include, exclude, private)
+        return _trace_method(target, level, f"{target.__module__}.{target.__qualname__}")
+
+    if target is None:
+        return decorator
+    return decorator(target)
 
 def constructor_tracer(cls):
     """
     A decorator that logs details when an instance of the class is created.
 
-    This decorator wraps the class constructor and logs:
+    This decorator wraps the class constructor in place and logs:
     - The name of the class being instantiated.
     - The arguments (`args` and `kwargs`) passed to the constructor.
     - A message indicating that the instance has been created.
 
+    The class itself is returned unchanged, so its name, `__mro__` and `__slots__` are preserved.
+
     Args:
         cls (type): The class to be decorated.
 
     Returns:
-        type: A wrapped class with added logging functionality.
+        type: The same class, with an instrumented `__init__`.
 
     Example:
         @constructor_tracer
@@ -117,13 +238,21 @@ def constructor_tracer(cls):
         # [INFO] Creating instance of MyClass with args (2, 3), kwargs {}
         # [INFO] Instance of MyClass created
     """
-    class Wrapped(cls):
-        def __init__(self, *args, **kwargs):
-            log_message = f"Creating instance of {cls.__name__} with args: {args}, kwargs: {kwargs}"
-            logger.info(log_message)
-            super().__init__(*args, **kwargs)
-            logger.info(f"Instance of {cls.__name__} created")
-    return Wrapped
+    init = cls.__init__
+    gate = logger.levels.gate(f"{cls.__module__}.{cls.__qualname__}.__init__", "INFO")
+
+    @wraps(init)
+    def __init__(self, *args, **kwargs):
+        if not gate():
+            init(self, *args, **kwargs)
+            return
+        class_name = type(self).__name__
+        logger.log(f"Creating instance of {class_name} with args: {args}, kwargs: {kwargs}", "INFO", gate.forced)
+        init(self, *args, **kwargs)
+        logger.log(f"Instance of {class_name} created", "INFO", gate.forced)
+
+    cls.__init__ = __init__
+    return cls
 
 def class_method_tracer(level="INFO"):
     """
@@ -152,16 +281,23 @@ def class_method_tracer(level="INFO"):
         # [DEBUG] Class method class_method returned 20
     """
     def decorator(method):
+        gate = logger.gate(method, level)
+        error_gate = logger.gate(method, "ERROR")
+
         @wraps(method)
         def wrapper(cls, *args, **kwargs):
-            log_message = f"Calling class method {method.__name__} with args: {args}, kwargs: {kwargs}"
-            logger.log(log_message, level)
+            enabled = gate()
+            if enabled:
+                log_message = f"Calling class method {method.__name__} with args: {args}, kwargs: {kwargs}"
+                logger.log(log_message, level, gate.forced)
             try:
                 result = method(cls, *args, **kwargs)
-                logger.log(f"Class method {method.__name__} returned {result}", level)
+                if enabled:
+                    logger.log(f"Class method {method.__name__} returned {result}", level, gate.forced)
                 return result
             except Exception as e:
-                logger.log(f"Class method {method.__name__} raised an exception: {e}", "ERROR")
+                if error_gate():
+                    logger.log(f"Class method {method.__name__} raised an exception: {e}", "ERROR", error_gate.forced)
                 raise
         return wrapper
     return decorator
@@ -200,11 +336,15 @@ def property_getter_tracer(property_name, level="INFO"):
         # [DEBUG] x = 10
     """
     def decorator(func):
+        gate = logger.gate(func, level)
+
         @wraps(func)
         def wrapper(self, *args, **kwargs):
-            logger.log(f"Getting {property_name}", level)
+            if not gate():
+                return func(self, *args, **kwargs)
+            logger.log(f"Getting {property_name}", level, gate.forced)
             result = func(self, *args, **kwargs)
-            logger.log(f"{property_name} = {result}", level)
+            logger.log(f"{property_name} = {result}", level, gate.forced)
             return result
         return wrapper
     return decorator
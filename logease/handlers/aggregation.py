@@ -0,0 +1,243 @@
+import math
+import time
+import random
+import logging
+import threading
+from collections import Counter
+
+from logease.utils.errors import report_error
+
+
+class _FunctionStats:
+    __slots__ = ("count", "errors", "timings", "timed", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.timings = []
+        self.timed = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+
+def percentile(ordered, fraction):
+    """
+    Returns the value at `fraction` (0 to 1) of a sorted list, by the nearest-rank method.
+    """
+    if not ordered:
+        return None
+    index = max(0, min(len(ordered), math.ceil(fraction * len(ordered))) - 1)
+    return ordered[index]
+
+
+class RollupWindow:
+    """
+    Counts the records of one time window.
+
+    Records are counted per level, per logger and per function (the "function" field that the
+    tracing decorators attach). Durations ("duration_ms" field) are kept per function for latency
+    percentiles; beyond `max_samples` per function they are reservoir-sampled, so memory stays
+    bounded while the count, mean and maximum remain exact.
+
+    Args:
+        max_samples (int): The largest number of durations kept per function.
+    """
+
+    def __init__(self, max_samples=2048):
+        self.max_samples = max_samples
+        self.started = time.time()
+        self.records = 0
+        self.errors = 0
+        self.escalated = 0
+        self.levels = Counter()
+        self.loggers = Counter()
+        self.functions = {}
+
+    def add(self, record, function, duration_ms):
+        """
+        Counts a record.
+
+        Args:
+            record (logging.LogRecord): The record.
+            function (str): The function the record was logged for, or None.
+            duration_ms (float): The duration the record reports, or None.
+        """
+        self.records += 1
+        self.levels[record.levelname] += 1
+        self.loggers[record.name] += 1
+        error = record.levelno >= logging.ERROR
+        if error:
+            self.errors += 1
+        if function is None:
+            return
+        stats = self.functions.get(function)
+        if stats is None:
+            stats = self.functions[function] = _FunctionStats()
+        stats.count += 1
+        if error:
+            stats.errors += 1
+        if duration_ms is not None:
+            stats.timed += 1
+            stats.total_ms += duration_ms
+            if duration_ms > stats.max_ms:
+                stats.max_ms = duration_ms
+            if len(stats.timings) < self.max_samples:
+                stats.timings.append(duration_ms)
+            else:
+                slot = random.randrange(stats.timed)
+                if slot < self.max_samples:
+                    stats.timings[slot] = duration_ms
+
+    def summary(self, ended=None):
+        """
+        Returns the rollup of the window as a JSON-serializable dict.
+        """
+        ended = ended or time.time()
+        functions = {}
+        for function, stats in self.functions.items():
+            entry = {
+                "count": stats.count,
+                "errors": stats.errors,
+                "error_rate": stats.errors / stats.count,
+            }
+            if stats.timed:
+                ordered = sorted(stats.timings)
+                entry["latency_ms"] = {
+                    "count": stats.timed,
+                    "mean": stats.total_ms / stats.timed,
+                    "p50": percentile(ordered, 0.5),
+                    "p90": percentile(ordered, 0.9),
+                    "p99": percentile(ordered, 0.99),
+                    "max": stats.max_ms,
+                }
+            functions[function] = entry
+        return {
+            "window_start": self.started,
+            "window_seconds": ended - self.started,
+            "records": self.records,
+            "errors": self.errors,
+            "error_rate": self.errors / self.records if self.records else 0.0,
+            "escalated": self.escalated,
+            "levels": dict(self.levels),
+            "loggers": dict(self.loggers),
+            "functions": functions,
+        }
+
+
+class AggregatingHandler(logging.Handler):
+    """
+    Forwards compact rollups of the records instead of the records themselves.
+
+    Every record is counted in the current `RollupWindow`. Every `interval` seconds, a background
+    thread closes the window and sends its summary to `target` as a single record ("log rollup",
+    with the summary as its structured fields). Only records that cross a threshold are sent raw,
+    right away: records at or above `escalate_level`, and records whose "duration_ms" field reaches
+    `latency_threshold_ms`.
+
+    Args:
+        target (logging.Handler): Receives the rollups and the escalated records.
+        interval (float): The window length in seconds.
+        escalate_level (str): The level from which records are also sent raw, None to never escalate by level.
+        latency_threshold_ms (float): The duration from which records are also sent raw, 0 to disable.
+        max_samples (int): The largest number of durations kept per function and window.
+        level (int | str): The handler level.
+
+    Example:
+        handler = AggregatingHandler(APIHandler(url, key), interval=60, latency_threshold_ms=500)
+    """
+
+    def __init__(
+        self,
+        target,
+        interval=60.0,
+        escalate_level="ERROR",
+        latency_threshold_ms=0,
+        max_samples=2048,
+        level: int | str = 0,
+    ) -> None:
+        super().__init__(level)
+        self.target = target
+        self.interval = interval
+        self.escalate_levelno = logging.getLevelName(escalate_level.upper()) if escalate_level else None
+        if self.escalate_levelno is not None and not isinstance(self.escalate_levelno, int):
+            raise ValueError(f"Unsupported log level: {escalate_level}")
+        self.latency_threshold_ms = latency_threshold_ms
+        self.max_samples = max_samples
+        self.windows_sent = 0
+        self.window = RollupWindow(max_samples)
+        self._window_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="logease-aggregation", daemon=True)
+        self._thread.start()
+
+    def handle(self, record):
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record):
+        fields = getattr(record, "fields", None) or {}
+        function = fields.get("function")
+        duration_ms = fields.get("duration_ms")
+        escalate = (self.escalate_levelno is not None and record.levelno >= self.escalate_levelno) or (
+            self.latency_threshold_ms and duration_ms is not None and duration_ms >= self.latency_threshold_ms
+        )
+        with self._window_lock:
+            window = self.window
+            window.add(record, function, duration_ms)
+            if escalate:
+                window.escalated += 1
+        if escalate:
+            self.target.handle(record)
+
+    def rollover(self):
+        """
+        Closes the current window and sends its summary, if it counted any record.
+
+        Returns:
+            dict | None: The summary that was sent.
+        """
+        with self._window_lock:
+            window, self.window = self.window, RollupWindow(self.max_samples)
+        if not window.records:
+            return None
+        summary = window.summary()
+        record = logging.makeLogRecord(
+            {
+                "name": "logease.aggregation",
+                "levelno": logging.INFO,
+                "levelname": "INFO",
+                "msg": "log rollup",
+                "fields": summary,
+            }
+        )
+        self.target.handle(record)
+        self.windows_sent += 1
+        return summary
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.rollover()
+            except Exception:
+                report_error("aggregation rollover failed")
+
+    def metrics(self):
+        """
+        Returns the rollups sent, the records counted in the current window and the target's metrics.
+        """
+        metrics = self.target.metrics() if hasattr(self.target, "metrics") else {}
+        metrics.update({"windows_sent": self.windows_sent, "window_records": self.window.records})
+        return metrics
+
+    def flush(self):
+        self.target.flush()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.rollover()
+        self.target.flush()
+        self.target.close()
+        super().close()
@@ -0,0 +1,242 @@
+import time
+import threading
+from collections import deque
+
+from logease.utils.errors import report_error
+
+
+class AdaptiveBatchController:
+    """
+    Chooses the batch size and linger time of a batching handler from observed traffic.
+
+    The controller aims to deliver every record within `target_latency` seconds of being logged,
+    while sending batches as large as the traffic allows. The time budget a record may spend
+    waiting for its batch to fill is what remains of the target after the (smoothed) send latency.
+    The batch size is the number of records expected to arrive within that budget, so at low traffic
+    batches are small and ship immediately, and at peak they grow up to `max_batch`.
+
+    If sending a batch alone approaches the target, the size cap is halved (multiplicative decrease);
+    while batches ship comfortably within the target it grows back by `increase` records
+    (additive increase).
+
+    Args:
+        target_latency (float): The target time in seconds from logging a record to delivering it.
+        min_batch (int): The smallest batch size.
+        max_batch (int): The largest batch size.
+        min_linger (float): The shortest time in seconds a batch waits to fill.
+        smoothing (float): The weight of a new observation in the moving averages (0 to 1).
+        increase (int): The number of records the size cap grows by after a fast send.
+
+    Example:
+        controller = AdaptiveBatchController(target_latency=0.5, max_batch=500)
+        handler = ElasticSearchHandler(host, index, batch=controller)
+        controller.metrics()
+    """
+
+    def __init__(
+        self,
+        target_latency=0.5,
+        min_batch=1,
+        max_batch=500,
+        min_linger=0.001,
+        smoothing=0.2,
+        increase=10,
+    ):
+        self.target_latency = target_latency
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.min_linger = min_linger
+        self.smoothing = smoothing
+        self.increase = increase
+
+        self.batch_size = min_batch
+        self.linger = target_latency / 2
+        self.size_cap = max_batch
+        self.arrival_rate = 0.0
+        self.send_latency = 0.0
+        self.delivery_latency = 0.0
+        self.batches_sent = 0
+        self.records_sent = 0
+        self._arrivals = 0
+        self._interval = 0.0
+        self._rate_samples = 0
+        self._lock = threading.Lock()
+
+    def observe_batch(self, size, arrivals, interval, send_latency, oldest_age, backlog=0):
+        """
+        Updates the estimates after a batch was sent and recomputes the batch size and linger time.
+
+        Args:
+            size (int): The number of records in the batch.
+            arrivals (int): The number of records logged since the previous batch was dispatched.
+            interval (float): The seconds since the previous batch was dispatched.
+            send_latency (float): The seconds it took to send the batch, retries included.
+            oldest_age (float): The seconds between the oldest record being logged and the batch being delivered.
+            backlog (int): The number of records still waiting in the queue.
+        """
+        alpha = self.smoothing
+        with self._lock:
+            # Short intervals hold too few arrivals for a meaningful rate; accumulate them first.
+            self._arrivals += arrivals
+            self._interval += interval
+            if self._interval >= self.target_latency / 4:
+                rate = self._arrivals / self._interval
+                self.arrival_rate = rate if not self._rate_samples else (1 - alpha) * self.arrival_rate + alpha * rate
+                self._rate_samples += 1
+                self._arrivals, self._interval = 0, 0.0
+
+            if not self.batches_sent:
+                self.send_latency = send_latency
+                self.delivery_latency = oldest_age
+            else:
+                self.send_latency = (1 - alpha) * self.send_latency + alpha * send_latency
+                self.delivery_latency = (1 - alpha) * self.delivery_latency + alpha * oldest_age
+            self.batches_sent += 1
+            self.records_sent += size
+
+            if send_latency > self.target_latency * 0.8:
+                self.size_cap = max(self.min_batch, size // 2)
+            elif send_latency < self.target_latency * 0.5 and size >= self.size_cap:
+                self.size_cap = min(self.max_batch, self.size_cap + self.increase)
+
+            budget = max(self.min_linger, self.target_latency - self.send_latency * 1.5)
+            self.linger = budget
+            expected = int(self.arrival_rate * budget)
+            # A backlog means records already wait longer than planned: drain it in larger batches.
+            expected = max(expected, backlog)
+            self.batch_size = max(self.min_batch, min(expected, self.size_cap, self.max_batch))
+
+    def metrics(self):
+        """
+        Returns the current decisions and estimates of the controller.
+        """
+        with self._lock:
+            return {
+                "target_latency": self.target_latency,
+                "batch_size": self.batch_size,
+                "linger": self.linger,
+                "size_cap": self.size_cap,
+                "arrival_rate": self.arrival_rate,
+                "send_latency": self.send_latency,
+                "delivery_latency": self.delivery_latency,
+                "batches_sent": self.batches_sent,
+                "records_sent": self.records_sent,
+            }
+
+
+class BatchWorker(threading.Thread):
+    """
+    A daemon thread that collects the records of a handler into batches and delivers them.
+
+    Records are appended to a bounded buffer by the logging threads. The worker waits for a first
+    record, then until the controller's batch size is reached or its linger time has passed since
+    that record was queued, takes the whole batch under a single lock acquisition and hands it to
+    `handler.deliver_batch`. Taking records in bulk keeps the worker from contending with the
+    logging threads on every record.
+
+    Args:
+        handler (ResilientHandler): The handler whose batches are delivered.
+        controller (AdaptiveBatchController): Decides batch size and linger time.
+        max_queue (int): The maximum number of queued records; further records are dropped.
+    """
+
+    def __init__(self, handler, controller, max_queue=10000):
+        super().__init__(name=f"logease-batch-{type(handler).__name__}", daemon=True)
+        self.handler = handler
+        self.controller = controller
+        self.max_queue = max_queue
+        self.arrived = 0
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._drained = threading.Condition(self._lock)
+        self._wanted = 1
+        self._in_flight = 0
+        self._stopping = False
+        self._flushing = False
+        self._last_arrived = 0
+        self._last_dispatch = time.monotonic()
+
+    def put(self, log_entry, record):
+        """
+        Queues a formatted record without blocking. Returns False when the queue is full.
+        """
+        with self._lock:
+            # Counted before the size check so that the arrival rate includes dropped records.
+            self.arrived += 1
+            items = self._items
+            if len(items) >= self.max_queue:
+                return False
+            items.append((time.monotonic(), log_entry, record))
+            if len(items) >= self._wanted:
+                self._ready.notify()
+            return True
+
+    def depth(self):
+        """
+        Returns the number of queued records.
+        """
+        return len(self._items)
+
+    def run(self):
+        items = self._items
+        while True:
+            with self._lock:
+                self._wanted = 1
+                while not items and not self._stopping:
+                    self._ready.wait()
+                if not items:
+                    return
+                batch_size = self.controller.batch_size
+                deadline = items[0][0] + self.controller.linger
+                self._wanted = batch_size
+                while len(items) < batch_size and not self._stopping and not self._flushing:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._ready.wait(timeout)
+                batch = [items.popleft() for _ in range(min(batch_size, len(items)))]
+                self._in_flight = len(batch)
+
+            self._deliver(batch)
+
+            with self._lock:
+                self._in_flight = 0
+                if not items:
+                    self._flushing = False
+                    self._drained.notify_all()
+
+    def _deliver(self, batch):
+        dispatched = time.monotonic()
+        arrived = self.arrived
+        arrivals, interval = arrived - self._last_arrived, dispatched - self._last_dispatch
+        self._last_arrived, self._last_dispatch = arrived, dispatched
+
+        try:
+            self.handler.deliver_batch([entry for _, entry, _ in batch], [record for _, _, record in batch])
+        except Exception:
+            report_error(f"batch delivery of {len(batch)} records failed")
+        delivered = time.monotonic()
+        self.controller.observe_batch(
+            len(batch), arrivals, interval, delivered - dispatched, delivered - batch[0][0], len(self._items)
+        )
+
+    def flush(self):
+        """
+        Blocks until every queued record has been delivered, without waiting for batches to fill.
+        """
+        with self._lock:
+            if self._items:
+                self._flushing = True
+                self._ready.notify()
+            while (self._items or self._in_flight) and self.is_alive():
+                self._drained.wait(0.1)
+
+    def stop(self):
+        """
+        Delivers the queued records and stops the worker.
+        """
+        with self._lock:
+            self._stopping = True
+            self._ready.notify()
+        self.join()
@@ -0,0 +1,424 @@
+import json
+import mmap
+import struct
+import logging
+from collections import OrderedDict
+
+MAGIC = b"LGEB\x01"
+
+_TEMPLATE = 0x01
+_RECORD = 0x02
+_RESET = 0x03
+
+_NONE = 0
+_TRUE = 1
+_FALSE = 2
+_INT = 3
+_FLOAT = 4
+_STR = 5
+_BYTES = 6
+_REPR = 7
+_LIST = 8
+_DICT = 9
+
+_HAS_EXC_TEXT = 0x01
+_HAS_FIELDS = 0x02
+_INLINE_TEMPLATE = 0x04
+
+_RECORD_HEADER = struct.Struct("<dBB")
+_DOUBLE = struct.Struct("<d")
+
+
+def _write_varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_str(out, value):
+    data = value.encode("utf-8", "surrogatepass")
+    _write_varint(out, len(data))
+    out += data
+
+
+class BinaryEncoder:
+    """
+    Encodes log records into the compact logease binary format.
+
+    A record is stored as its timestamp, level, the interned IDs of its logger name and message
+    template, its raw argument values and its structured fields (`record.fields`). Interned strings
+    are written once, as a definition frame; afterwards records only carry their ID. The message is
+    never rendered at write time; `BinaryDecoder` does that when the file is read.
+
+    Messages that are already rendered (such as those of `Logger.log` and the decorators) rarely
+    repeat, so a message template is written inline the first time it is seen and only interned
+    when it repeats. The table of interned strings holds at most `max_templates` entries; the
+    least recently used one is evicted and its ID reused by the next definition frame.
+
+    Args:
+        max_templates (int): The maximum number of interned strings, and of candidate templates
+            remembered while waiting for a repeat.
+
+    Example:
+        encoder = BinaryEncoder()
+        stream.write(encoder.header())
+        stream.write(encoder.encode(record))
+    """
+
+    def __init__(self, max_templates=4096):
+        self.max_templates = max_templates
+        self._ids = OrderedDict()
+        self._seen = OrderedDict()
+
+    def header(self):
+        """
+        Returns the bytes that start a new file.
+        """
+        return MAGIC
+
+    def reset(self):
+        """
+        Forgets the interned templates and returns a frame telling the decoder to do the same.
+
+        Used when appending to a file written by another encoder, whose IDs would otherwise clash.
+        """
+        self._ids.clear()
+        self._seen.clear()
+        return bytes((_RESET,))
+
+    def encode(self, record):
+        """
+        Encodes a record, preceded by definition frames for any template not seen before.
+
+        Args:
+            record (logging.LogRecord): The record to encode.
+
+        Returns:
+            bytes: The encoded frames.
+        """
+        out = bytearray()
+        name_id = self._intern(out, record.name)
+        msg = record.msg if isinstance(record.msg, str) else str(record.msg)
+        template_id = self._intern(out, msg, repeated_only=True)
+
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = logging.Formatter().formatException(record.exc_info)
+        fields = getattr(record, "fields", None)
+        flags = (
+            (_HAS_EXC_TEXT if exc_text else 0)
+            | (_HAS_FIELDS if fields else 0)
+            | (_INLINE_TEMPLATE if template_id is None else 0)
+        )
+
+        out.append(_RECORD)
+        out += _RECORD_HEADER.pack(record.created, record.levelno, flags)
+        _write_varint(out, name_id)
+        if template_id is None:
+            _write_str(out, msg)
+        else:
+            _write_varint(out, template_id)
+        args = record.args
+        if not isinstance(args, tuple):
+            args = (args,) if args else ()
+        _write_varint(out, len(args))
+        for arg in args:
+            self._write_value(out, arg)
+        if exc_text:
+            _write_str(out, exc_text)
+        if fields:
+            _write_varint(out, len(fields))
+            for key, value in fields.items():
+                _write_str(out, str(key))
+                self._write_value(out, value)
+        return bytes(out)
+
+    def _intern(self, out, text, repeated_only=False):
+        ids = self._ids
+        template_id = ids.get(text)
+        if template_id is not None:
+            ids.move_to_end(text)
+            return template_id
+        if repeated_only:
+            seen = self._seen
+            if text not in seen:
+                seen[text] = None
+                if len(seen) > self.max_templates:
+                    seen.popitem(last=False)
+                return None
+            del seen[text]
+        if len(ids) >= self.max_templates:
+            _, template_id = ids.popitem(last=False)
+        else:
+            template_id = len(ids)
+        ids[text] = template_id
+        out.append(_TEMPLATE)
+        _write_varint(out, template_id)
+        _write_str(out, text)
+        return template_id
+
+    @staticmethod
+    def _write_value(out, value):
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif type(value) is int:
+            out.append(_INT)
+            _write_varint(out, (value << 1) ^ -1 if value < 0 else value << 1)
+        elif type(value) is float:
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif isinstance(value, str):
+            out.append(_STR)
+            _write_str(out, value)
+        elif isinstance(value, bytes):
+            out.append(_BYTES)
+            _write_varint(out, len(value))
+            out += value
+        elif type(value) in (list, tuple):
+            out.append(_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                BinaryEncoder._write_value(out, item)
+        elif type(value) is dict:
+            out.append(_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                _write_str(out, str(key))
+                BinaryEncoder._write_value(out, item)
+        else:
+            out.append(_REPR)
+            _write_str(out, repr(value))
+
+
+class _Repr(str):
+    """
+    A string holding the repr of an argument that could not be stored natively.
+    """
+
+    def __repr__(self):
+        return str(self)
+
+
+class BinaryDecoder:
+    """
+    Reads records written by `BinaryEncoder` and renders them back into messages.
+
+    Args:
+        data (bytes | mmap.mmap): The content of an encoded file.
+
+    Example:
+        with open("logs/app.bin", "rb") as stream:
+            for entry in BinaryDecoder(stream.read()):
+                print(entry["message"])
+    """
+
+    def __init__(self, data):
+        self._data = data
+        self._pos = 0
+        self._templates = {}
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a logease binary log file")
+        self._pos = len(MAGIC)
+
+    def __iter__(self):
+        data = self._data
+        while self._pos < len(data):
+            start = self._pos
+            tag = data[start]
+            self._pos += 1
+            try:
+                if tag == _TEMPLATE:
+                    template_id = self._read_varint()
+                    self._templates[template_id] = self._read_str()
+                    continue
+                if tag == _RESET:
+                    self._templates.clear()
+                    continue
+                if tag != _RECORD:
+                    raise ValueError(f"Corrupt logease binary log file at byte {start}")
+                entry = self._read_record()
+            except (IndexError, struct.error):
+                # The last frame is incomplete: the file is still being written, or its writer
+                # stopped mid-write. Decoding ends at the last complete frame.
+                self._pos = start
+                return
+            except KeyError:
+                raise ValueError(f"Corrupt logease binary log file at byte {start}") from None
+            yield entry
+
+    def _read_record(self):
+        created, levelno, flags = _RECORD_HEADER.unpack_from(self._data, self._pos)
+        self._pos += _RECORD_HEADER.size
+        name = self._templates[self._read_varint()]
+        template = self._read_str() if flags & _INLINE_TEMPLATE else self._templates[self._read_varint()]
+        args = tuple(self._read_value() for _ in range(self._read_varint()))
+        exc_text = self._read_str() if flags & _HAS_EXC_TEXT else None
+        fields = None
+        if flags & _HAS_FIELDS:
+            fields = {self._read_str(): self._read_value() for _ in range(self._read_varint())}
+
+        message = template
+        if args:
+            try:
+                message = template % args
+            except (TypeError, ValueError):
+                message = f"{template} {args}"
+        return {
+            "timestamp": created,
+            "level": logging.getLevelName(levelno),
+            "levelno": levelno,
+            "name": name,
+            "template": template,
+            "args": args,
+            "message": message,
+            "exc_text": exc_text,
+            "fields": fields,
+        }
+
+    def _read_varint(self):
+        data, pos = self._data, self._pos
+        result = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        self._pos = pos
+        return result
+
+    def _read_bytes(self):
+        length = self._read_varint()
+        start = self._pos
+        self._pos += length
+        if self._pos > len(self._data):
+            raise IndexError("truncated frame")
+        return self._data[start:self._pos]
+
+    def _read_str(self):
+        return self._read_bytes().decode("utf-8", "surrogatepass")
+
+    def _read_value(self):
+        tag = self._data[self._pos]
+        self._pos += 1
+        if tag == _NONE:
+            return None
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        if tag == _INT:
+            value = self._read_varint()
+            return (value >> 1) ^ -(value & 1)
+        if tag == _FLOAT:
+            value = _DOUBLE.unpack_from(self._data, self._pos)[0]
+            self._pos += _DOUBLE.size
+            return value
+        if tag == _STR:
+            return self._read_str()
+        if tag == _BYTES:
+            return self._read_bytes()
+        if tag == _REPR:
+            return _Repr(self._read_str())
+        if tag == _LIST:
+            return [self._read_value() for _ in range(self._read_varint())]
+        if tag == _DICT:
+            return {self._read_str(): self._read_value() for _ in range(self._read_varint())}
+        raise ValueError(f"Corrupt logease binary log file at byte {self._pos - 1}")
+
+
+def decode_file(path):
+    """
+    Decodes a logease binary log file, reading it through a memory map.
+
+    Args:
+        path (str): The path of the file.
+
+    Yields:
+        dict: One dict per record with timestamp, level, name, template, args, message, exc_text and fields.
+    """
+    with open(path, "rb") as stream:
+        if not stream.seek(0, 2):
+            raise ValueError("Not a logease binary log file")
+        with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from BinaryDecoder(data)
+
+
+def render_entry(entry, output_format="text"):
+    """
+    Renders a decoded record as a line of text or JSON.
+
+    Args:
+        entry (dict): A record returned by `BinaryDecoder`.
+        output_format (str): "text" for the default log line layout, "json" for one JSON object.
+
+    Returns:
+        str: The rendered record, without a trailing newline.
+    """
+    if output_format == "json":
+        return json.dumps(
+            {key: value for key, value in entry.items() if key != "levelno"}, default=str
+        )
+    message = entry["message"]
+    if entry.get("fields"):
+        message = f"{message} {json.dumps(entry['fields'], default=str)}"
+    record = logging.makeLogRecord(
+        {
+            "name": entry["name"],
+            "levelno": entry["levelno"],
+            "levelname": entry["level"],
+            "msg": message,
+            "created": entry["timestamp"],
+            "msecs": (entry["timestamp"] - int(entry["timestamp"])) * 1000,
+            "exc_text": entry["exc_text"],
+        }
+    )
+    return _TEXT_FORMATTER.format(record)
+
+
+_TEXT_FORMATTER = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+
+class BinaryFileHandler(logging.Handler):
+    """
+    A file handler that writes records in the compact binary format instead of rendered text.
+
+    Use `logease decode <file>` or `decode_file` to turn the file back into text or JSON.
+
+    Args:
+        filename (str): The file to append to.
+        level (int | str): The handler level.
+    """
+
+    def __init__(self, filename, level: int | str = 0) -> None:
+        super().__init__(level)
+        self.filename = filename
+        self.encoder = BinaryEncoder()
+        self.stream = open(filename, "ab")
+        if self.stream.tell() == 0:
+            self.stream.write(self.encoder.header())
+        else:
+            self.stream.write(self.encoder.reset())
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.encoder.encode(record))
+            self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.acquire()
+        try:
+            if self.stream is not None:
+                self.stream.close()
+                self.stream = None
+        finally:
+            self.release()
+            super().close()
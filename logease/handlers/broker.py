@@ -0,0 +1,352 @@
+import time
+import threading
+from collections import deque
+from urllib.parse import urlsplit
+
+from logease.handlers.resilience import ResilientHandler
+
+
+class Transport:
+    """
+    The interface between `MessageQueueHandler` and a message broker.
+
+    A transport publishes batches of messages tagged with a sequence number and reports, possibly
+    later, whether the broker accepted each of them (publisher confirms). Implementations register
+    a URL scheme with `register_transport`.
+    """
+
+    def publish(self, sequence, messages):
+        """
+        Publishes a batch of messages. Must raise when the broker cannot be reached.
+
+        Args:
+            sequence (int): The number identifying the batch in confirms.
+            messages (list): The formatted records.
+        """
+        raise NotImplementedError("publish must be implemented by Transport subclasses")
+
+    def confirms(self, timeout):
+        """
+        Returns the confirms received so far, waiting up to `timeout` seconds for the first one.
+
+        Returns:
+            list: (sequence, accepted) pairs; a batch that was not accepted may be published again.
+        """
+        raise NotImplementedError("confirms must be implemented by Transport subclasses")
+
+    def close(self):
+        pass
+
+
+class LocalBroker:
+    """
+    An in-process message broker, standing in for a real one in tests and benchmarks.
+
+    Brokers are named and shared within the process (`LocalBroker.get("logs")`). A broker holds at
+    most `capacity` messages; a batch that does not fit is rejected as a whole, which the publisher
+    sees as a negative confirm. Consumers take messages with `consume`.
+
+    Args:
+        capacity (int): The maximum number of messages held.
+
+    Example:
+        broker = LocalBroker.get("logs", capacity=1000)
+        messages = broker.consume(max_messages=100, timeout=1.0)
+    """
+
+    _brokers = {}
+    _brokers_lock = threading.Lock()
+
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self.published = 0
+        self.rejected = 0
+        self._messages = deque()
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+    @classmethod
+    def get(cls, name, capacity=10000):
+        """
+        Returns the broker with this name, creating it on first use.
+        """
+        with cls._brokers_lock:
+            broker = cls._brokers.get(name)
+            if broker is None:
+                broker = cls._brokers[name] = cls(capacity)
+            return broker
+
+    def publish(self, messages):
+        """
+        Stores a batch of messages.
+
+        Returns:
+            bool: False when the batch was rejected because the broker is full.
+        """
+        with self._lock:
+            if len(self._messages) + len(messages) > self.capacity:
+                self.rejected += len(messages)
+                return False
+            self._messages.extend(messages)
+            self.published += len(messages)
+            self._available.notify_all()
+            return True
+
+    def consume(self, max_messages=100, timeout=None):
+        """
+        Takes up to `max_messages` messages, waiting up to `timeout` seconds for the first one.
+        """
+        with self._lock:
+            if not self._messages:
+                self._available.wait(timeout)
+            messages = self._messages
+            return [messages.popleft() for _ in range(min(max_messages, len(messages)))]
+
+    def __len__(self):
+        return len(self._messages)
+
+
+class LocalTransport(Transport):
+    """
+    A transport publishing to a `LocalBroker`, for URLs such as "local://logs".
+    """
+
+    def __init__(self, broker):
+        self.broker = broker
+        self._confirms = deque()
+        self._lock = threading.Lock()
+        self._confirmed = threading.Condition(self._lock)
+
+    def publish(self, sequence, messages):
+        accepted = self.broker.publish(messages)
+        with self._lock:
+            self._confirms.append((sequence, accepted))
+            self._confirmed.notify()
+
+    def confirms(self, timeout):
+        with self._lock:
+            if not self._confirms:
+                self._confirmed.wait(timeout)
+            confirms = list(self._confirms)
+            self._confirms.clear()
+            return confirms
+
+
+_transports = {
+    "local": lambda url: LocalTransport(LocalBroker.get(urlsplit(url).netloc or "default")),
+}
+
+
+def register_transport(scheme, factory):
+    """
+    Registers a transport for the message queue URLs with a scheme, e.g. "amqp".
+
+    Args:
+        scheme (str): The URL scheme.
+        factory (callable): Called with the URL, returns a `Transport`.
+    """
+    _transports[scheme] = factory
+
+
+def create_transport(url):
+    """
+    Creates the transport for a message queue URL.
+
+    Raises:
+        ValueError: If no transport is registered for the URL scheme.
+    """
+    scheme = urlsplit(url).scheme
+    factory = _transports.get(scheme)
+    if factory is None:
+        raise ValueError(f"No message queue transport registered for '{scheme}://' URLs")
+    return factory(url)
+
+
+class MessageQueueHandler(ResilientHandler):
+    """
+    Publishes records to a message broker in batches, with publisher confirms.
+
+    Records are formatted on the logging thread and appended to a bounded buffer. A publisher thread
+    takes batches of up to `batch_size` records and publishes them through the transport, keeping
+    at most `max_in_flight` batches unconfirmed at a time: when the window is full, it waits for
+    confirms before publishing more, so a slow broker pushes back on the buffer instead of
+    accumulating unbounded work. A batch that is rejected, or not confirmed within `timeout`, is
+    published again according to `retry`, then passed to the fallback; while it waits for its
+    retry it keeps its place in the window.
+
+    When the buffer is full, records are dropped, or with `block` the logging thread waits up to
+    `timeout` seconds for room.
+
+    Args:
+        transport (Transport): The broker transport, see `create_transport`.
+        batch_size (int): The largest number of records in one batch.
+        max_in_flight (int): The largest number of unconfirmed batches.
+        block (bool): Wait for room when the buffer is full instead of dropping the record.
+        **options: The `ResilientHandler` options (timeout, retry, breaker, fallback, max_queue, level).
+
+    Example:
+        handler = MessageQueueHandler(create_transport("local://logs"), batch_size=200, max_in_flight=4)
+    """
+
+    def __init__(self, transport, batch_size=100, max_in_flight=8, block=False, level: int | str = 0, **options):
+        options.pop("batch", None)
+        max_queue = options.pop("max_queue", 10000)
+        super().__init__(level=level, **options)
+        self.transport = transport
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.block = block
+        self.published = 0
+        self.confirmed = 0
+        self.rejected = 0
+        self._items = deque()
+        self._retries = deque()
+        self._in_flight = {}
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._room = threading.Condition(self._lock)
+        self._drained = threading.Condition(self._lock)
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="logease-mq-publisher", daemon=True)
+        self._thread.start()
+
+    def send(self, log_entry, record):
+        self.send_batch((log_entry,), (record,))
+
+    def send_batch(self, log_entries, records):
+        """
+        Queues records that are already formatted, e.g. by a `ProcessPoolHandler`, for publishing.
+        """
+        with self._lock:
+            for log_entry, record in zip(log_entries, records):
+                self._enqueue(log_entry, record)
+
+    def emit(self, record):
+        try:
+            log_entry = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._lock:
+            self._enqueue(log_entry, record)
+
+    def _enqueue(self, log_entry, record):
+        items = self._items
+        if len(items) >= self.max_queue:
+            if not self.block or not self._room.wait_for(lambda: len(items) < self.max_queue, self.timeout):
+                self.dropped += 1
+                return
+        items.append((log_entry, record))
+        if len(items) == 1 or len(items) >= self.batch_size:
+            self._ready.notify()
+
+    def _run(self):
+        items, retries, in_flight = self._items, self._retries, self._in_flight
+        while True:
+            with self._lock:
+                while not items and not retries and not in_flight and not self._stopping:
+                    self._drained.notify_all()
+                    self._ready.wait()
+                if self._stopping and not items and not retries and not in_flight:
+                    self._drained.notify_all()
+                    return
+                batch = None
+                # Batches waiting for a retry keep their place in the window, so that a broker
+                # rejecting batches slows publishing down and the buffer fills up.
+                if len(in_flight) < self.max_in_flight:
+                    if retries and retries[0][0] <= time.monotonic():
+                        _, batch, attempt = retries.popleft()
+                    elif items and len(in_flight) + len(retries) < self.max_in_flight:
+                        batch = [items.popleft() for _ in range(min(self.batch_size, len(items)))]
+                        attempt = 0
+                        self._room.notify_all()
+
+            if batch is not None:
+                self._publish(batch, attempt)
+            if in_flight:
+                self._collect(0 if batch is not None and len(in_flight) < self.max_in_flight else 0.01)
+            elif batch is None and retries:
+                time.sleep(min(0.01, max(0.0, retries[0][0] - time.monotonic())))
+
+    def _publish(self, batch, attempt):
+        if not self.breaker.allow():
+            self._fail(batch)
+            return
+        self._sequence += 1
+        sequence = self._sequence
+        self._in_flight[sequence] = (time.monotonic(), batch, attempt)
+        try:
+            self.transport.publish(sequence, [entry for entry, _ in batch])
+        except Exception:
+            del self._in_flight[sequence]
+            self.breaker.record_failure()
+            self._retry(batch, attempt)
+            return
+        self.published += len(batch)
+
+    def _collect(self, timeout):
+        in_flight = self._in_flight
+        for sequence, accepted in self.transport.confirms(timeout):
+            entry = in_flight.pop(sequence, None)
+            if entry is None:
+                continue
+            _, batch, attempt = entry
+            if accepted:
+                self.confirmed += len(batch)
+                self.breaker.record_success()
+            else:
+                self.rejected += len(batch)
+                self._retry(batch, attempt)
+        deadline = time.monotonic() - self.timeout
+        for sequence, (published, batch, attempt) in list(in_flight.items()):
+            if published < deadline:
+                del in_flight[sequence]
+                self.breaker.record_failure()
+                self._retry(batch, attempt)
+
+    def _retry(self, batch, attempt):
+        if attempt >= self.retry.retries:
+            self._fail(batch)
+            return
+        with self._lock:
+            self._retries.append((time.monotonic() + self.retry.delay(attempt), batch, attempt + 1))
+
+    def _fail(self, batch):
+        for _, record in batch:
+            self.handle_failure(record)
+
+    def metrics(self):
+        """
+        Returns the publishing metrics: records published, confirmed, rejected by the broker and
+        dropped, buffered records and unconfirmed batches, and the breaker state.
+        """
+        return {
+            "breaker_state": self.breaker.state,
+            "published": self.published,
+            "confirmed": self.confirmed,
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+            "queue_depth": len(self._items),
+            "in_flight": len(self._in_flight),
+        }
+
+    def flush(self):
+        """
+        Blocks until every buffered record has been confirmed or given up on.
+        """
+        with self._lock:
+            self._ready.notify()
+            while (self._items or self._retries or self._in_flight) and self._thread.is_alive():
+                self._drained.wait(0.1)
+        if self.fallback is not None:
+            self.fallback.flush()
+
+    def close(self):
+        with self._lock:
+            self._stopping = True
+            self._ready.notify()
+        self._thread.join()
+        self.transport.close()
+        super().close()
@@ -0,0 +1,264 @@
+import os
+import gzip
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from logease.handlers.resilience import ResilientHandler
+from logease.utils.errors import report_error
+
+_worker_formatter = None
+
+
+def _init_worker(formatter):
+    global _worker_formatter
+    _worker_formatter = formatter
+
+
+def _render_chunk(raws, terminator=None, compress=False, encoding="utf-8", formatter=None):
+    """
+    Formats a chunk of raw records, in a pool process or, as a fallback, in the calling process.
+
+    Returns:
+        list | str | bytes: The formatted records, or when a `terminator` is given, their
+        concatenation, gzip-compressed if `compress` is True.
+    """
+    format = (formatter or _worker_formatter).format
+    entries = [format(logging.makeLogRecord(raw)) for raw in raws]
+    if terminator is None:
+        return entries
+    text = "".join(entry + terminator for entry in entries)
+    if compress:
+        return gzip.compress(text.encode(encoding))
+    return text
+
+
+class ProcessPoolHandler(logging.Handler):
+    """
+    Moves the formatting, serialization and compression of records to a pool of worker processes.
+
+    The logging thread only copies the raw attributes of a record into a bounded buffer. A dispatcher
+    thread collects them into chunks of up to `chunk_size` records and submits each chunk to a
+    `ProcessPoolExecutor`, whose processes format them with the target handler's formatter, outside
+    the GIL of the application. The dispatcher then hands the results to the target, in order:
+
+    - A `logging.StreamHandler` (such as a `FileHandler`) receives each chunk as one write; with
+      `compress`, each chunk is written as a gzip member, which together form a valid gzip file.
+    - A `ResilientHandler` receives each chunk as a batch through `deliver_batch`, with its retries,
+      circuit breaker and fallback.
+    - Any other handler receives the records one by one on the dispatcher thread, which keeps the
+      work off the logging threads but does not use the pool (e.g. the stateful `BinaryFileHandler`).
+
+    A chunk whose records cannot be sent to the pool (for example an unpicklable argument) is
+    formatted on the dispatcher thread instead.
+
+    Worker processes are started with the default `multiprocessing` context, so as with any process
+    pool, the main module must be safe to import when the "spawn" start method is used.
+
+    Args:
+        target (logging.Handler): The handler that receives the formatted records.
+        workers (int): The number of worker processes, defaults to the number of CPUs.
+        chunk_size (int): The largest number of records formatted by one task.
+        linger (float): The longest time in seconds a record waits for its chunk to fill.
+        max_queue (int): The maximum number of records waiting for a chunk; further records are dropped.
+        max_in_flight (int): The number of chunks that may be formatted at once, defaults to 2 per worker.
+        compress (bool): Write gzip-compressed chunks to a `StreamHandler` target.
+        level (int | str): The handler level.
+
+    Example:
+        file_handler = logging.FileHandler("logs/app.log")
+        file_handler.setFormatter(JSONFormatter())
+        logger.addHandler(ProcessPoolHandler(file_handler, workers=4))
+    """
+
+    def __init__(
+        self,
+        target,
+        workers=None,
+        chunk_size=256,
+        linger=0.05,
+        max_queue=10000,
+        max_in_flight=None,
+        compress=False,
+        level: int | str = 0,
+    ) -> None:
+        super().__init__(level)
+        self.target = target
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.linger = linger
+        self.max_queue = max_queue
+        self.compress = compress
+        self.dropped = 0
+        self.chunks_sent = 0
+        self.chunks_formatted_locally = 0
+
+        formatter = target.formatter or logging.Formatter()
+        self.formatter = formatter
+        self._terminator = None
+        if isinstance(target, ResilientHandler):
+            self._write = self._write_batch
+        elif isinstance(target, logging.StreamHandler):
+            self._write = self._write_stream
+            self._terminator = target.terminator
+        else:
+            self._write = None
+        self.pool = None
+        if self._write is not None:
+            self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(formatter,))
+        self.max_in_flight = max_in_flight or 2 * self.workers
+
+        self._items = deque()
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._drained = threading.Condition(self._lock)
+        self._busy = False
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="logease-offload", daemon=True)
+        self._thread.start()
+
+    def handle(self, record):
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record):
+        raw = record.__dict__.copy()
+        if record.exc_info:
+            if not record.exc_text:
+                raw["exc_text"] = self.formatter.formatException(record.exc_info)
+            raw["exc_info"] = None
+        with self._lock:
+            items = self._items
+            if len(items) >= self.max_queue:
+                self.dropped += 1
+                return
+            items.append(raw)
+            if len(items) == 1 or len(items) >= self.chunk_size:
+                self._ready.notify()
+
+    def _run(self):
+        items, pending = self._items, self._pending
+        while True:
+            with self._lock:
+                if not items and not pending:
+                    self._busy = False
+                    self._drained.notify_all()
+                    while not items and not self._stopping:
+                        self._ready.wait()
+                    if not items:
+                        return
+                self._busy = True
+                # Wait for a full chunk, unless formatted chunks are ready to be written.
+                deadline = time.monotonic() + self.linger
+                while len(items) < self.chunk_size and not self._stopping and not (pending and pending[0][0].done()):
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    self._ready.wait(min(timeout, 0.01) if pending else timeout)
+                chunk = [items.popleft() for _ in range(min(self.chunk_size, len(items)))]
+
+            if chunk:
+                self._dispatch(chunk)
+            while pending and (pending[0][0].done() or len(pending) >= self.max_in_flight or not chunk):
+                future, raws = pending.popleft()
+                self._complete(future, raws)
+
+    def _dispatch(self, raws):
+        if self._write is None:
+            for raw in raws:
+                self.target.handle(logging.makeLogRecord(raw))
+            return
+        encoding = getattr(getattr(self.target, "stream", None), "encoding", None) or "utf-8"
+        try:
+            future = self.pool.submit(_render_chunk, raws, self._terminator, self.compress, encoding)
+        except BrokenProcessPool:
+            self._restart_pool()
+            future = self.pool.submit(_render_chunk, raws, self._terminator, self.compress, encoding)
+        except RuntimeError:
+            # The interpreter is shutting down and the pool takes no more work: format here.
+            future = Future()
+            future.set_exception(BrokenProcessPool("The process pool is shut down"))
+        self._pending.append((future, raws))
+
+    def _complete(self, future, raws):
+        try:
+            result = future.result()
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool) and not self._stopping:
+                self._restart_pool()
+            try:
+                result = _render_chunk(raws, self._terminator, self.compress, formatter=self.formatter)
+            except Exception:
+                for raw in raws:
+                    self.handleError(logging.makeLogRecord(raw))
+                return
+            self.chunks_formatted_locally += 1
+        try:
+            self._write(result, raws)
+            self.chunks_sent += 1
+        except Exception:
+            report_error(f"offloaded write of {len(raws)} records failed")
+
+    def _write_stream(self, data, raws):
+        target = self.target
+        target.acquire()
+        try:
+            stream = target.stream
+            if isinstance(data, bytes):
+                stream.flush()
+                getattr(stream, "buffer", stream).write(data)
+            else:
+                stream.write(data)
+            target.flush()
+        finally:
+            target.release()
+
+    def _write_batch(self, entries, raws):
+        self.target.deliver_batch(entries, [logging.makeLogRecord(raw) for raw in raws])
+
+    def _restart_pool(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.formatter,))
+
+    def metrics(self):
+        """
+        Returns the offloading metrics merged with the target handler's own metrics, if any.
+        """
+        metrics = self.target.metrics() if hasattr(self.target, "metrics") else {}
+        metrics.update(
+            {
+                "offload_queue_depth": len(self._items),
+                "offload_in_flight": len(self._pending),
+                "offload_dropped": self.dropped,
+                "offload_chunks_sent": self.chunks_sent,
+                "offload_chunks_formatted_locally": self.chunks_formatted_locally,
+            }
+        )
+        return metrics
+
+    def flush(self):
+        """
+        Blocks until every queued record has been formatted and handed to the target.
+        """
+        with self._lock:
+            if self._items:
+                self._ready.notify()
+            while (self._items or self._busy) and self._thread.is_alive():
+                self._drained.wait(0.1)
+        self.target.flush()
+
+    def close(self):
+        with self._lock:
+            self._stopping = True
+            self._ready.notify()
+        self._thread.join()
+        if self.pool is not None:
+            self.pool.shutdown()
+        self.target.close()
+        super().close()
@@ -6,64 +6,90 @@ from email.mime.multipart import MIMEMultipart
 
 from pysnmp.hlapi import *
 
+from logease.handlers.resilience import ResilientHandler, raise_for_response
 
-class SplunkHandler(logging.Handler):
-    def __init__(self, host, token, level: int | str = 0) -> None:
-        super().__init__(level)
+
+class SplunkHandler(ResilientHandler):
+    def __init__(self, host, token, level: int | str = 0, **options) -> None:
+        super().__init__(level=level, **options)
         self.host = host
         self.token = token
 
-    def emit(self, record):
-        log_entry = self.format(record)
+    def send(self, log_entry, record):
+        self.send_batch((log_entry,), (record,))
+
+    def send_batch(self, log_entries, records):
         headers = {"Authorization": f"Splunk {self.token}"}
-        requests.post(
-            f"{self.host}/services/collector", headers=headers, data=log_entry
+        data = "".join('{"event":' + self.document(log_entry) + "}" for log_entry in log_entries)
+        response = requests.post(
+            f"{self.host}/services/collector", headers=headers, data=data.encode(), timeout=self.timeout
         )
-        return super().emit(record)
+        raise_for_response(response)
 
 
-class ElasticSearchHandler(logging.Handler):
-    def __init__(self, host, index, level: int | str = 0) -> None:
-        super().__init__(level)
+class ElasticSearchHandler(ResilientHandler):
+    def __init__(self, host, index, level: int | str = 0, **options) -> None:
+        super().__init__(level=level, **options)
         self.host = host
         self.index = index
 
-    def emit(self, record):
-        log_entry = self.format(record)
+    def send(self, log_entry, record):
         url = f"{self.host}/{self.index}/_doc/"
-        requests.post(url, json={"message": log_entry})
-        return super().emit(record)
+        headers = {"Content-Type": "application/json"}
+        response = requests.post(
+            url, headers=headers, data=self.document(log_entry).encode(), timeout=self.timeout
+        )
+        raise_for_response(response)
 
+    def send_batch(self, log_entries, records):
+        url = f"{self.host}/{self.index}/_bulk"
+        action = '{"index":{}}\n'
+        data = "".join(action + self.document(log_entry) + "\n" for log_entry in log_entries)
+        headers = {"Content-Type": "application/x-ndjson"}
+        response = requests.post(url, headers=headers, data=data.encode(), timeout=self.timeout)
+        raise_for_response(response)
 
-class APIHandler(logging.Handler):
-    def __init__(self, endpoint, api_key, level: int | str = 0) -> None:
-        super().__init__(level)
+
+class APIHandler(ResilientHandler):
+    def __init__(self, endpoint, api_key, level: int | str = 0, **options) -> None:
+        super().__init__(level=level, **options)
         self.endpoint = endpoint
         self.api_key = api_key
 
-    def emit(self, record):
-        log_entry = self.format(record)
-        headers = {"Authorization": f"Bearer {self.api_key}"}
-        requests.post(self.endpoint, headers=headers, json={"log": log_entry})
-        return super().emit(record)
+    def headers(self):
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
 
+    def send(self, log_entry, record):
+        headers = self.headers()
+        data = '{"log":' + self.document(log_entry) + "}"
+        response = requests.post(self.endpoint, headers=headers, data=data.encode(), timeout=self.timeout)
+        raise_for_response(response)
 
-class SNMPHandler(logging.Handler):
+    def send_batch(self, log_entries, records):
+        headers = self.headers()
+        data = '{"logs":[' + ",".join(self.document(log_entry) for log_entry in log_entries) + "]}"
+        response = requests.post(self.endpoint, headers=headers, data=data.encode(), timeout=self.timeout)
+        raise_for_response(response)
+
+
+class SNMPHandler(ResilientHandler):
     def __init__(
-        self, trap_receiver, community="public", port=162, level: int | str = 0
+        self, trap_receiver, community="public", port=162, level: int | str = 0, **options
     ) -> None:
-        super().__init__(level)
+        super().__init__(level=level, **options)
         self.trap_receiver = trap_receiver
         self.community = community
         self.port = port
 
-    def emit(self, record: logging.LogRecord) -> None:
-        log_entry = self.format(record)
+    def send(self, log_entry, record):
         errorIndication, errorStatus, errorIndex, varBinds = next(
             sendNotification(
                 SnmpEngine(),
                 CommunityData(self.community, mpModel=1),
-                UdpTransportTarget((self.trap_receiver, self.port)),
+                UdpTransportTarget((self.trap_receiver, self.port), timeout=self.timeout, retries=0),
                 ContextData(),
                 "trap",
                 ObjectType(
@@ -72,10 +98,9 @@ class SNMPHandler(logging.Handler):
             )
         )
         if errorIndication:
-            print(f"SNMP Error: {errorIndication}")
+            raise ConnectionError(f"SNMP Error: {errorIndication}")
         elif errorStatus:
-            print(f"SNMP Error: {errorStatus.prettyPrint()}")
-        return super().emit(record)
+            raise ConnectionError(f"SNMP Error: {errorStatus.prettyPrint()}")
 
 
 class EmailHandler(logging.Handler):
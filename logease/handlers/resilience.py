@@ -0,0 +1,279 @@
+import time
+import random
+import logging
+import threading
+
+from logease.handlers.batching import BatchWorker
+from logease.utils.encoding import JSONFormatter, get_encoder
+
+
+class PermanentError(Exception):
+    """
+    Raised by `ResilientHandler.send` for failures that retrying cannot fix, such as a rejected payload.
+
+    Permanent errors skip the remaining retries and do not count against the circuit breaker,
+    since the endpoint itself is reachable.
+    """
+
+
+class RetryPolicy:
+    """
+    Retry with jittered exponential backoff.
+
+    The delay before retry `n` (starting at 0) is drawn uniformly from [0, min(max_backoff, backoff * 2**n)]
+    ("full jitter"), which spreads out retries of many processes hitting the same endpoint.
+
+    Args:
+        retries (int): The number of retries after the first attempt.
+        backoff (float): The base delay in seconds.
+        max_backoff (float): The upper bound of a single delay in seconds.
+    """
+
+    def __init__(self, retries=2, backoff=0.1, max_backoff=2.0):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def delay(self, attempt):
+        """
+        Returns the number of seconds to wait before retry number `attempt`.
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Stops calling an endpoint after repeated failures, and probes it again after a cool-down.
+
+    The breaker starts closed. After `failure_threshold` consecutive failures it opens and `allow`
+    returns False without touching the network until `reset_timeout` seconds have passed. Then one
+    call is let through (half-open): success closes the breaker, failure opens it again. A probe
+    whose result is never recorded does not keep the breaker half-open: another probe is let
+    through once `reset_timeout` seconds have passed without a result.
+
+    Args:
+        failure_threshold (int): The number of consecutive failures that opens the breaker.
+        reset_timeout (float): The number of seconds the breaker stays open before a probe.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probed_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Returns True if a call may be attempted now.
+        """
+        if self.state == self.CLOSED:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN and now - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self.probed_at = now
+                return True
+            if self.state == self.HALF_OPEN and now - self.probed_at >= self.reset_timeout:
+                # The previous probe never reported back.
+                self.probed_at = now
+                return True
+            return False
+
+    def record_success(self):
+        if self.state != self.CLOSED or self.failures:
+            with self._lock:
+                self.state = self.CLOSED
+                self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class ResilientHandler(logging.Handler):
+    """
+    Base class for handlers that ship records over the network.
+
+    Subclasses implement `send`, which must use `self.timeout` and raise on failure. Each record is
+    sent with retries according to `retry`; when every attempt failed, or when the circuit breaker is
+    open, the record goes to the `fallback` handler (or is dropped when there is none). An open
+    breaker fails fast without any network call.
+
+    Unlike `logging.Handler`, the handler lock is not held while sending, so a slow endpoint does
+    not block every thread that logs.
+
+    When `batch` is given, records are queued and sent in batches by a background `BatchWorker`
+    through `send_batch`, with the batch size and linger time chosen by the controller.
+
+    Args:
+        timeout (float): The timeout in seconds of a single network call.
+        retry (RetryPolicy): The retry policy, defaults to `RetryPolicy()`.
+        breaker (CircuitBreaker): The circuit breaker, defaults to `CircuitBreaker()`.
+        fallback (logging.Handler): Receives records that could not be sent, None to drop them.
+        batch (AdaptiveBatchController): Enables batching with this controller, None sends records one by one.
+        max_queue (int): The maximum number of records waiting for a batch.
+        level (int | str): The handler level.
+    """
+
+    def __init__(
+        self, timeout=5.0, retry=None, breaker=None, fallback=None, batch=None, max_queue=10000, level: int | str = 0
+    ) -> None:
+        super().__init__(level)
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.fallback = fallback
+        self.dropped = 0
+        self.batch = batch
+        self.worker = None
+        if batch is not None:
+            self.worker = BatchWorker(self, batch, max_queue)
+            self.worker.start()
+
+    def send(self, log_entry, record):
+        """
+        Sends one formatted record. Must raise on failure.
+
+        Args:
+            log_entry (str): The formatted record.
+            record (logging.LogRecord): The original record.
+        """
+        raise NotImplementedError("send must be implemented by ResilientHandler subclasses")
+
+    def send_batch(self, log_entries, records):
+        """
+        Sends a batch of formatted records. Must raise on failure.
+
+        The default sends the records one by one; subclasses override it with a bulk request.
+
+        Args:
+            log_entries (list): The formatted records.
+            records (list): The original records.
+        """
+        for log_entry, record in zip(log_entries, records):
+            self.send(log_entry, record)
+
+    def document(self, log_entry):
+        """
+        Returns a formatted record as the text of a JSON object, ready to be spliced into a payload.
+
+        Records formatted by `JSONFormatter` already are one and are used as is, so they are never
+        encoded twice; other formatted records are wrapped as {"message": ...}.
+        """
+        if isinstance(self.formatter, JSONFormatter):
+            return log_entry
+        return get_encoder().dumps({"message": log_entry})
+
+    def handle(self, record):
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record):
+        # When batching, `deliver_batch` checks the breaker once per batch; checking it here as well
+        # would use up the half-open probe before the batch is sent.
+        if self.worker is None and not self.breaker.allow():
+            self.handle_failure(record)
+            return
+        try:
+            log_entry = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        if self.worker is not None:
+            if not self.worker.put(log_entry, record):
+                self.dropped += 1
+            return
+        self._deliver(lambda: self.send(log_entry, record), (record,))
+
+    def deliver_batch(self, log_entries, records):
+        """
+        Sends a batch with retries and circuit breaking, passing it to the fallback on failure.
+        """
+        if not self.breaker.allow():
+            for record in records:
+                self.handle_failure(record)
+            return
+        self._deliver(lambda: self.send_batch(log_entries, records), records)
+
+    def _deliver(self, send, records):
+        attempt = 0
+        while True:
+            try:
+                send()
+            except PermanentError:
+                self.breaker.record_success()
+                break
+            except Exception:
+                if attempt >= self.retry.retries or not self.breaker.allow():
+                    self.breaker.record_failure()
+                    break
+                time.sleep(self.retry.delay(attempt))
+                attempt += 1
+            else:
+                self.breaker.record_success()
+                return
+        for record in records:
+            self.handle_failure(record)
+
+    def flush(self):
+        if self.worker is not None:
+            self.worker.flush()
+        if self.fallback is not None:
+            self.fallback.flush()
+
+    def metrics(self):
+        """
+        Returns delivery metrics: breaker state, dropped records and, when batching, the
+        controller's batch size, linger time and latency estimates.
+        """
+        metrics = {
+            "breaker_state": self.breaker.state,
+            "dropped": self.dropped,
+        }
+        if self.worker is not None:
+            metrics.update(self.batch.metrics())
+            metrics["queue_depth"] = self.worker.depth()
+        return metrics
+
+    def handle_failure(self, record):
+        """
+        Passes a record that could not be sent to the fallback handler, or drops it.
+        """
+        if self.fallback is None:
+            self.dropped += 1
+            return
+        self.fallback.handle(record)
+
+    def close(self):
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker = None
+        if self.fallback is not None:
+            self.fallback.close()
+        super().close()
+
+
+def raise_for_response(response):
+    """
+    Raises for an unsuccessful HTTP response: `PermanentError` for client errors other than
+    408 and 429, which retrying would not fix, and `requests.HTTPError` otherwise.
+    """
+    if response.status_code < 400:
+        return
+    if response.status_code < 500 and response.status_code not in (408, 429):
+        raise PermanentError(f"{response.status_code} {response.reason} from {response.url}")
+    response.raise_for_status()
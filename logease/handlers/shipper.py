@@ -0,0 +1,433 @@
+import ssl
+import asyncio
+import logging
+import threading
+from collections import deque
+from urllib.parse import urlsplit
+
+from logease.handlers.resilience import RetryPolicy, CircuitBreaker
+from logease.utils.encoding import JSONFormatter
+
+_RETRYABLE_STATUS = (408, 429)
+_STOP = object()
+
+
+def ndjson_body(entries):
+    """
+    Encodes formatted records as a newline-delimited JSON request body.
+    """
+    return "".join(entry + "\n" for entry in entries).encode()
+
+
+class _Connection:
+    """
+    A keep-alive HTTP/1.1 connection over asyncio streams.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.unanswered = []
+        self._response = None
+
+    @classmethod
+    async def open(cls, host, port, ssl_context):
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+        return cls(reader, writer)
+
+    def write(self, request):
+        self.writer.write(request)
+
+    async def read_response(self):
+        """
+        Reads one response and returns its status code and whether the server closes the connection.
+
+        Each read consumes either nothing or a complete part of the response, and the progress is
+        kept on the connection, so a read interrupted by cancellation can be resumed by calling
+        `read_response` again.
+        """
+        reader = self.reader
+        if self._response is None:
+            self._response = self._parse_head(await reader.readuntil(b"\r\n\r\n"))
+        response = self._response
+        while response["remaining"] is not None:
+            remaining = response["remaining"]
+            if remaining == "size":
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                response["remaining"] = size + 2 if size else "trailer"
+            elif remaining == "trailer":
+                if await reader.readuntil(b"\r\n") == b"\r\n":
+                    response["remaining"] = None
+            else:
+                await reader.readexactly(remaining)
+                response["remaining"] = "size" if response["chunked"] else None
+        self._response = None
+        return response["status"], response["close"]
+
+    @staticmethod
+    def _parse_head(head):
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(None, 2)[1])
+        length, chunked, close = 0, False, lines[0].startswith("HTTP/1.0")
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding":
+                chunked = "chunked" in value
+            elif name == "connection":
+                close = value == "close"
+        remaining = "size" if chunked else (length or None)
+        return {"status": status, "close": close, "chunked": chunked, "remaining": remaining}
+
+    def close(self):
+        self.writer.close()
+
+
+class AsyncHTTPShipper:
+    """
+    Ships formatted records to an HTTP endpoint from an asyncio event loop, without threads.
+
+    Records wait in a bounded `asyncio.Queue` and are sent in batches by a single task, as POST
+    requests over one keep-alive HTTP/1.1 connection opened with `asyncio` streams. When more than
+    one batch is ready, up to `pipeline` requests are written back to back before their responses
+    are read, so a burst costs one round trip instead of one per batch.
+
+    Failed batches (connection errors, timeouts, 408, 429 and 5xx responses) are retried with
+    `retry` and reported to `breaker`; other responses are final. While the breaker is open,
+    batches are dropped without a connection attempt.
+
+    Records can be queued from coroutines with `await put(entry)`, which waits while the queue is
+    full, or from any thread with `submit(entry)`, which never blocks and drops records when the
+    queue is full. Records submitted before `start` are kept until the task starts. When the loop
+    shuts down (for example at the end of `asyncio.run`), the task sends what is still queued
+    before exiting; `aclose` does the same explicitly.
+
+    Args:
+        url (str): The endpoint, "http://" or "https://".
+        headers (dict): Extra request headers, such as authorization.
+        content_type (str): The content type of the request body.
+        encode_batch (callable): Builds the request body (bytes) from a list of formatted records,
+            defaults to `ndjson_body`.
+        batch_size (int): The largest number of records in one request.
+        linger (float): The longest time in seconds a record waits for its batch to fill.
+        max_queue (int): The maximum number of queued records.
+        pipeline (int): The maximum number of requests written before reading their responses.
+        timeout (float): The timeout in seconds of one round of requests.
+        retry (RetryPolicy): The retry policy, defaults to `RetryPolicy()`.
+        breaker (CircuitBreaker): The circuit breaker, defaults to `CircuitBreaker()`.
+
+    Example:
+        async def main():
+            shipper = AsyncHTTPShipper("http://localhost:8080/logs")
+            shipper.start()
+            await shipper.put('{"message":"ready"}')
+            await shipper.aclose()
+    """
+
+    def __init__(
+        self,
+        url,
+        headers=None,
+        content_type="application/x-ndjson",
+        encode_batch=None,
+        batch_size=500,
+        linger=0.05,
+        max_queue=10000,
+        pipeline=4,
+        timeout=5.0,
+        retry=None,
+        breaker=None,
+    ):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {parts.scheme}")
+        self.url = url
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        host_header = parts.netloc.rpartition("@")[2]
+        self._head = (
+            f"POST {self.path} HTTP/1.1\r\nHost: {host_header}\r\nContent-Type: {content_type}\r\n"
+            + "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+        ).encode("latin-1")
+        self.encode_batch = encode_batch or ndjson_body
+        self.batch_size = batch_size
+        self.linger = linger
+        self.max_queue = max_queue
+        self.pipeline = pipeline
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+
+        self.sent = 0
+        self.dropped = 0
+        self.requests = 0
+        self._early = deque(maxlen=max_queue)
+        self._loop = None
+        self._loop_thread = None
+        self._queue = None
+        self._task = None
+        self._connection = None
+        self._shipping = None
+        self._stopped = False
+
+    def start(self):
+        """
+        Starts the shipping task on the running event loop.
+
+        Returns:
+            asyncio.Task: The shipping task.
+        """
+        if self._task is not None and not self._task.done():
+            return self._task
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._queue = asyncio.Queue(self.max_queue)
+        self._stopped = False
+        while self._early:
+            self._offer(self._early.popleft())
+        self._task = self._loop.create_task(self._run(), name="logease-http-shipper")
+        return self._task
+
+    def submit(self, entry):
+        """
+        Queues a formatted record from any thread, without blocking.
+
+        Returns:
+            bool: False when the record was dropped because the queue is full or the loop is closed.
+        """
+        loop = self._loop
+        if loop is None:
+            if len(self._early) == self._early.maxlen:
+                self.dropped += 1
+                return False
+            self._early.append(entry)
+            return True
+        if threading.get_ident() == self._loop_thread:
+            return self._offer(entry)
+        try:
+            loop.call_soon_threadsafe(self._offer, entry)
+        except RuntimeError:
+            self.dropped += 1
+            return False
+        return True
+
+    async def put(self, entry):
+        """
+        Queues a formatted record, waiting while the queue is full.
+        """
+        if self._queue is None:
+            self.start()
+        await self._queue.put(entry)
+
+    async def flush(self):
+        """
+        Waits until every queued record has been sent or dropped.
+        """
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def aclose(self):
+        """
+        Sends the queued records, stops the task and closes the connection.
+        """
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    def metrics(self):
+        """
+        Returns the numbers of records sent and dropped, requests made, queued records and breaker state.
+        """
+        return {
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "requests": self.requests,
+            "queue_depth": self._queue.qsize() if self._queue is not None else len(self._early),
+            "breaker_state": self.breaker.state,
+        }
+
+    def _offer(self, entry):
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+
+    async def _run(self):
+        queue = self._queue
+        try:
+            while not self._stopped:
+                batches = [await self._next_batch()]
+                while len(batches) < self.pipeline and not queue.empty() and not self._stopped:
+                    batches.append(self._take_ready())
+                await self._ship(batches)
+        except asyncio.CancelledError:
+            # The loop is shutting down: send what is left, then let the cancellation through. The
+            # connection is kept, so that responses owed for requests already written are read
+            # instead of sending those requests again.
+            try:
+                if self._shipping:
+                    await self._ship(self._shipping)
+                while not queue.empty():
+                    await self._ship([self._take_ready()])
+            finally:
+                self._close_connection()
+            raise
+        self._close_connection()
+
+    async def _next_batch(self):
+        queue = self._queue
+        entry = await queue.get()
+        if entry is _STOP:
+            self._stopped = True
+            queue.task_done()
+            return []
+        if queue.qsize() < self.batch_size - 1:
+            await asyncio.sleep(self.linger)
+        return [entry] + self._take_ready(self.batch_size - 1)
+
+    def _take_ready(self, limit=None):
+        queue = self._queue
+        batch = []
+        for _ in range(min(limit or self.batch_size, queue.qsize())):
+            entry = queue.get_nowait()
+            if entry is _STOP:
+                self._stopped = True
+                queue.task_done()
+                break
+            batch.append(entry)
+        return batch
+
+    async def _ship(self, batches):
+        # Batches are removed from the list as they are answered; what remains is retried.
+        batches = self._shipping = [batch for batch in batches if batch]
+        attempt = 0
+        try:
+            if batches and not self.breaker.allow():
+                self._done(batches, sent=False)
+                batches.clear()
+                return
+            while batches:
+                try:
+                    await asyncio.wait_for(self._send(batches), self.timeout)
+                except (OSError, EOFError, ValueError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+                    self._close_connection()
+                if not batches:
+                    self.breaker.record_success()
+                    return
+                # A refusal here means this attempt was the half-open probe; its failure is recorded
+                # so that the breaker opens again instead of waiting for a result forever.
+                if attempt >= self.retry.retries or not self.breaker.allow():
+                    self.breaker.record_failure()
+                    self._done(batches, sent=False)
+                    batches.clear()
+                    return
+                await asyncio.sleep(self.retry.delay(attempt))
+                attempt += 1
+        finally:
+            if not batches:
+                self._shipping = None
+
+    async def _send(self, batches):
+        """
+        Writes one request per batch, then reads the responses in order.
+
+        Batches that got a final response are removed from `batches`; batches that got a
+        retryable response, or none, are left in it. Requests written on the connection by an
+        interrupted call and not answered yet are not written again; their responses are read first.
+        """
+        if self._connection is None:
+            self._connection = await _Connection.open(self.host, self.port, self.ssl)
+        connection = self._connection
+        unanswered = connection.unanswered
+        for batch in batches:
+            if not any(batch is written for written in unanswered):
+                body = self.encode_batch(batch)
+                connection.write(self._head + b"Content-Length: %d\r\n\r\n" % len(body) + body)
+                unanswered.append(batch)
+                self.requests += 1
+        await connection.writer.drain()
+
+        while unanswered:
+            status, close = await connection.read_response()
+            batch = unanswered.pop(0)
+            if status < 500 and status not in _RETRYABLE_STATUS:
+                batches[:] = [pending for pending in batches if pending is not batch]
+                self._done([batch], sent=status < 400)
+            if close:
+                # Requests written after this one were not answered; they are sent again.
+                self._close_connection()
+                return
+
+    def _done(self, batches, sent):
+        queue = self._queue
+        for batch in batches:
+            if sent:
+                self.sent += len(batch)
+            else:
+                self.dropped += len(batch)
+            for _ in batch:
+                queue.task_done()
+
+    def _close_connection(self):
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            connection.close()
+
+
+class AsyncHTTPHandler(logging.Handler):
+    """
+    A logging handler that hands records to an `AsyncHTTPShipper`.
+
+    Records are formatted by the calling thread (as JSON objects by default) and queued without
+    blocking, so the handler can be used from synchronous code and from coroutines alike, on the
+    loop thread or any other thread. Call `start` once from a running loop, e.g. at application
+    startup; records logged earlier are kept until then.
+
+    Args:
+        shipper (AsyncHTTPShipper): The shipper that sends the records.
+        level (int | str): The handler level.
+
+    Example:
+        handler = AsyncHTTPHandler(AsyncHTTPShipper("http://localhost:8080/logs"))
+        Logger().logger.addHandler(handler)
+
+        async def main():
+            handler.start()
+            ...
+    """
+
+    def __init__(self, shipper, level: int | str = 0) -> None:
+        super().__init__(level)
+        self.shipper = shipper
+        self.setFormatter(JSONFormatter())
+
+    def start(self):
+        """
+        Starts the shipper on the running event loop.
+        """
+        return self.shipper.start()
+
+    def handle(self, record):
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record):
+        try:
+            log_entry = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        self.shipper.submit(log_entry)
+
+    def metrics(self):
+        return self.shipper.metrics()
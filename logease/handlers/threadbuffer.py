@@ -0,0 +1,200 @@
+import time
+import heapq
+import logging
+import threading
+from operator import attrgetter
+
+from logease.utils.errors import report_error
+from logease.utils.ring import SPSCBuffer
+
+_created = attrgetter("created")
+
+
+class ThreadBufferHandler(logging.Handler):
+    """
+    Removes handler lock contention by giving each logging thread its own record buffer.
+
+    A logging thread only appends the record to a preallocated `SPSCBuffer` of its own, without
+    taking any lock, not even the handler lock that `logging.Handler.handle` acquires. A single
+    drainer thread wakes up every `interval` seconds, or as soon as a buffer is half full, takes
+    the records of every buffer, merges them by timestamp (`heapq.merge`) and hands them to the
+    `targets`. Since only the drainer calls the targets, their locks are never contended:
+
+    - A plain `logging.StreamHandler` or `logging.FileHandler` (such as the console handler)
+      receives all the records of a drain in one write and one flush.
+    - Any other handler receives the records one by one, through `handle`.
+
+    Records are in timestamp order within each drain; a record that reaches its buffer after a
+    drain started is delivered by the next one. The message of a record with arguments is rendered
+    by the logging thread before it is buffered, so later changes to the arguments do not show. When a thread's buffer is full, the thread wakes
+    the drainer and waits up to `timeout` seconds for room, then drops the record.
+
+    Args:
+        targets (list): The handlers that receive the records.
+        capacity (int): The number of records buffered per thread.
+        interval (float): The longest time in seconds between two drains.
+        timeout (float): The longest time in seconds a thread waits for room in a full buffer.
+        level (int | str): The handler level.
+
+    Example:
+        handler = ThreadBufferHandler([console_handler, file_handler], capacity=4096)
+        logging.getLogger("app").handlers = [handler]
+    """
+
+    def __init__(self, targets, capacity=4096, interval=0.05, timeout=1.0, level: int | str = 0) -> None:
+        super().__init__(level)
+        self.targets = list(targets)
+        self.capacity = capacity
+        self.interval = interval
+        self.timeout = timeout
+        self.drained = 0
+        self.dropped = 0
+        self.drains = 0
+        self._wake_at = max(1, capacity // 2)
+        self._local = threading.local()
+        self._buffers = []
+        self._registry_lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="logease-thread-buffers", daemon=True)
+        self._thread.start()
+
+    def handle(self, record):
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record):
+        if record.args:
+            # Rendered now: the drainer formats the record later, when mutable arguments may have changed.
+            try:
+                record.msg = record.getMessage()
+            except Exception:
+                self.handleError(record)
+                return
+            record.args = None
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._register()
+        if not buffer.push(record):
+            self._wait_for_room(buffer, record)
+        elif len(buffer) == self._wake_at:
+            self._wake.set()
+
+    def _register(self):
+        buffer = self._local.buffer = SPSCBuffer(self.capacity)
+        buffer_entry = (threading.current_thread(), buffer)
+        with self._registry_lock:
+            self._buffers = self._buffers + [buffer_entry]
+        return buffer
+
+    def _wait_for_room(self, buffer, record):
+        if threading.current_thread() is self._thread:
+            # The drainer's own records (e.g. logged by a target) cannot wait for itself.
+            self._deliver([record])
+            return
+        deadline = time.monotonic() + self.timeout
+        while not buffer.push(record):
+            if self._stopping or time.monotonic() >= deadline:
+                with self._registry_lock:
+                    self.dropped += 1
+                return
+            self._wake.set()
+            time.sleep(0.0005)
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.drain()
+            except Exception:
+                report_error("thread buffer drain failed")
+
+    def drain(self):
+        """
+        Delivers the buffered records of every thread to the targets, in timestamp order.
+
+        Returns:
+            int: The number of records delivered.
+        """
+        with self._drain_lock:
+            entries = self._buffers
+            batches = [batch for batch in (buffer.take() for _, buffer in entries) if batch]
+            if any(not thread.is_alive() and not len(buffer) for thread, buffer in entries):
+                with self._registry_lock:
+                    self._buffers = [
+                        (thread, buffer) for thread, buffer in self._buffers if thread.is_alive() or len(buffer)
+                    ]
+            if not batches:
+                return 0
+            records = batches[0] if len(batches) == 1 else list(heapq.merge(*batches, key=_created))
+            self._deliver(records)
+            self.drained += len(records)
+            self.drains += 1
+            return len(records)
+
+    def _deliver(self, records):
+        for target in self.targets:
+            if type(target) in (logging.StreamHandler, logging.FileHandler):
+                self._write_stream(target, records)
+                continue
+            for record in records:
+                if record.levelno >= target.level:
+                    target.handle(record)
+
+    def _write_stream(self, target, records):
+        chunks = []
+        terminator = target.terminator
+        for record in records:
+            if record.levelno < target.level or not target.filter(record):
+                continue
+            try:
+                chunks.append(target.format(record) + terminator)
+            except Exception:
+                target.handleError(record)
+        if not chunks:
+            return
+        target.acquire()
+        try:
+            if target.stream is None and isinstance(target, logging.FileHandler):
+                target.stream = target._open()
+            target.stream.write("".join(chunks))
+            target.flush()
+        except Exception:
+            report_error(f"buffered write of {len(chunks)} records failed")
+        finally:
+            target.release()
+
+    def metrics(self):
+        """
+        Returns the records delivered and dropped, the number of drains and the records waiting in thread buffers.
+        """
+        entries = self._buffers
+        return {
+            "thread_buffers": len(entries),
+            "buffered": sum(len(buffer) for _, buffer in entries),
+            "drained": self.drained,
+            "drains": self.drains,
+            "dropped": self.dropped,
+        }
+
+    def flush(self):
+        """
+        Delivers the buffered records, then flushes the targets.
+        """
+        self.drain()
+        for target in self.targets:
+            target.flush()
+
+    def close(self):
+        self._stopping = True
+        self._wake.set()
+        self._thread.join()
+        self.drain()
+        for target in self.targets:
+            target.flush()
+            target.close()
+        super().close()
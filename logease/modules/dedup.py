@@ -0,0 +1,155 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class DuplicateSuppressor:
+    """
+    Collapses identical (level, message) records logged within a time window.
+
+    The first record for a key is let through and opens a window. Identical records arriving
+    while the window is open are only counted. Once the window has elapsed, the next identical
+    record is let through again, preceded by a "repeated N times" summary of what was suppressed.
+    Keys that stop repeating are swept out (and summarized) after a quiet window, on the next
+    `admit` or `sweep` call, and the number of tracked keys is bounded with least-recently-seen
+    eviction.
+
+    A unique message costs a dictionary lookup and insert; repeats cost a counter increment.
+
+    Args:
+        window (float): The window length in seconds.
+        max_keys (int): The maximum number of tracked keys before the least recently seen is evicted.
+
+    Example:
+        suppressor = DuplicateSuppressor(window=5.0)
+        verdict = suppressor.admit("INFO", "polling queue")
+        # False: drop the record, True: log it,
+        # list: log the (level, summary) pairs first, then the record.
+    """
+
+    def __init__(self, window=5.0, max_keys=1024):
+        self.window = window
+        self.max_keys = max_keys
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_sweep = time.monotonic() + window
+
+    def admit(self, level, message):
+        """
+        Decides whether a record should be logged.
+
+        Args:
+            level (str): The severity level of the record.
+            message (str): The message (template) of the record.
+
+        Returns:
+            bool | list: False when suppressed, True when admitted, or a non-empty list of
+            (level, summary message) pairs to log before the admitted record.
+        """
+        key = (level, message)
+        now = time.monotonic()
+        summaries = None
+        with self._lock:
+            entry = self._keys.get(key)
+            if entry is None:
+                self._keys[key] = [now, now, 0]
+                if len(self._keys) > self.max_keys:
+                    summaries = self._summarize(self._keys.popitem(last=False), summaries)
+            else:
+                entry[1] = now
+                self._keys.move_to_end(key)
+                if now - entry[0] < self.window:
+                    entry[2] += 1
+                    return False
+                if entry[2]:
+                    summaries = [(level, self._summary(message, entry[2]))]
+                entry[0] = now
+                entry[2] = 0
+
+            if now >= self._next_sweep:
+                summaries = self._sweep(now, summaries)
+        return summaries or True
+
+    def flush(self):
+        """
+        Forgets every tracked key.
+
+        Returns:
+            list: The (level, summary message) pairs for keys with suppressed repeats.
+        """
+        with self._lock:
+            summaries = []
+            while self._keys:
+                summaries = self._summarize(self._keys.popitem(last=False), summaries)
+            return summaries
+
+    def sweep(self):
+        """
+        Forgets the keys that have been quiet for a whole window.
+
+        Returns:
+            list: The (level, summary message) pairs for the forgotten keys with suppressed repeats.
+        """
+        with self._lock:
+            return self._sweep(time.monotonic(), None) or []
+
+    def _sweep(self, now, summaries):
+        self._next_sweep = now + self.window
+        while self._keys:
+            key, entry = next(iter(self._keys.items()))
+            if now - entry[1] < self.window:
+                break
+            summaries = self._summarize(self._keys.popitem(last=False), summaries)
+        return summaries
+
+    def _summarize(self, item, summaries):
+        (level, message), entry = item
+        if entry[2]:
+            summaries = summaries or []
+            summaries.append((level, self._summary(message, entry[2])))
+        return summaries
+
+    @staticmethod
+    def _summary(message, count):
+        return f"{message} (repeated {count} times)"
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class SummarySweeper(threading.Thread):
+    """
+    A daemon thread that sweeps a `DuplicateSuppressor` once per window.
+
+    Without it, keys are only swept when another record is admitted, so the repeats of a burst
+    followed by silence would never be reported. Any object with a `sweep` method returning
+    (level, summary) pairs can be swept, such as a `TracebackCache`.
+
+    Args:
+        suppressor (DuplicateSuppressor): The suppressor to sweep.
+        callback (callable): Called with the level and message of each summary.
+        interval (float): The seconds between sweeps, defaults to the suppressor's window.
+        name (str): The thread name.
+
+    Example:
+        sweeper = SummarySweeper(suppressor, lambda level, summary: print(level, summary))
+        sweeper.start()
+    """
+
+    def __init__(self, suppressor, callback, interval=None, name="logease-dedup-sweeper"):
+        super().__init__(name=name, daemon=True)
+        self.suppressor = suppressor
+        self.callback = callback
+        self.interval = suppressor.window if interval is None else interval
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            for level, summary in self.suppressor.sweep():
+                self.callback(level, summary)
+
+    def stop(self):
+        """
+        Stops the sweeper after the current sweep.
+        """
+        self._stopped.set()
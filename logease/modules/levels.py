@@ -0,0 +1,231 @@
+import threading
+
+LEVELS = {
+    "DEBUG": 10,
+    "INFO": 20,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+
+LEVEL_TABLE = {
+    key: (name, levelno)
+    for name, levelno in LEVELS.items()
+    for key in (name, name.lower(), name.capitalize(), levelno)
+}
+
+
+def to_levelno(level):
+    """
+    Converts a level name such as "debug" or "INFO" to its numeric value.
+
+    Raises:
+        ValueError: If the level is not supported.
+    """
+    if isinstance(level, int):
+        return level
+    levelno = LEVELS.get(level.upper())
+    if levelno is None:
+        raise ValueError(f"Unsupported log level: {level}")
+    return levelno
+
+
+def resolve_level(level):
+    """
+    Returns the (name, levelno) pair of a level given as a name in any case or as a number.
+
+    Common spellings are looked up in the precomputed `LEVEL_TABLE`.
+
+    Raises:
+        ValueError: If the level is not supported.
+    """
+    entry = LEVEL_TABLE.get(level)
+    if entry is None:
+        entry = LEVEL_TABLE.get(level.upper()) if isinstance(level, str) else None
+        if entry is None:
+            raise ValueError(f"Unsupported log level: {level}")
+    return entry
+
+
+def parse_level(value):
+    """
+    Validates a level given as a name in any case or as a number.
+
+    Returns:
+        str: The level name, e.g. "INFO" for "info" or 20.
+
+    Raises:
+        ValueError: If the level is not supported.
+    """
+    return resolve_level(value)[0]
+
+
+def parse_overrides(value):
+    """
+    Parses level overrides given as a dict or as "target=LEVEL,target=LEVEL".
+
+    Returns:
+        dict: The overrides, with level names upper-cased.
+    """
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        items = value.items()
+    else:
+        items = (item.split("=", 1) for item in value.split(",") if item.strip())
+    overrides = {}
+    for target, level in items:
+        to_levelno(level.strip())
+        overrides[target.strip()] = level.strip().upper()
+    return overrides
+
+
+class LevelRegistry:
+    """
+    Holds the root level and the per-module / per-function level overrides.
+
+    Targets are dotted names: a module ("myapp.payments") or a decorated function
+    ("myapp.payments.charge", using `__module__` and `__qualname__`). A target inherits the
+    override of its closest parent. Every change bumps `generation`, which invalidates the
+    decisions cached by `LevelGate`s, so checking a gate costs one integer comparison as long
+    as no level changes.
+
+    Levels come from two layers: the configuration (`configure`, on every configuration file
+    reload) and the runtime API (`set_level`). A configuration reload only replaces the first
+    layer, so the levels set at runtime, e.g. during an incident, keep precedence until they are
+    cleared with `clear_level`.
+
+    Example:
+        registry = LevelRegistry("WARNING")
+        registry.set_level("DEBUG", "myapp.payments")
+        gate = registry.gate("myapp.payments.charge", "DEBUG")
+        gate()  # True
+    """
+
+    def __init__(self, root_level="DEBUG"):
+        self.configured_root = to_levelno(root_level)
+        self.configured_overrides = {}
+        self.runtime_root = None
+        self.runtime_overrides = {}
+        self.root_level = self.configured_root
+        self.capture_below = 0
+        self.overrides = {}
+        self.generation = 0
+        self._lock = threading.Lock()
+
+    def set_level(self, level, target=None):
+        """
+        Sets the root level, or the level of a module or function, at runtime.
+
+        Runtime levels take precedence over the configured ones and survive configuration reloads.
+
+        Args:
+            level (str): The new level.
+            target (str): The dotted module or function name, or None for the root level.
+        """
+        levelno = to_levelno(level)
+        with self._lock:
+            if target is None:
+                self.runtime_root = levelno
+            else:
+                self.runtime_overrides = {**self.runtime_overrides, target: levelno}
+            self._merge()
+
+    def clear_level(self, target=None):
+        """
+        Removes the runtime level of a module or function, or with no target the runtime root level,
+        so that the configured level (or the parent's) applies again.
+        """
+        with self._lock:
+            if target is None:
+                self.runtime_root = None
+            else:
+                overrides = dict(self.runtime_overrides)
+                overrides.pop(target, None)
+                self.runtime_overrides = overrides
+            self._merge()
+
+    def configure(self, root_level, overrides):
+        """
+        Replaces the configured root level and overrides at once. Runtime levels are kept.
+
+        Args:
+            root_level (str): The root level.
+            overrides (dict): Level names keyed by dotted target.
+        """
+        overrides = {target: to_levelno(level) for target, level in overrides.items()}
+        with self._lock:
+            self.configured_root = to_levelno(root_level)
+            self.configured_overrides = overrides
+            self._merge()
+
+    def _merge(self):
+        # The merged values are what the hot path reads; they are rebuilt only when a level changes.
+        self.root_level = self.configured_root if self.runtime_root is None else self.runtime_root
+        self.overrides = {**self.configured_overrides, **self.runtime_overrides}
+        self.generation += 1
+
+    def capture(self, level):
+        """
+        Declares that records below `level` are captured by the flight recorder, so they must
+        still be produced even when below the root level.
+
+        Args:
+            level (str | None): The flight recorder level, or None when it is disabled.
+        """
+        with self._lock:
+            self.capture_below = to_levelno(level) if level else 0
+            self.generation += 1
+
+    def override(self, target):
+        """
+        Returns the level override that applies to a target, or None if it only follows the root level.
+        """
+        overrides = self.overrides
+        while target:
+            levelno = overrides.get(target)
+            if levelno is not None:
+                return levelno
+            target = target.rpartition(".")[0]
+        return None
+
+    def gate(self, target, level):
+        """
+        Creates a cached enabled/disabled decision for records of `level` logged on behalf of `target`.
+        """
+        return LevelGate(self, target, to_levelno(level))
+
+
+class LevelGate:
+    """
+    A cached decision of whether a decorated function should produce records at a level.
+
+    Calling the gate returns that decision; it is recomputed only when the registry's generation
+    changed. `forced` is True when an override, rather than the root level, enabled the records,
+    meaning they should go straight to the sinks (see `Logger.log`).
+    """
+
+    __slots__ = ("registry", "target", "levelno", "generation", "enabled", "forced")
+
+    def __init__(self, registry, target, levelno):
+        self.registry = registry
+        self.target = target
+        self.levelno = levelno
+        self.generation = -1
+        self.enabled = self.forced = False
+
+    def __call__(self):
+        if self.generation != self.registry.generation:
+            self.refresh()
+        return self.enabled
+
+    def refresh(self):
+        registry = self.registry
+        generation = registry.generation
+        override = registry.override(self.target)
+        if override is not None:
+            self.enabled = self.forced = self.levelno >= override
+        else:
+            self.forced = False
+            self.enabled = self.levelno >= registry.root_level or self.levelno < registry.capture_below
+        self.generation = generation
@@ -1,6 +1,22 @@
+import os
+import atexit
 import logging
 from logease.handlers.request import SplunkHandler, ElasticSearchHandler, APIHandler, EmailHandler, SNMPHandler
+from logease.handlers.binary import BinaryFileHandler
+from logease.handlers.aggregation import AggregatingHandler
+from logease.handlers.broker import MessageQueueHandler, create_transport
+from logease.handlers.resilience import RetryPolicy, CircuitBreaker
+from logease.handlers.batching import AdaptiveBatchController
+from logease.handlers.offload import ProcessPoolHandler
+from logease.handlers.threadbuffer import ThreadBufferHandler
 from logease.config.settings import LogConfig
+from logease.config.watcher import ConfigWatcher
+from logease.modules.dedup import DuplicateSuppressor, SummarySweeper
+from logease.modules.recorder import FlightRecorder
+from logease.modules.levels import LEVELS, LevelRegistry, resolve_level
+from logease.utils.encoding import JSONFormatter, get_encoder
+from logease.utils.errors import report_error
+from logease.utils.fields import check_fields, resolve_fields
 
 class CustomFormatter(logging.Formatter):
     grey = "\x1b[38;21m"
@@ -18,9 +34,16 @@ class CustomFormatter(logging.Formatter):
         logging.CRITICAL: bold_red + format + reset
     }
 
+    FORMATTERS = {levelno: logging.Formatter(log_fmt) for levelno, log_fmt in FORMATS.items()}
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
+        formatter = self.FORMATTERS.get(record.levelno) or logging.Formatter(self.FORMATS.get(record.levelno))
+        fields = getattr(record, "fields", None)
+        if fields:
+            # Structured fields are shown after the message, encoded once for display.
+            record = logging.makeLogRecord(record.__dict__)
+            record.msg = f"{record.getMessage()} {get_encoder().dumps(fields)}"
+            record.args = None
         return formatter.format(record)
 
 class Logger:
@@ -43,12 +66,30 @@ class Logger:
         self.console_handler.setLevel(logging.DEBUG)
         self.console_handler.setFormatter(CustomFormatter())  
         self.logger.addHandler(self.console_handler)
+        self.dedup = None
+        self.dedup_sweeper = None
+        self.traceback_sweepers = {}
+        self.recorder = None
+        self.handlers = []
+        self.levels = LevelRegistry()
+        self.config = None
         self.setup()
 
-    def setup(self):
+        # Runs before `logging.shutdown`, which was registered earlier, so the summaries are written.
+        atexit.register(self.flush)
+
+        self.watcher = None
+        if self.config.config_watch_interval > 0:
+            self.watcher = ConfigWatcher(self.config.config_watch_interval, self.reload)
+            self.watcher.start()
+
+    def setup(self, log_config=None):
         """
         Configures logging handlers based on the current log configuration.
 
+        Calling it again replaces the destination handlers built by the previous call. The levels
+        are only reconfigured when `level` or `levels` changed.
+
         This method initializes the logging system based on the logging destination specified in the `LogConfig` instance.
         It sets up appropriate handlers for different logging destinations such as Splunk, Elasticsearch, API endpoints,
         local files, email, and SNMP traps. Each handler is configured with a custom formatter and added to the logger.
@@ -57,38 +98,127 @@ class Logger:
         1. Retrieves the log destination and related configuration from `LogConfig`.
         2. Based on the destination, it creates and configures the appropriate logging handler:
             - **Splunk**: Configures a `SplunkHandler` if Splunk host and token are provided.
+              Network handlers get the timeout, retry, circuit breaker and fallback from `network_options`,
+              and format records as JSON objects with `JSONFormatter`.
             - **Elasticsearch**: Configures an `ElasticSearchHandler` if Elasticsearch host and index are provided.
             - **API**: Configures an `APIHandler` if an API endpoint and key are provided.
-            - **Local File**: Configures a `FileHandler` if a local file path is specified.
+            - **Log Aggregation**: Configures an `AggregatingHandler` sending windowed rollups (counts per level,
+              logger and function, error rates, latency percentiles) and the records above its thresholds
+              to the `log_aggregation_service` endpoint.
+            - **Local File**: Configures a `FileHandler` if a local file path is specified, writing one JSON object
+              per line when `local_file_format` is "json", or a `BinaryFileHandler` when it is "binary".
             - **Email**: Configures an `EmailHandler` if email recipients and SMTP server details are provided.
+            - **Message Queue**: Configures a `MessageQueueHandler` for the `message_queue` URL.
             - **SNMP**: Configures an `SNMPHandler` if an SNMP trap receiver and community details are provided.
         3. Adds each configured handler to the logger with a custom formatter for consistent log formatting.
+           With `offload_workers` set, each handler, the console handler included, is wrapped in a
+           `ProcessPoolHandler` that formats records in worker processes. With `offload_compress`
+           as well, the local file is written gzip-compressed to `<local_file_path>.gz`.
+        4. With `thread_buffer_size` set, the console and destination handlers are placed behind a
+           `ThreadBufferHandler`: logging threads append records to their own buffer without locking,
+           and a single drainer thread writes them to the handlers in timestamp order.
+
+        Args:
+            log_config (LogConfig): The configuration to apply, defaults to the shared `LogConfig.current()` snapshot.
+        """
+        log_config = log_config or LogConfig.current()
+        previous_config, self.config = self.config, log_config
+        # Levels changed at runtime with `set_level` survive reloads that leave the levels untouched.
+        if previous_config is None or (previous_config.log_level, previous_config.levels) != (
+            log_config.log_level, log_config.levels
+        ):
+            try:
+                self.levels.configure(log_config.log_level, log_config.levels)
+            except ValueError as e:
+                # `LogConfig` validates levels; this guards configurations changed by hand.
+                report_error(f"{e}; keeping the previous levels", exc_info=False)
+        self._configure_pipeline(log_config)
+
+        console = self.console_handler
+        if log_config.offload_workers > 0:
+            console = self.offload(console, log_config)
+        handlers = [console] + self.build_handlers(log_config)
+        if log_config.thread_buffer_size > 0:
+            handlers = [
+                ThreadBufferHandler(
+                    handlers,
+                    capacity=log_config.thread_buffer_size,
+                    interval=log_config.thread_buffer_interval,
+                )
+            ]
+        previous, self.handlers = self.handlers, handlers
+        # Swapping the list is atomic, so concurrent log calls see either the old or the new handlers.
+        self.logger.handlers = [
+            handler for handler in self.logger.handlers
+            if handler not in previous and handler is not self.console_handler
+        ] + handlers
+        for handler in previous:
+            handler.flush()
+            if handler is not self.console_handler:
+                handler.close()
 
-        This method assumes that `LogConfig` has already been instantiated and populated with necessary environment variables.
+    def build_handlers(self, log_config):
         """
-        log_config = LogConfig() 
+        Creates the destination handlers described by a configuration, without attaching them.
 
+        Args:
+            log_config (LogConfig): The configuration to build the handlers from.
+
+        Returns:
+            list: The configured handlers.
+        """
+        handlers = []
         log_destination = log_config.get_log_destination()
+        json_formatter = JSONFormatter(get_encoder(log_config.json_encoder))
+        compress = log_config.offload_workers > 0 and log_config.offload_compress
         
         if log_destination == 'splunk' and log_config.splunk_host and log_config.splunk_token:
-            splunk_handler = SplunkHandler(log_config.splunk_host, log_config.splunk_token)
-            splunk_handler.setFormatter(CustomFormatter())
-            self.logger.addHandler(splunk_handler)
+            splunk_handler = SplunkHandler(
+                log_config.splunk_host, log_config.splunk_token, **self.network_options(log_config)
+            )
+            splunk_handler.setFormatter(json_formatter)
+            handlers.append(splunk_handler)
 
         elif log_destination == 'elasticsearch' and log_config.elastic_host and log_config.elastic_index:
-            elastic_handler = ElasticSearchHandler(log_config.elastic_host, log_config.elastic_index)
-            elastic_handler.setFormatter(CustomFormatter())
-            self.logger.addHandler(elastic_handler)
+            elastic_handler = ElasticSearchHandler(
+                log_config.elastic_host, log_config.elastic_index, **self.network_options(log_config)
+            )
+            elastic_handler.setFormatter(json_formatter)
+            handlers.append(elastic_handler)
 
         elif log_destination == 'api' and log_config.api_endpoint and log_config.api_key:
-            api_handler = APIHandler(log_config.api_endpoint, log_config.api_key)
-            api_handler.setFormatter(CustomFormatter())
-            self.logger.addHandler(api_handler)
+            api_handler = APIHandler(
+                log_config.api_endpoint, log_config.api_key, **self.network_options(log_config)
+            )
+            api_handler.setFormatter(json_formatter)
+            handlers.append(api_handler)
+
+        elif log_destination == 'log_aggregation' and log_config.log_aggregation_service:
+            service_handler = APIHandler(
+                log_config.log_aggregation_service, log_config.api_key, **self.network_options(log_config)
+            )
+            service_handler.setFormatter(json_formatter)
+            handlers.append(
+                AggregatingHandler(
+                    service_handler,
+                    interval=log_config.aggregation_interval,
+                    escalate_level=log_config.aggregation_escalate_level,
+                    latency_threshold_ms=log_config.aggregation_latency_threshold_ms,
+                )
+            )
 
         elif log_destination == 'local_file' and log_config.local_file_path:
-            file_handler = logging.FileHandler(log_config.local_file_path)
-            file_handler.setFormatter(CustomFormatter())
-            self.logger.addHandler(file_handler)
+            # Compressed output gets its own file, so that the text file stays readable by `search` and `tail`.
+            file_path = f"{log_config.local_file_path}.gz" if compress else log_config.local_file_path
+            if log_config.local_file_format == 'binary':
+                file_handler = BinaryFileHandler(log_config.local_file_path)
+            elif log_config.local_file_format == 'json':
+                file_handler = logging.FileHandler(file_path)
+                file_handler.setFormatter(json_formatter)
+            else:
+                file_handler = logging.FileHandler(file_path)
+                file_handler.setFormatter(CustomFormatter())
+            handlers.append(file_handler)
 
         elif log_destination == 'email' and log_config.email_recipients:
             email_handler = EmailHandler(
@@ -101,62 +231,377 @@ class Logger:
                 password=log_config.smtp_password
             )
             email_handler.setFormatter(CustomFormatter())
-            self.logger.addHandler(email_handler)
+            handlers.append(email_handler)
+
+        elif log_destination == 'message_queue' and log_config.message_queue:
+            mq_handler = MessageQueueHandler(
+                create_transport(log_config.message_queue),
+                batch_size=log_config.mq_batch_size,
+                max_in_flight=log_config.mq_max_in_flight,
+                **self.network_options(log_config)
+            )
+            mq_handler.setFormatter(json_formatter)
+            handlers.append(mq_handler)
 
         elif log_destination == 'snmp' and log_config.snmp_trap_receiver:
             snmp_handler = SNMPHandler(
                 trap_receiver=log_config.snmp_trap_receiver,
                 community=log_config.snmp_community,
-                port=log_config.snmp_port
+                port=log_config.snmp_port,
+                **self.network_options(log_config)
             )
-            snmp_handler.setFormatter(CustomFormatter())
-            self.logger.addHandler(snmp_handler)
+            snmp_handler.setFormatter(json_formatter)
+            handlers.append(snmp_handler)
+
+        if log_config.offload_workers > 0:
+            handlers = [
+                self.offload(handler, log_config, compress=compress and isinstance(handler, logging.FileHandler))
+                for handler in handlers
+            ]
+
+        return handlers
+
+    def offload(self, handler, log_config, compress=False):
+        """
+        Wraps a handler in a `ProcessPoolHandler`, so that its records are formatted in worker processes.
+
+        Args:
+            handler (logging.Handler): The handler to wrap.
+            log_config (LogConfig): The configuration to read the pool options from.
+            compress (bool): Write gzip-compressed chunks; only for handlers writing to a dedicated file.
+
+        Returns:
+            ProcessPoolHandler: The wrapping handler.
+        """
+        return ProcessPoolHandler(
+            handler,
+            workers=log_config.offload_workers,
+            max_queue=log_config.batch_max_queue,
+            compress=compress,
+        )
+
+    def network_options(self, log_config):
+        """
+        Builds the timeout, retry, circuit breaker, fallback and batching options of a network handler.
 
-    def log(self, message, level="INFO"):
+        Args:
+            log_config (LogConfig): The configuration to read the options from.
+
+        Returns:
+            dict: Keyword arguments for `ResilientHandler` subclasses.
+        """
+        fallback = None
+        if log_config.handler_fallback == 'spool' and log_config.spool_path:
+            os.makedirs(os.path.dirname(log_config.spool_path) or '.', exist_ok=True)
+            fallback = BinaryFileHandler(log_config.spool_path)
+        elif log_config.handler_fallback == 'local_file' and log_config.local_file_path:
+            os.makedirs(os.path.dirname(log_config.local_file_path) or '.', exist_ok=True)
+            fallback = logging.FileHandler(log_config.local_file_path)
+            fallback.setFormatter(CustomFormatter())
+
+        batch = None
+        if log_config.batch_target_latency > 0:
+            batch = AdaptiveBatchController(log_config.batch_target_latency, max_batch=log_config.batch_max_size)
+
+        return {
+            'timeout': log_config.handler_timeout,
+            'retry': RetryPolicy(log_config.handler_retries, log_config.handler_backoff, log_config.handler_max_backoff),
+            'breaker': CircuitBreaker(log_config.breaker_threshold, log_config.breaker_reset),
+            'fallback': fallback,
+            'batch': batch,
+            'max_queue': log_config.batch_max_queue,
+        }
+
+    def metrics(self):
+        """
+        Returns the delivery metrics of every destination handler that reports them, such as the
+        batch size and linger time chosen by adaptive batching.
+
+        Returns:
+            dict: Metrics keyed by handler class name.
+        """
+        handlers = []
+        for handler in self.handlers:
+            handlers.append(handler)
+            handlers.extend(getattr(handler, 'targets', ()))
+        return {
+            type(getattr(handler, 'target', handler)).__name__: handler.metrics()
+            for handler in handlers
+            if hasattr(handler, 'metrics')
+        }
+
+    def _configure_pipeline(self, log_config):
+        dedup = self.dedup
+        if log_config.dedup_window <= 0:
+            self.disable_dedup()
+        elif dedup is None or (dedup.window, dedup.max_keys) != (log_config.dedup_window, log_config.dedup_max_keys):
+            self.enable_dedup(log_config.dedup_window, log_config.dedup_max_keys)
+
+        recorder = self.recorder
+        if log_config.flight_recorder_size <= 0:
+            self.disable_flight_recorder()
+        elif recorder is None or (recorder.capacity, recorder.level) != (
+            log_config.flight_recorder_size, log_config.flight_recorder_level.upper()
+        ):
+            self.enable_flight_recorder(log_config.flight_recorder_size, log_config.flight_recorder_level)
+
+    def reload(self):
+        """
+        Applies the configuration file if it changed since it was last loaded.
+
+        Destination handlers are rebuilt and swapped in place; the previous handlers are flushed
+        and closed after the swap, so records they buffered are not lost.
+
+        Returns:
+            bool: True if a new configuration was applied.
+        """
+        log_config = LogConfig.refresh()
+        if log_config is None:
+            return False
+        self.setup(log_config)
+        return True
+
+    def log(self, message, /, level="INFO", force=False, fields=None, **kwargs):
         """
         Logs a message with the given severity level.
 
+        Records below the root level (`LOG_LEVEL`, or `set_level`) are dropped.
+
+        When the flight recorder is enabled, records below its level are only kept in memory and are
+        replayed to the handlers when an ERROR or CRITICAL record is logged.
+
+        When duplicate suppression is enabled, identical messages at the same level within the
+        window are collapsed into one record plus a "repeated N times" summary.
+
+        Structured `fields` travel with the record as a dict (`record.fields`) and are encoded once,
+        by the formatter of each sink: as JSON object members by `JSONFormatter`, after the message
+        on the console. Callable field values are lazy: they are evaluated (see `resolve_fields`)
+        only once the record passed the level and duplicate checks, or when the flight recorder
+        replays it. Field names must not collide with the keys of every record (`RESERVED_FIELDS`:
+        timestamp, level, logger, message, exception).
+
         Args:
             message (str): The message to log.
             level (str): The severity level of the log message (DEBUG, INFO, WARNING, ERROR, CRITICAL).
+            force (bool): Skip the root level and flight recorder checks, for records already enabled
+                by a level override (see `LevelGate.forced`).
+            fields (dict): Structured fields of the record, e.g. {"user_id": 42}.
+            **kwargs: More structured fields, merged into `fields`.
+
+        Raises:
+            TypeError: If a field uses a reserved name.
+
+        Example:
+            logger.log("user login", "INFO", user_id=42, latency_ms=lambda: timer.elapsed_ms())
         """
-        level = level.upper()
-        if level == "CRITICAL":
-            self.logger.critical(message)
-        elif level == "ERROR":
-            self.logger.error(message)
-        elif level == "WARNING":
-            self.logger.warning(message)
-        elif level == "INFO":
-            self.logger.info(message)
-        elif level == "DEBUG":
-            self.logger.debug(message)
-        else:
-            raise ValueError(f"Unsupported log level: {level}")
-
-    def info(self, message):
+        level, levelno = resolve_level(level)
+        if kwargs:
+            fields = {**fields, **kwargs} if fields else kwargs
+        if fields:
+            check_fields(fields)
+        recorder = self.recorder
+        if not force:
+            if recorder is not None and recorder.buffers(level):
+                recorder.record(level, message, fields)
+                return
+            if levelno < self.levels.root_level:
+                return
+        if recorder is not None and levelno >= LEVELS["ERROR"]:
+            recorder.dump(self.logger)
+        if self.dedup is not None:
+            verdict = self.dedup.admit(level, message)
+            if verdict is False:
+                return
+            if verdict is not True:
+                for summary_level, summary in verdict:
+                    self._log_summary(summary_level, summary)
+        self._log(message, levelno, resolve_fields(fields) if fields else None)
+
+    def _log(self, message, levelno, fields=None):
+        self.logger.log(levelno, message, extra={"fields": fields} if fields else None)
+
+    def enable_dedup(self, window=5.0, max_keys=1024):
+        """
+        Enables duplicate-message suppression at runtime.
+
+        Args:
+            window (float): The window in seconds within which identical records are collapsed.
+            max_keys (int): The maximum number of distinct messages tracked at once.
+        """
+        self.disable_dedup()
+        self.dedup = DuplicateSuppressor(window, max_keys)
+        self.dedup_sweeper = SummarySweeper(self.dedup, self._log_summary)
+        self.dedup_sweeper.start()
+
+    def disable_dedup(self):
+        """
+        Disables duplicate-message suppression, logging summaries for anything still suppressed.
+        """
+        dedup, self.dedup = self.dedup, None
+        sweeper, self.dedup_sweeper = self.dedup_sweeper, None
+        if sweeper is not None:
+            sweeper.stop()
+        if dedup is not None:
+            for summary_level, summary in dedup.flush():
+                self._log_summary(summary_level, summary)
+
+    def watch_tracebacks(self, cache):
+        """
+        Logs the repeat summaries of a `TracebackCache` that no later occurrence reports: a
+        `SummarySweeper` logs those that became due every `summary_interval` seconds, and `flush`
+        logs the rest at exit. Watching the same cache again has no effect.
+
+        Args:
+            cache (TracebackCache): The cache used by exception decorators.
+        """
+        if cache in self.traceback_sweepers:
+            return
+        sweeper = SummarySweeper(
+            cache, self._log_summary, interval=cache.summary_interval, name="logease-traceback-sweeper"
+        )
+        self.traceback_sweepers[cache] = sweeper
+        sweeper.start()
+
+    def _log_summary(self, level, summary):
+        self._log(summary, resolve_level(level)[1])
+
+    def flush(self):
+        """
+        Logs the summaries of suppressed duplicates and repeated tracebacks, then flushes the handlers.
+
+        Called at interpreter exit, so that suppressed repeats are always reported.
+        """
+        dedup = self.dedup
+        if dedup is not None:
+            for summary_level, summary in dedup.flush():
+                self._log_summary(summary_level, summary)
+        for cache in list(self.traceback_sweepers):
+            for summary_level, summary in cache.flush():
+                self._log_summary(summary_level, summary)
+        for handler in self.logger.handlers:
+            try:
+                handler.flush()
+            except (OSError, ValueError):
+                # The stream may already be closed at exit; `logging.shutdown` ignores this too.
+                pass
+
+    def enable_flight_recorder(self, capacity=256, level="WARNING"):
+        """
+        Enables the in-memory flight recorder at runtime.
+
+        Args:
+            capacity (int): The number of records kept per thread or task.
+            level (str): Records strictly below this level are buffered instead of logged.
+        """
+        self.recorder = FlightRecorder(capacity, level)
+        self.levels.capture(level)
+
+    def disable_flight_recorder(self):
+        """
+        Disables the flight recorder. Records still buffered are discarded.
+        """
+        self.recorder = None
+        self.levels.capture(None)
+
+    def set_level(self, level, target=None):
+        """
+        Changes a level at runtime, without restarting.
+
+        Decorated functions pick up the change on their next call.
+
+        Args:
+            level (str): The new level.
+            target (str): A module ("myapp.payments") or decorated function ("myapp.payments.charge"),
+                or None to change the root level.
+
+        Example:
+            logger.set_level("DEBUG", "myapp.payments.charge")
+        """
+        self.levels.set_level(level, target)
+
+    def gate(self, func, level):
+        """
+        Returns the cached level decision for records a decorator logs on behalf of `func`.
+
+        Args:
+            func (callable): The decorated function; its target name is `module.qualname`.
+            level (str): The level of the records.
+
+        Returns:
+            LevelGate: Call it to know whether the records are enabled.
+        """
+        return self.levels.gate(f"{func.__module__}.{func.__qualname__}", level)
+
+    def clear_level(self, target=None):
+        """
+        Removes a level set with `set_level`, so that the configured level applies again.
+
+        Args:
+            target (str): The module or function name, or None for the root level.
+        """
+        self.levels.clear_level(target)
+
+    def dump_flight_recorder(self):
+        """
+        Replays the records buffered by the current thread or task to the handlers.
+
+        Returns:
+            int: The number of records replayed.
+        """
+        recorder = self.recorder
+        if recorder is None:
+            return 0
+        return recorder.dump(self.logger)
+
+    def debug(self, message, /, **fields):
+        """
+        Logs a message with DEBUG severity.
+
+        Args:
+            message (str): The message to log.
+            **fields: Structured fields of the record; callable values are evaluated lazily.
+        """
+        self.log(message, "DEBUG", fields=fields)
+
+    def info(self, message, /, **fields):
         """
         Logs a message with INFO severity.
 
         Args:
             message (str): The message to log.
+            **fields: Structured fields of the record; callable values are evaluated lazily.
+
+        Example:
+            logger.info("user login", user_id=user.id, latency_ms=lambda: timer.elapsed_ms())
+        """
+        self.log(message, "INFO", fields=fields)
+
+    def warning(self, message, /, **fields):
+        """
+        Logs a message with WARNING severity.
+
+        Args:
+            message (str): The message to log.
+            **fields: Structured fields of the record; callable values are evaluated lazily.
         """
-        self.log(message, "INFO")
+        self.log(message, "WARNING", fields=fields)
 
-    def error(self, message):
+    def error(self, message, /, **fields):
         """
         Logs a message with ERROR severity.
 
         Args:
             message (str): The message to log.
+            **fields: Structured fields of the record; callable values are evaluated lazily.
         """
-        self.log(message, "ERROR")
+        self.log(message, "ERROR", fields=fields)
 
-    def critical(self, message):
+    def critical(self, message, /, **fields):
         """
         Logs a message with CRITICAL severity.
 
         Args:
             message (str): The message to log.
+            **fields: Structured fields of the record; callable values are evaluated lazily.
         """
-        self.log(message, "CRITICAL")
+        self.log(message, "CRITICAL", fields=fields)
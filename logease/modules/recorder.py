@@ -0,0 +1,96 @@
+import time
+import asyncio
+import logging
+import threading
+import weakref
+
+from logease.utils.ring import RingBuffer
+from logease.utils.fields import resolve_fields
+
+
+class FlightRecorder:
+    """
+    Keeps the most recent low-severity records in memory instead of sending them to the sinks.
+
+    Records below `level` are stored as (timestamp, level, message, fields) tuples in a preallocated ring
+    buffer owned by the calling thread, or by the calling asyncio task when one is running. Nothing
+    is formatted or shipped until `dump` is called, typically when an error is logged, at which point
+    the last `capacity` records of that thread or task are replayed to the logger's handlers.
+
+    Args:
+        capacity (int): The number of records kept per thread or task.
+        level (str): Records strictly below this level are buffered (default is "WARNING").
+
+    Example:
+        recorder = FlightRecorder(capacity=200)
+        if recorder.buffers("DEBUG"):
+            recorder.record("DEBUG", "cache miss")
+        recorder.dump(logging.getLogger("LoglessLogger"))
+    """
+
+    def __init__(self, capacity=256, level="WARNING"):
+        self.capacity = capacity
+        self.level = level.upper()
+        threshold = logging.getLevelName(self.level)
+        if not isinstance(threshold, int):
+            raise ValueError(f"Unsupported log level: {level}")
+        self.buffered_levels = frozenset(
+            name for name in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+            if logging.getLevelName(name) < threshold
+        )
+        self._local = threading.local()
+        self._tasks = weakref.WeakKeyDictionary()
+
+    def buffers(self, level):
+        """
+        Returns True if records at `level` are kept in the recorder rather than logged.
+        """
+        return level in self.buffered_levels
+
+    def record(self, level, message, fields=None):
+        """
+        Stores a record in the ring buffer of the current thread or task.
+
+        Args:
+            level (str): The severity level of the record.
+            message (str): The message of the record.
+            fields (dict): The structured fields of the record, if any. Lazy values are evaluated
+                only when the record is replayed.
+        """
+        self._ring().append((time.time(), level, message, fields))
+
+    def dump(self, logger):
+        """
+        Replays the buffered records of the current thread or task to the handlers of `logger`.
+
+        Args:
+            logger (logging.Logger): The logger whose handlers receive the records.
+
+        Returns:
+            int: The number of records replayed.
+        """
+        entries = self._ring().drain()
+        for created, level, message, fields in entries:
+            record = logger.makeRecord(
+                logger.name, logging.getLevelName(level), "(flight recorder)", 0, message, (), None
+            )
+            record.created = created
+            record.msecs = (created - int(created)) * 1000
+            record.relativeCreated = (created - logging._startTime) * 1000
+            record.flight_recorder = True
+            record.fields = resolve_fields(fields) if fields else None
+            logger.handle(record)
+        return len(entries)
+
+    def _ring(self):
+        if asyncio._get_running_loop() is not None:
+            task = asyncio.current_task()
+            if task is not None:
+                ring = self._tasks.get(task)
+                if ring is None:
+                    ring = self._tasks[task] = RingBuffer(self.capacity)
+                return ring
+        ring = getattr(self._local, "ring", None)
+        if ring is None:
+            ring = self._local.ring = RingBuffer(self.capacity)
+        return ring
@@ -0,0 +1,135 @@
+import json
+import time
+import logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Datetimes and dataclasses go through `default=str`, as with the standard library backend.
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+_json_dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str).encode
+_JSON_KEY_TYPES = (str, int, float, bool, type(None))
+
+
+def _with_str_keys(obj):
+    """
+    Returns a copy of `obj` in which dict keys that JSON cannot hold, such as tuples, are replaced by their `str`.
+    """
+    if isinstance(obj, dict):
+        return {
+            key if isinstance(key, _JSON_KEY_TYPES) else str(key): _with_str_keys(value)
+            for key, value in obj.items()
+        }
+    if isinstance(obj, (list, tuple)):
+        return [_with_str_keys(value) for value in obj]
+    return obj
+
+
+class JSONEncoder:
+    """
+    A compact JSON encoder for log records.
+
+    Values that are not JSON serializable are encoded with `str`. Two backends are available:
+    "orjson", used automatically when the optional `orjson` package is installed, and the
+    standard library "json" module as a fallback. Both give the same output: objects the fast
+    path rejects, such as integers wider than 64 bits for orjson or tuple keys, are encoded by
+    the standard library after converting unsupported keys with `str`.
+
+    Args:
+        backend (str): "auto", "orjson" or "json".
+
+    Example:
+        encoder = JSONEncoder()
+        encoder.dumps({"user_id": 42})  # '{"user_id":42}'
+    """
+
+    def __init__(self, backend="auto"):
+        if backend == "auto":
+            backend = "orjson" if orjson is not None else "json"
+        if backend == "orjson":
+            if orjson is None:
+                raise ValueError("The orjson JSON encoder backend requires the orjson package")
+            self.dumps = self._orjson_dumps
+        elif backend == "json":
+            self.dumps = self._json_dumps
+        else:
+            raise ValueError(f"Unsupported JSON encoder backend: {backend}")
+        self.backend = backend
+
+    @staticmethod
+    def _orjson_dumps(obj):
+        try:
+            return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS).decode()
+        except TypeError:
+            return _json_dumps(_with_str_keys(obj))
+
+    @staticmethod
+    def _json_dumps(obj):
+        try:
+            return _json_dumps(obj)
+        except TypeError:
+            return _json_dumps(_with_str_keys(obj))
+
+    def ndjson(self, objects):
+        """
+        Encodes objects as newline-delimited JSON, one object per line.
+        """
+        dumps = self.dumps
+        return "".join(dumps(obj) + "\n" for obj in objects)
+
+
+_encoders = {}
+
+
+def get_encoder(backend="auto"):
+    """
+    Returns a shared `JSONEncoder` for a backend.
+    """
+    encoder = _encoders.get(backend)
+    if encoder is None:
+        encoder = _encoders[backend] = JSONEncoder(backend)
+    return encoder
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats a record as a single JSON object, without colors or a text prefix.
+
+    The object holds the timestamp (ISO 8601, UTC), level, logger name and message, followed by
+    the structured fields the record was logged with (`record.fields`), so that a structured
+    record is encoded exactly once on its way to a sink.
+
+    Args:
+        encoder (JSONEncoder): The encoder to use, defaults to the shared automatic one.
+
+    Example:
+        {"timestamp":"2024-08-17T12:30:00.123Z","level":"INFO","logger":"LoglessLogger","message":"user login","user_id":42}
+    """
+
+    def __init__(self, encoder=None):
+        super().__init__()
+        self.encoder = encoder or get_encoder()
+
+    def format(self, record):
+        created = record.created
+        data = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(created)) + ".%03dZ" % record.msecs,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            for key, value in fields.items():
+                data.setdefault(key, value)
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        return self.encoder.dumps(data)
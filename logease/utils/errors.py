@@ -0,0 +1,28 @@
+import sys
+import logging
+import traceback
+
+
+def report_error(message, exc_info=True):
+    """
+    Reports a failure in a logease background thread on stderr, with the traceback of the
+    exception being handled.
+
+    Like `logging.Handler.handleError`, it stays silent when `logging.raiseExceptions` is False,
+    and it never writes to stdout, which belongs to the application.
+
+    Args:
+        message (str): What failed, e.g. "configuration reload failed".
+        exc_info (bool): Include the traceback; False for problems fully described by the message,
+            such as an invalid configuration value.
+
+    Example:
+        try:
+            self.drain()
+        except Exception:
+            report_error("thread buffer drain failed")
+    """
+    if logging.raiseExceptions and sys.stderr:
+        sys.stderr.write(f"--- Logease error: {message}\n")
+        if exc_info:
+            traceback.print_exc(file=sys.stderr)
@@ -0,0 +1,45 @@
+# Keys that `JSONFormatter` writes for every record; a field with one of these names would be lost.
+RESERVED_FIELDS = frozenset(("timestamp", "level", "logger", "message", "exception"))
+
+
+def check_fields(fields):
+    """
+    Rejects structured fields whose names collide with the keys every record already has.
+
+    Args:
+        fields (dict): The fields of a record.
+
+    Raises:
+        TypeError: If a field is named after a reserved key, e.g. "message" or "level".
+    """
+    if not RESERVED_FIELDS.isdisjoint(fields):
+        names = ", ".join(sorted(RESERVED_FIELDS.intersection(fields)))
+        raise TypeError(f"Structured field names {names} are reserved for the record itself; rename the fields")
+
+
+def resolve_fields(fields):
+    """
+    Evaluates the lazy values of structured fields.
+
+    A callable value is called without arguments and replaced by its result, so that costly values
+    are only computed for records that are actually logged. A value whose evaluation raises is
+    replaced by a short description of the error instead of failing the logging call.
+
+    Args:
+        fields (dict): The fields of a record.
+
+    Returns:
+        dict: The fields with every lazy value evaluated.
+
+    Example:
+        logger.debug("cache state", entries=lambda: len(cache), snapshot=cache.describe)
+    """
+    resolved = {}
+    for key, value in fields.items():
+        if callable(value):
+            try:
+                value = value()
+            except Exception as e:
+                value = f"<{type(e).__name__}: {e}>"
+        resolved[key] = value
+    return resolved
@@ -0,0 +1,211 @@
+import time
+import hashlib
+import threading
+import traceback
+from collections import OrderedDict
+
+
+class TracebackCache:
+    """
+    An LRU cache of formatted tracebacks keyed by exception fingerprint.
+
+    A fingerprint is built from the exception type and the code locations
+    (file, line, function) of every frame in its traceback, so the same failure
+    raised from the same place maps to the same entry regardless of the message.
+    The traceback text is rendered at most once per fingerprint, when the report of
+    the first occurrence is rendered; repeats just bump a counter and are reported
+    periodically as a summary.
+
+    A summary is due after `summary_every` unreported repeats or `summary_interval` seconds.
+    `observe` returns it with the next occurrence; repeats that no later occurrence reports,
+    such as the end of a burst, are returned by `sweep` once due and by `flush` (see
+    `Logger.watch_tracebacks`, which calls them from a `SummarySweeper` and at exit).
+
+    Args:
+        max_entries (int): The maximum number of fingerprints kept before the least recently seen is evicted.
+        summary_every (int): Report a summary after this many unreported repeats.
+        summary_interval (float): Report a summary when this many seconds passed since the last report.
+
+    Example:
+        cache = TracebackCache()
+        report = cache.observe(exc)
+        if report is not None:
+            logger.error(report.render())
+    """
+
+    def __init__(self, max_entries=256, summary_every=100, summary_interval=60.0):
+        self.max_entries = max_entries
+        self.summary_every = summary_every
+        self.summary_interval = summary_interval
+        self._entries = OrderedDict()
+        self._evicted = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(exc):
+        """
+        Builds the cache key for an exception without formatting anything.
+
+        Args:
+            exc (BaseException): The exception to fingerprint.
+
+        Returns:
+            tuple: The exception type followed by the (file, line, function) of each frame.
+        """
+        frames = []
+        tb = exc.__traceback__
+        while tb is not None:
+            code = tb.tb_frame.f_code
+            frames.append((code.co_filename, tb.tb_lineno, code.co_name))
+            tb = tb.tb_next
+        return (type(exc).__module__, type(exc).__qualname__, tuple(frames))
+
+    @staticmethod
+    def digest(key):
+        """
+        Turns a cache key into a short fingerprint that is stable across processes.
+
+        Args:
+            key (tuple): A key returned by `TracebackCache.key`.
+
+        Returns:
+            str: A 16 character hex fingerprint.
+        """
+        module, qualname, frames = key
+        parts = [f"{module}.{qualname}"]
+        parts.extend(f"{file}:{line}:{name}" for file, line, name in frames)
+        return hashlib.blake2b("|".join(parts).encode(), digest_size=8).hexdigest()
+
+    def observe(self, exc, level="ERROR"):
+        """
+        Records an occurrence of an exception and decides whether it should be logged.
+
+        Args:
+            exc (BaseException): The exception that was raised.
+            level (str): The level the occurrence is logged at, also used for its swept summaries.
+
+        Returns:
+            TracebackReport | None: A report for the first occurrence or a due summary, otherwise None.
+        """
+        key = self.key(exc)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(self.digest(key), f"{type(exc).__name__}: {exc}", level, now)
+                if len(self._entries) > self.max_entries:
+                    _, evicted = self._entries.popitem(last=False)
+                    if evicted.count > evicted.reported:
+                        self._evicted.append((evicted.level, evicted.summary()))
+                return TracebackReport(entry, exc, first=True)
+            self._entries.move_to_end(key)
+            entry.count += 1
+            entry.level = level
+            if (
+                entry.count - entry.reported < self.summary_every
+                and now - entry.reported_at < self.summary_interval
+            ):
+                return None
+            entry.reported = entry.count
+            entry.reported_at = now
+            return TracebackReport(entry, exc, first=False)
+
+    def sweep(self):
+        """
+        Reports the repeats that are due but were not reported because no occurrence followed.
+
+        Returns:
+            list: The (level, summary message) pairs to log.
+        """
+        return self._summaries(time.monotonic() - self.summary_interval)
+
+    def flush(self):
+        """
+        Reports every repeat not reported yet, e.g. at exit.
+
+        Returns:
+            list: The (level, summary message) pairs to log.
+        """
+        return self._summaries(None)
+
+    def _summaries(self, reported_before):
+        now = time.monotonic()
+        with self._lock:
+            summaries, self._evicted = self._evicted, []
+            for entry in self._entries.values():
+                if entry.count > entry.reported and (reported_before is None or entry.reported_at <= reported_before):
+                    summaries.append((entry.level, entry.summary()))
+                    entry.reported = entry.count
+                    entry.reported_at = now
+        return summaries
+
+    def clear(self):
+        """
+        Forgets every cached fingerprint.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._evicted.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "label", "level", "formatted", "count", "reported", "reported_at")
+
+    def __init__(self, fingerprint, label, level, now):
+        self.fingerprint = fingerprint
+        self.label = label
+        self.level = level
+        self.formatted = None
+        self.count = 1
+        self.reported = 1
+        self.reported_at = now
+
+    def summary(self):
+        return f"{self.label} [fingerprint {self.fingerprint}, seen {self.count} times]"
+
+
+class TracebackReport:
+    """
+    The outcome of `TracebackCache.observe` for an occurrence that should be logged.
+
+    Attributes:
+        fingerprint (str): The stable fingerprint of the exception.
+        formatted (str): The cached traceback text of the first occurrence, formatted on first access.
+        count (int): How many times the fingerprint has been seen so far.
+        first (bool): True for the first occurrence, False for a periodic summary.
+    """
+
+    __slots__ = ("fingerprint", "count", "first", "exception", "_entry")
+
+    def __init__(self, entry, exc, first):
+        self.fingerprint = entry.fingerprint
+        self.count = entry.count
+        self.first = first
+        self.exception = exc
+        self._entry = entry
+
+    @property
+    def formatted(self):
+        entry = self._entry
+        if entry.formatted is None:
+            exc = self.exception
+            entry.formatted = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+        return entry.formatted
+
+    def render(self):
+        """
+        Returns the full traceback for a first occurrence, or a one-line summary for repeats.
+        """
+        if self.first:
+            return self.formatted
+        exc = self.exception
+        return (
+            f"{type(exc).__name__}: {exc} "
+            f"[fingerprint {self.fingerprint}, seen {self.count} times]"
+        )
+
+
+traceback_cache = TracebackCache()
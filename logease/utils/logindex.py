@@ -0,0 +1,331 @@
+import os
+import re
+import mmap
+import time
+import struct
+import bisect
+import hashlib
+from datetime import datetime, timezone
+
+INDEX_MAGIC = b"LGEI\x01"
+
+LEVEL_BITS = {
+    "DEBUG": 0x01,
+    "INFO": 0x02,
+    "WARNING": 0x04,
+    "ERROR": 0x08,
+    "CRITICAL": 0x10,
+}
+
+_HEADER = struct.Struct("<Q8s")
+_ENTRY = struct.Struct("<dQB")
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+_RECORD_START = re.compile(
+    rb"(?:\x1b\[[0-9;]*m)?(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}) - .*? - (DEBUG|INFO|WARNING|ERROR|CRITICAL) - "
+)
+_JSON_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+_JSON_RECORD_START = re.compile(
+    rb'\{"timestamp":"(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3})Z","level":"(DEBUG|INFO|WARNING|ERROR|CRITICAL)"'
+)
+
+
+def format_timestamp(value):
+    """
+    Converts an epoch timestamp to the `asctime` layout used in log lines, so that
+    timestamps can be compared as bytes.
+    """
+    moment = datetime.fromtimestamp(value)
+    return f"{moment.strftime(_TIMESTAMP_FORMAT)},{moment.microsecond // 1000:03d}".encode()
+
+
+def parse_timestamp(raw):
+    """
+    Converts an `asctime` timestamp taken from a log line to an epoch timestamp.
+    """
+    text = raw.decode()
+    return datetime.strptime(text[:19], _TIMESTAMP_FORMAT).timestamp() + int(text[20:23]) / 1000
+
+
+def format_json_timestamp(value):
+    """
+    Converts an epoch timestamp to the UTC layout of `JSONFormatter` records, without the "Z".
+    """
+    moment = datetime.fromtimestamp(value, timezone.utc)
+    return f"{moment.strftime(_JSON_TIMESTAMP_FORMAT)}.{moment.microsecond // 1000:03d}".encode()
+
+
+def parse_json_timestamp(raw):
+    """
+    Converts a timestamp taken from a `JSONFormatter` record to an epoch timestamp.
+    """
+    text = raw.decode()
+    moment = datetime.strptime(text[:19], _JSON_TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+    return moment.timestamp() + int(text[20:23]) / 1000
+
+
+class LogIndex:
+    """
+    A sparse sidecar index over a text or JSON lines log file written by logease.
+
+    Every `block_size` bytes, the index stores the timestamp and byte offset of the first record
+    starting in the block, plus a bit mask of the levels found in it. The index lives next to the
+    log file (`<file>.idx`) and is extended incrementally as the file grows; it is rebuilt when the
+    file is truncated or replaced. `search` uses it to jump straight to a time range and to skip
+    blocks that cannot contain the requested levels, reading the file through a memory map.
+
+    Files starting with "{" are read as the JSON lines written with `LOCAL_FILE_FORMAT=json`, whose
+    timestamps are in UTC; other files as the text layout of `CustomFormatter`.
+
+    Args:
+        path (str): The log file.
+        block_size (int): The approximate number of bytes covered by one index entry.
+
+    Example:
+        index = LogIndex("logs/app.log")
+        for line in index.search(start=time.time() - 900, levels={"ERROR"}):
+            print(line.decode(), end="")
+    """
+
+    def __init__(self, path, block_size=64 * 1024):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self.block_size = block_size
+        self.indexed_size = 0
+        self.head = b""
+        self.timestamps = []
+        self.offsets = []
+        self.masks = []
+        self._record_start = _RECORD_START
+        self._parse_timestamp = parse_timestamp
+        self._format_timestamp = format_timestamp
+
+    def update(self):
+        """
+        Loads the sidecar index and extends it to cover the current end of the log file.
+        """
+        size = os.path.getsize(self.path)
+        self._detect_format()
+        self._load()
+        if self.indexed_size > size or self.head != self._read_head(self.indexed_size):
+            self.indexed_size = 0
+            self.timestamps, self.offsets, self.masks = [], [], []
+        if self.indexed_size == size or size == 0:
+            return
+
+        start = 0
+        if self.offsets:
+            # The last block may have been incomplete; index it again.
+            start = self.offsets.pop()
+            self.timestamps.pop()
+            self.masks.pop()
+
+        with open(self.path, "rb") as stream, mmap.mmap(stream.fileno(), size, access=mmap.ACCESS_READ) as data:
+            block_start = block_ts = None
+            mask = 0
+            end = start
+            for offset, line_end, match in self._lines(data, start, size):
+                if match is None:
+                    end = line_end
+                    continue
+                if block_start is None or offset - block_start >= self.block_size:
+                    if block_start is not None:
+                        self._append(block_ts, block_start, mask)
+                    block_start, block_ts, mask = offset, self._parse_timestamp(match.group(1)), 0
+                mask |= LEVEL_BITS[match.group(2).decode()]
+                end = line_end
+            if block_start is not None:
+                self._append(block_ts, block_start, mask)
+
+        self.indexed_size = end
+        self.head = self._read_head(end)
+        self._save()
+
+    def search(self, start=None, end=None, levels=None, pattern=None):
+        """
+        Yields the records of the log file matching every given filter, in file order.
+
+        Args:
+            start (float): Only records at or after this epoch timestamp.
+            end (float): Only records before this epoch timestamp.
+            levels (set): Only records at these levels, e.g. {"ERROR", "CRITICAL"}.
+            pattern (bytes): Only records matching this regular expression, e.g. a function name.
+
+        Yields:
+            bytes: Each matching record, including continuation lines such as tracebacks.
+
+        Raises:
+            ValueError: If the file has complete lines but none of them is a logease record.
+        """
+        self.update()
+        if not self.offsets:
+            if self.indexed_size:
+                raise ValueError("Not a logease text or JSON lines log file")
+            return
+        wanted = 0
+        for level in levels or ():
+            wanted |= LEVEL_BITS[level.upper()]
+        start_key = self._format_timestamp(start) if start is not None else None
+        end_key = self._format_timestamp(end) if end is not None else None
+        regex = re.compile(pattern) if pattern else None
+
+        first = 0
+        if start is not None:
+            first = max(bisect.bisect_left(self.timestamps, start) - 1, 0)
+
+        size = os.path.getsize(self.path)
+        with open(self.path, "rb") as stream, mmap.mmap(stream.fileno(), size, access=mmap.ACCESS_READ) as data:
+            block = first
+            while block < len(self.offsets):
+                if end is not None and self.timestamps[block] >= end:
+                    return
+                if wanted and not self.masks[block] & wanted:
+                    block += 1
+                    continue
+                block_end = self.offsets[block + 1] if block + 1 < len(self.offsets) else size
+                for record, timestamp, level in self._records(data, self.offsets[block], block_end):
+                    if start_key is not None and timestamp < start_key:
+                        continue
+                    if end_key is not None and timestamp >= end_key:
+                        return
+                    if wanted and not LEVEL_BITS[level] & wanted:
+                        continue
+                    if regex is not None and not regex.search(record):
+                        continue
+                    yield record
+                block += 1
+
+    def _records(self, data, start, stop):
+        record_start = timestamp = level = None
+        record_end = start
+        for offset, line_end, match in self._lines(data, start, stop):
+            if match is None:
+                record_end = line_end
+                continue
+            if record_start is not None:
+                yield data[record_start:record_end], timestamp, level
+            record_start, record_end = offset, line_end
+            timestamp, level = match.group(1), match.group(2).decode()
+        if record_start is not None:
+            yield data[record_start:record_end], timestamp, level
+
+    def _lines(self, data, start, stop):
+        record_start = self._record_start
+        offset = start
+        while offset < stop:
+            line_end = data.find(b"\n", offset, stop)
+            if line_end == -1:
+                # A partially written line; it is picked up by the next update.
+                return
+            line_end += 1
+            yield offset, line_end, record_start.match(data, offset, line_end)
+            offset = line_end
+
+    def _detect_format(self):
+        with open(self.path, "rb") as stream:
+            is_json = stream.read(1) == b"{"
+        if is_json:
+            self._record_start = _JSON_RECORD_START
+            self._parse_timestamp = parse_json_timestamp
+            self._format_timestamp = format_json_timestamp
+        else:
+            self._record_start = _RECORD_START
+            self._parse_timestamp = parse_timestamp
+            self._format_timestamp = format_timestamp
+
+    def _append(self, timestamp, offset, mask):
+        self.timestamps.append(timestamp)
+        self.offsets.append(offset)
+        self.masks.append(mask)
+
+    def _read_head(self, length):
+        # Identifies the file by its first bytes, so that a rotated file is not mistaken for a grown one.
+        with open(self.path, "rb") as stream:
+            return hashlib.blake2b(stream.read(min(length, 4096)), digest_size=8).digest()
+
+    def _load(self):
+        try:
+            with open(self.index_path, "rb") as stream:
+                data = stream.read()
+        except FileNotFoundError:
+            return
+        if not data.startswith(INDEX_MAGIC):
+            return
+        self.indexed_size, self.head = _HEADER.unpack_from(data, len(INDEX_MAGIC))
+        self.timestamps, self.offsets, self.masks = [], [], []
+        for timestamp, offset, mask in _ENTRY.iter_unpack(data[len(INDEX_MAGIC) + _HEADER.size:]):
+            self._append(timestamp, offset, mask)
+
+    def _save(self):
+        out = bytearray(INDEX_MAGIC)
+        out += _HEADER.pack(self.indexed_size, self.head)
+        for entry in zip(self.timestamps, self.offsets, self.masks):
+            out += _ENTRY.pack(*entry)
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "wb") as stream:
+            stream.write(out)
+        os.replace(temp_path, self.index_path)
+
+
+def parse_time(value):
+    """
+    Parses a time given on the command line into an epoch timestamp.
+
+    Accepts ISO dates ("2024-08-17 12:30", "2024-08-17T12:30:00") and durations relative
+    to now ("90s", "15m", "2h", "1d").
+
+    Raises:
+        ValueError: If the value is neither.
+    """
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    if value[-1:] in units and value[:-1].isdigit():
+        return time.time() - int(value[:-1]) * units[value[-1]]
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(f"Invalid time '{value}', expected an ISO date or a duration such as 15m, 2h") from None
+
+
+def tail(path, lines=10):
+    """
+    Returns the last `lines` lines of a file, reading backwards through a memory map.
+
+    Args:
+        path (str): The log file.
+        lines (int): The number of lines to return.
+
+    Returns:
+        tuple: The bytes of the last lines and the file size they were read at.
+    """
+    size = os.path.getsize(path)
+    if size == 0 or lines <= 0:
+        return b"", size
+    with open(path, "rb") as stream, mmap.mmap(stream.fileno(), size, access=mmap.ACCESS_READ) as data:
+        position = size - 1 if data[size - 1:size] == b"\n" else size
+        for _ in range(lines):
+            position = data.rfind(b"\n", 0, position)
+            if position == -1:
+                break
+        return data[position + 1:size], size
+
+
+def follow(path, position, interval=0.5):
+    """
+    Yields data appended to a file after `position`, polling its size.
+
+    Starts again from the beginning when the file is truncated or rotated.
+    """
+    while True:
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            size = 0
+        if size < position:
+            position = 0
+        if size > position:
+            with open(path, "rb") as stream:
+                stream.seek(position)
+                chunk = stream.read(size - position)
+            position = size
+            yield chunk
+        else:
+            time.sleep(interval)
@@ -0,0 +1,123 @@
+class RingBuffer:
+    """
+    A fixed-size, preallocated ring buffer that overwrites its oldest item when full.
+
+    The buffer is not synchronized; it is meant to be owned by a single thread or task.
+
+    Args:
+        capacity (int): The number of items kept.
+
+    Example:
+        ring = RingBuffer(3)
+        for i in range(5):
+            ring.append(i)
+        ring.drain()  # [2, 3, 4]
+    """
+
+    __slots__ = ("capacity", "_items", "_next", "_size")
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError(f"Ring buffer capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._next = 0
+        self._size = 0
+
+    def append(self, item):
+        """
+        Stores an item, overwriting the oldest one when the buffer is full.
+        """
+        index = self._next
+        self._items[index] = item
+        index += 1
+        self._next = 0 if index == self.capacity else index
+        if self._size < self.capacity:
+            self._size += 1
+
+    def drain(self):
+        """
+        Removes and returns every stored item, oldest first.
+
+        Returns:
+            list: The buffered items.
+        """
+        size, start = self._size, self._next - self._size
+        if start < 0:
+            items = self._items[start:] + self._items[:self._next]
+        else:
+            items = self._items[start:self._next]
+        self._items[:] = [None] * self.capacity
+        self._next = self._size = 0
+        return items if size else []
+
+    def __len__(self):
+        return self._size
+
+
+class SPSCBuffer:
+    """
+    A fixed-size, preallocated buffer for one producer thread and one consumer thread.
+
+    The producer only writes `head` and the consumer only writes `tail`, so neither side takes a
+    lock: under the GIL, storing a slot and then advancing the counter publishes the item to the
+    consumer. When the buffer is full, `push` refuses the item instead of overwriting one the
+    consumer may be reading.
+
+    Args:
+        capacity (int): The number of items held.
+
+    Example:
+        buffer = SPSCBuffer(1024)
+        buffer.push(record)     # producer thread
+        records = buffer.take() # consumer thread
+    """
+
+    __slots__ = ("capacity", "_items", "head", "tail")
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError(f"Buffer capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self.head = 0
+        self.tail = 0
+
+    def push(self, item):
+        """
+        Stores an item. Must only be called by the producer.
+
+        Returns:
+            bool: False when the buffer is full and the item was not stored.
+        """
+        head = self.head
+        if head - self.tail >= self.capacity:
+            return False
+        self._items[head % self.capacity] = item
+        self.head = head + 1
+        return True
+
+    def take(self):
+        """
+        Removes and returns the stored items, oldest first. Must only be called by the consumer.
+
+        Returns:
+            list: The items.
+        """
+        tail, head = self.tail, self.head
+        if tail == head:
+            return []
+        items, capacity = self._items, self.capacity
+        start, end = tail % capacity, head % capacity
+        if start < end:
+            taken = items[start:end]
+            items[start:end] = [None] * (end - start)
+        else:
+            taken = items[start:] + items[:end]
+            items[start:] = [None] * (capacity - start)
+            items[:end] = [None] * end
+        self.tail = head
+        return taken
+
+    def __len__(self):
+        return self.head - self.tail
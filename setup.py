@@ -18,6 +18,9 @@ setup(
         'pysnmp',
         'termcolor'
     ],
+    extras_require={
+        'orjson': ['orjson'],
+    },
     entry_points={
         'console_scripts': [
             'logease=logease.cli:main',
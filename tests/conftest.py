@@ -0,0 +1,2 @@
+# test_decorators.py holds a copy of an old setup script, which calls setup() when imported.
+collect_ignore = ["test_decorators.py"]
@@ -0,0 +1,67 @@
+import time
+import logging
+
+from logease.handlers.aggregation import AggregatingHandler
+
+
+class Target(logging.Handler):
+    def __init__(self, fail=False):
+        super().__init__()
+        self.fail = fail
+        self.records = []
+
+    def emit(self, record):
+        if self.fail and record.getMessage() == "log rollup":
+            raise ConnectionError("aggregation service down")
+        self.records.append(record)
+
+    def handleError(self, record):
+        raise
+
+
+def record(msg, level=logging.INFO, **fields):
+    return logging.makeLogRecord(
+        {"name": "app", "msg": msg, "levelno": level, "levelname": logging.getLevelName(level), "fields": fields}
+    )
+
+
+def test_rollup_counts_records_and_escalates_errors_and_slow_calls():
+    target = Target()
+    handler = AggregatingHandler(target, interval=3600, latency_threshold_ms=500)
+    for duration in (10, 20, 30, 40):
+        handler.handle(record("charge returned", function="shop.charge", duration_ms=duration))
+    handler.handle(record("charge returned", function="shop.charge", duration_ms=900))
+    handler.handle(record("charge failed", logging.ERROR, function="shop.charge"))
+    assert [entry.getMessage() for entry in target.records] == ["charge returned", "charge failed"]
+
+    summary = handler.rollover()
+    assert target.records[-1].fields is summary
+    assert summary["records"] == 6 and summary["errors"] == 1 and summary["escalated"] == 2
+    assert summary["levels"] == {"INFO": 5, "ERROR": 1}
+    charge = summary["functions"]["shop.charge"]
+    assert charge["count"] == 6 and charge["errors"] == 1
+    assert charge["latency_ms"]["p50"] == 30 and charge["latency_ms"]["max"] == 900
+
+    assert handler.rollover() is None
+    handler.close()
+
+
+def test_rollover_failures_are_reported_on_stderr(capsys):
+    target = Target(fail=True)
+    handler = AggregatingHandler(target, interval=0.02)
+    handler.handle(record("tick"))
+    err, out = "", ""
+    deadline = time.monotonic() + 5
+    while "ConnectionError: aggregation service down" not in err and time.monotonic() < deadline:
+        time.sleep(0.01)
+        captured = capsys.readouterr()
+        err, out = err + captured.err, out + captured.out
+
+    assert "--- Logease error: aggregation rollover failed" in err
+    assert out == ""
+    # The background thread keeps running after a failure.
+    assert handler._thread.is_alive()
+    target.fail = False
+    handler.handle(record("tock"))
+    handler.close()
+    assert target.records[-1].getMessage() == "log rollup"
@@ -0,0 +1,126 @@
+import time
+import logging
+
+from logease.handlers.batching import AdaptiveBatchController, BatchWorker
+from logease.handlers.resilience import CircuitBreaker, ResilientHandler, RetryPolicy
+
+
+class FixedController:
+    def __init__(self, batch_size, linger):
+        self.batch_size = batch_size
+        self.linger = linger
+
+    def observe_batch(self, *args):
+        pass
+
+
+class Recorder:
+    def __init__(self):
+        self.batches = []
+
+    def deliver_batch(self, log_entries, records):
+        self.batches.append(log_entries)
+
+
+class Endpoint(ResilientHandler):
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.down = False
+        self.sent = []
+
+    def send_batch(self, log_entries, records):
+        if self.down:
+            raise ConnectionError("endpoint down")
+        self.sent.extend(log_entries)
+
+
+def record(message):
+    return logging.makeLogRecord({"msg": message})
+
+
+def test_controller_sizes_batches_from_the_arrival_rate():
+    controller = AdaptiveBatchController(target_latency=1.0, max_batch=500)
+    controller.observe_batch(1, arrivals=100, interval=1.0, send_latency=0.1, oldest_age=0.1)
+    assert controller.linger == 1.0 - 0.1 * 1.5
+    assert controller.batch_size == int(100 * controller.linger)
+
+    controller.observe_batch(1, arrivals=0, interval=0.1, send_latency=0.1, oldest_age=0.1, backlog=300)
+    assert controller.batch_size == 300
+
+
+def test_controller_caps_batches_at_peak_and_at_low_traffic():
+    controller = AdaptiveBatchController(target_latency=1.0, min_batch=2, max_batch=500)
+    controller.observe_batch(500, arrivals=10000, interval=1.0, send_latency=0.1, oldest_age=0.5)
+    assert controller.batch_size == 500
+
+    idle = AdaptiveBatchController(target_latency=1.0, min_batch=2, max_batch=500)
+    idle.observe_batch(1, arrivals=1, interval=1.0, send_latency=0.1, oldest_age=0.5)
+    assert idle.batch_size == 2
+
+
+def test_controller_halves_the_size_cap_after_a_slow_send():
+    controller = AdaptiveBatchController(target_latency=1.0, max_batch=500, increase=10)
+    controller.observe_batch(400, arrivals=10000, interval=1.0, send_latency=0.9, oldest_age=1.0)
+    assert controller.size_cap == 200
+    assert controller.batch_size <= 200
+
+    controller.observe_batch(200, arrivals=10000, interval=1.0, send_latency=0.01, oldest_age=0.1)
+    assert controller.size_cap == 210
+
+
+def test_worker_sends_full_batches_and_flushes_the_rest():
+    handler = Recorder()
+    worker = BatchWorker(handler, FixedController(batch_size=10, linger=30), max_queue=100)
+    worker.start()
+    for n in range(25):
+        assert worker.put(str(n), None)
+
+    started = time.monotonic()
+    worker.flush()
+    assert time.monotonic() - started < 5
+    assert [len(batch) for batch in handler.batches] == [10, 10, 5]
+    assert sum(handler.batches, []) == [str(n) for n in range(25)]
+
+    worker.stop()
+    assert not worker.is_alive()
+
+
+def test_worker_drops_records_beyond_its_queue():
+    worker = BatchWorker(Recorder(), FixedController(batch_size=10, linger=30), max_queue=3)
+    assert [worker.put(str(n), None) for n in range(5)] == [True, True, True, False, False]
+    assert worker.depth() == 3
+    assert worker.arrived == 5
+
+
+def test_worker_delivers_queued_records_on_stop():
+    handler = Recorder()
+    worker = BatchWorker(handler, FixedController(batch_size=100, linger=30))
+    worker.start()
+    for n in range(7):
+        worker.put(str(n), None)
+    worker.stop()
+    assert sum(handler.batches, []) == [str(n) for n in range(7)]
+
+
+def test_batching_handler_recovers_after_the_breaker_probe():
+    handler = Endpoint(
+        breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.2),
+        retry=RetryPolicy(retries=0),
+        batch=AdaptiveBatchController(target_latency=0.05),
+    )
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.down = True
+    handler.handle(record("lost"))
+    handler.flush()
+    assert handler.breaker.state == CircuitBreaker.OPEN
+
+    handler.down = False
+    time.sleep(0.25)
+    for n in range(6):
+        handler.handle(record(str(n)))
+    handler.flush()
+    handler.close()
+
+    assert handler.breaker.state == CircuitBreaker.CLOSED
+    assert handler.sent == [str(n) for n in range(6)]
+    assert handler.dropped == 1
@@ -0,0 +1,65 @@
+import logging
+
+from logease.handlers.binary import BinaryEncoder, BinaryDecoder
+
+
+def record(msg, args=(), name="app", **extra):
+    return logging.makeLogRecord({"name": name, "msg": msg, "args": args, "levelno": 20, "levelname": "INFO", **extra})
+
+
+def decode(encoder, records):
+    data = encoder.header() + b"".join(encoder.encode(item) for item in records)
+    return list(BinaryDecoder(data))
+
+
+def test_rendered_messages_do_not_grow_the_intern_table():
+    encoder = BinaryEncoder()
+    entries = decode(encoder, [record(f"user {i} logged in") for i in range(2000)])
+
+    assert [entry["message"] for entry in entries] == [f"user {i} logged in" for i in range(2000)]
+    assert len(encoder._ids) == 1
+    assert len(encoder._seen) <= encoder.max_templates
+
+
+def test_repeated_templates_are_interned_and_rendered_at_decode_time():
+    encoder = BinaryEncoder()
+    frames = [encoder.encode(record("job %s took %d ms", ("sync", i))) for i in range(3)]
+
+    assert len(frames[2]) < len(frames[0])
+    entries = list(BinaryDecoder(encoder.header() + b"".join(frames)))
+    assert [entry["message"] for entry in entries] == [f"job sync took {i} ms" for i in range(3)]
+    assert entries[0]["template"] == "job %s took %d ms"
+
+
+def test_intern_table_is_bounded_and_ids_are_reused():
+    encoder = BinaryEncoder(max_templates=2)
+    messages = ["a", "b", "c", "a", "b", "c", "c", "a", "d", "d", "b", "a"] * 3
+    entries = decode(encoder, [record(message, name=f"logger{i % 3}") for i, message in enumerate(messages)])
+
+    assert [entry["message"] for entry in entries] == messages
+    assert [entry["name"] for entry in entries] == [f"logger{i % 3}" for i in range(len(messages))]
+    assert len(encoder._ids) <= 2
+
+
+def test_fields_round_trip():
+    encoder = BinaryEncoder()
+    entries = decode(encoder, [record("login", fields={"user_id": 42, "tags": ["a", 1.5], "ok": True})])
+
+    assert entries[0]["fields"] == {"user_id": 42, "tags": ["a", 1.5], "ok": True}
+
+
+def test_truncated_file_stops_at_the_last_complete_frame(tmp_path):
+    from logease.handlers.binary import decode_file
+
+    encoder = BinaryEncoder()
+    frames = [encoder.encode(record("job %s took %d ms", (f"name{i}", i), fields={"n": "x" * i})) for i in range(4)]
+    data = encoder.header() + b"".join(frames)
+    complete = len(data) - len(frames[-1])
+
+    for cut in range(complete, len(data)):
+        entries = list(BinaryDecoder(data[:cut]))
+        assert [entry["message"] for entry in entries] == [f"job name{i} took {i} ms" for i in range(3)]
+
+    path = tmp_path / "app.bin"
+    path.write_bytes(data[:-1])
+    assert len(list(decode_file(path))) == 3
@@ -0,0 +1,147 @@
+import time
+import logging
+import threading
+
+from logease.handlers.broker import LocalBroker, LocalTransport, MessageQueueHandler
+from logease.handlers.resilience import RetryPolicy
+
+
+class SlowConfirms(LocalTransport):
+    """
+    Confirms batches 5 ms after they were published and records the largest number of unconfirmed batches.
+    """
+
+    def __init__(self, broker):
+        super().__init__(broker)
+        self.published_at = {}
+        self.max_unconfirmed = 0
+
+    def publish(self, sequence, messages):
+        self.published_at[sequence] = time.monotonic()
+        self.max_unconfirmed = max(self.max_unconfirmed, len(self.published_at))
+        super().publish(sequence, messages)
+
+    def confirms(self, timeout):
+        time.sleep(timeout)
+        due = time.monotonic() - 0.005
+        with self._lock:
+            confirms = [confirm for confirm in self._confirms if self.published_at[confirm[0]] <= due]
+            for confirm in confirms:
+                self._confirms.remove(confirm)
+                del self.published_at[confirm[0]]
+        return confirms
+
+
+class RejectFirst(LocalTransport):
+    """
+    Rejects the first `count` batches without passing them to the broker.
+    """
+
+    def __init__(self, broker, count):
+        super().__init__(broker)
+        self.count = count
+
+    def publish(self, sequence, messages):
+        if self.count:
+            self.count -= 1
+            with self._lock:
+                self._confirms.append((sequence, False))
+                self._confirmed.notify()
+            return
+        super().publish(sequence, messages)
+
+
+def make_handler(transport, **options):
+    handler = MessageQueueHandler(transport, **options)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    return handler
+
+
+def log(handler, count):
+    for n in range(count):
+        handler.handle(logging.makeLogRecord({"msg": str(n)}))
+
+
+def consume_all(broker):
+    messages = []
+    while len(broker):
+        messages += broker.consume(max_messages=1000, timeout=0)
+    return messages
+
+
+def test_max_in_flight_is_never_exceeded():
+    broker = LocalBroker()
+    transport = SlowConfirms(broker)
+    handler = make_handler(transport, batch_size=5, max_in_flight=3)
+    log(handler, 200)
+    handler.flush()
+    handler.close()
+    assert transport.max_unconfirmed == 3
+    assert consume_all(broker) == [str(n) for n in range(200)]
+    assert handler.metrics()["confirmed"] == 200
+
+
+def test_negative_confirms_are_retried():
+    broker = LocalBroker()
+    handler = make_handler(RejectFirst(broker, 2), batch_size=10, retry=RetryPolicy(retries=3, backoff=0.001))
+    log(handler, 10)
+    handler.flush()
+    handler.close()
+    metrics = handler.metrics()
+    assert sorted(consume_all(broker), key=int) == [str(n) for n in range(10)]
+    assert metrics["rejected"] == 20
+    assert metrics["confirmed"] == 10
+    assert metrics["dropped"] == 0
+
+
+def full_broker_handler(block):
+    broker = LocalBroker(capacity=10)
+    broker.publish(["old"] * 10)
+    handler = make_handler(
+        LocalTransport(broker),
+        batch_size=10,
+        max_in_flight=1,
+        max_queue=20,
+        block=block,
+        timeout=5,
+        retry=RetryPolicy(retries=1000, backoff=0.001, max_backoff=0.005),
+    )
+    return broker, handler
+
+
+def test_full_broker_drops_without_block():
+    broker, handler = full_broker_handler(block=False)
+    log(handler, 100)
+    dropped = handler.metrics()["dropped"]
+    # At most one batch is taken out of the buffer while the broker rejects it.
+    assert dropped >= 100 - 20 - 10
+    deadline = time.monotonic() + 5
+    while not handler.metrics()["rejected"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert handler.metrics()["rejected"] > 0
+
+    consumed = []
+    while len(consumed) < 110 - dropped:
+        consumed += broker.consume(max_messages=1000, timeout=0.1)
+    handler.flush()
+    handler.close()
+    assert consumed[:10] == ["old"] * 10
+    assert len(consumed) == 110 - handler.metrics()["dropped"]
+
+
+def test_full_broker_blocks_with_block():
+    broker, handler = full_broker_handler(block=True)
+    writer = threading.Thread(target=log, args=(handler, 100))
+    writer.start()
+    time.sleep(0.2)
+    assert writer.is_alive()
+    assert handler.metrics()["queue_depth"] == 20
+
+    consumed = []
+    while writer.is_alive() or len(consumed) < 110:
+        consumed += broker.consume(max_messages=1000, timeout=0.1)
+    writer.join()
+    handler.flush()
+    handler.close()
+    assert consumed == ["old"] * 10 + [str(n) for n in range(100)]
+    assert handler.metrics()["dropped"] == 0
@@ -0,0 +1,113 @@
+import json
+import time
+
+import pytest
+
+from logease.config.settings import LogConfig
+from logease.config.watcher import ConfigWatcher
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    monkeypatch.setenv("LOGEASE_CONFIG_FILE", str(path))
+    return path
+
+
+def test_invalid_environment_values_fall_back_to_defaults(config_path, monkeypatch, capsys):
+    monkeypatch.setenv("LOG_LEVEL", "verbose")
+    monkeypatch.setenv("SMTP_PORT", "abc")
+    monkeypatch.setenv("LOG_FLIGHT_RECORDER_LEVEL", "loud")
+
+    config = LogConfig()
+
+    assert config.log_level == "DEBUG"
+    assert config.smtp_port == 587
+    assert config.flight_recorder_level == "WARNING"
+    err = capsys.readouterr().err
+    assert "'verbose' for LOG_LEVEL" in err
+    assert "'abc' for SMTP_PORT" in err
+
+
+def test_valid_environment_levels_are_normalized(config_path, monkeypatch):
+    monkeypatch.setenv("LOG_LEVEL", "info")
+    assert LogConfig().log_level == "INFO"
+
+
+def test_invalid_persisted_values_are_skipped(config_path, capsys):
+    config_path.write_text(json.dumps({"level": "FOO", "smtp_port": "abc", "smtp_server": "mail.example.com"}))
+
+    config = LogConfig()
+
+    assert config.log_level == "DEBUG"
+    assert config.smtp_port == 587
+    assert config.smtp_server == "mail.example.com"
+    err = capsys.readouterr().err
+    assert "'FOO' for level" in err
+    assert "'abc' for smtp_port" in err
+
+
+def test_invalid_values_are_rejected_before_saving(config_path):
+    config = LogConfig()
+    config.change_config_values("smtp_server", "mail.example.com")
+    with pytest.raises(ValueError, match="level"):
+        config.change_config_values("level", "FOO")
+    with pytest.raises(ValueError, match="smtp_port"):
+        config.change_config_values("smtp_port", "abc")
+    config.change_config_values("smtp_port", "2525")
+    config.save()
+
+    assert json.loads(config_path.read_text()) == {"smtp_port": "2525", "smtp_server": "mail.example.com"}
+    assert LogConfig().smtp_port == 2525
+
+
+def test_problems_are_reported_on_stderr(config_path, capsys):
+    config_path.write_text("{not json")
+    LogConfig()
+    config_path.write_text(json.dumps({"no_such_key": 1}))
+    LogConfig()
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "unreadable configuration file" in captured.err
+    assert "unknown configuration key: no_such_key" in captured.err
+
+
+def test_refresh_keeps_the_last_good_snapshot(config_path, monkeypatch):
+    config_path.write_text(json.dumps({"smtp_server": "first"}))
+    assert LogConfig.refresh().smtp_server == "first"
+
+    def broken_load(self):
+        raise RuntimeError("broken")
+
+    config_path.write_text(json.dumps({"smtp_server": "second"}))
+    monkeypatch.setattr(LogConfig, "load", broken_load)
+    with pytest.raises(RuntimeError):
+        LogConfig.refresh()
+    assert LogConfig.current().smtp_server == "first"
+    assert LogConfig.refresh() is None
+
+    monkeypatch.undo()
+    monkeypatch.setenv("LOGEASE_CONFIG_FILE", str(config_path))
+    config_path.write_text(json.dumps({"smtp_server": "third"}))
+    assert LogConfig.refresh().smtp_server == "third"
+
+
+def test_watcher_survives_failing_reloads(capsys):
+    calls = []
+
+    def reload():
+        calls.append(None)
+        if len(calls) == 1:
+            raise ValueError("bad configuration")
+
+    watcher = ConfigWatcher(0.01, reload)
+    watcher.start()
+    deadline = time.monotonic() + 5
+    while len(calls) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    watcher.stop()
+    watcher.join()
+
+    assert len(calls) >= 3
+    assert "configuration reload failed" in capsys.readouterr().err
@@ -0,0 +1,44 @@
+import time
+import threading
+
+from logease.modules.dedup import DuplicateSuppressor, SummarySweeper
+
+
+def test_repeats_are_suppressed_and_summarized_on_flush():
+    suppressor = DuplicateSuppressor(window=60)
+    verdicts = [suppressor.admit("WARNING", "retrying connection") for _ in range(1000)]
+
+    assert verdicts[0] is True
+    assert not any(verdicts[1:])
+    assert suppressor.flush() == [("WARNING", "retrying connection (repeated 999 times)")]
+
+
+def test_sweep_reports_quiet_keys_only():
+    suppressor = DuplicateSuppressor(window=0.05)
+    for _ in range(10):
+        suppressor.admit("INFO", "polling")
+    assert suppressor.sweep() == []
+
+    time.sleep(0.06)
+    assert suppressor.sweep() == [("INFO", "polling (repeated 9 times)")]
+    assert len(suppressor) == 0
+
+
+def test_sweeper_reports_a_burst_followed_by_silence():
+    suppressor = DuplicateSuppressor(window=0.05)
+    summaries = []
+    reported = threading.Event()
+
+    def callback(level, summary):
+        summaries.append((level, summary))
+        reported.set()
+
+    sweeper = SummarySweeper(suppressor, callback)
+    sweeper.start()
+    try:
+        for _ in range(1000):
+            suppressor.admit("WARNING", "retrying connection")
+        assert reported.wait(1.0)
+    finally:
+        sweeper.stop()
+    assert summaries == [("WARNING", "retrying connection (repeated 999 times)")]
@@ -0,0 +1,46 @@
+import json
+import datetime
+import dataclasses
+
+import pytest
+
+from logease.utils.encoding import JSONEncoder
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+
+PAYLOADS = [
+    {"user_id": 42, "name": "é", "ratio": 0.5, "ok": True, "missing": None},
+    {"n": 2 ** 70, "m": -(2 ** 64), "nested": [{"big": 2 ** 100}]},
+    {(1, 2): 3, 1: "int", 1.5: "float", None: "none"},
+    {"outer": {(1, "a"): [1, 2]}, 2 ** 70: "big key"},
+    {"when": datetime.datetime(2024, 8, 17, 12, 30), "point": Point(1, 2), "tags": {"a"}},
+]
+
+
+@pytest.fixture(params=["json", "orjson"])
+def backend(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    return request.param
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_backends_give_the_same_output(backend, payload):
+    assert JSONEncoder(backend).dumps(payload) == JSONEncoder("json").dumps(payload)
+
+
+def test_wide_integers_stay_numbers(backend):
+    assert json.loads(JSONEncoder(backend).dumps({"n": 2 ** 70})) == {"n": 2 ** 70}
+
+
+def test_unsupported_keys_are_converted_with_str(backend):
+    assert json.loads(JSONEncoder(backend).dumps({(1, 2): 3, 1: 4})) == {"(1, 2)": 3, "1": 4}
+
+
+def test_ndjson_writes_one_object_per_line(backend):
+    assert JSONEncoder(backend).ndjson([{"a": 1}, {"b": 2 ** 70}]) == '{"a":1}\n{"b":%d}\n' % 2 ** 70
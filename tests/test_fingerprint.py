@@ -0,0 +1,125 @@
+import time
+import logging
+import traceback
+
+import pytest
+
+from logease.decorators.detail import exception_tracer
+from logease.utils.fingerprint import TracebackCache
+
+
+def fail(message):
+    raise ValueError(message)
+
+
+def fail_elsewhere(message):
+    raise ValueError(message)
+
+
+def caught(function, message="boom"):
+    try:
+        function(message)
+    except ValueError as e:
+        return e
+
+
+def test_fingerprint_ignores_the_message_but_not_the_location():
+    first, second, other = caught(fail, "one"), caught(fail, "two"), caught(fail_elsewhere, "one")
+    assert TracebackCache.key(first) == TracebackCache.key(second)
+    assert TracebackCache.key(first) != TracebackCache.key(other)
+
+
+def test_digest_is_stable():
+    key = ("builtins", "ValueError", (("app.py", 12, "charge"), ("lib.py", 40, "call")))
+    assert TracebackCache.digest(key) == TracebackCache.digest(key)
+    assert TracebackCache.digest(key) == "11bcf3f717c2aa85"
+
+
+def test_first_occurrence_is_reported_then_a_summary_every_n_repeats():
+    cache = TracebackCache(summary_every=3, summary_interval=3600)
+    reports = [cache.observe(caught(fail, f"call {n}")) for n in range(7)]
+
+    assert reports[0].first
+    assert "ValueError: call 0" in reports[0].render()
+    assert [n for n, report in enumerate(reports) if report is not None] == [0, 3, 6]
+    assert reports[3].render() == f"ValueError: call 3 [fingerprint {reports[0].fingerprint}, seen 4 times]"
+
+
+def test_traceback_is_formatted_only_when_rendered(monkeypatch):
+    calls = []
+    format_exception = traceback.format_exception
+    monkeypatch.setattr(traceback, "format_exception", lambda *args: calls.append(args) or format_exception(*args))
+
+    report = TracebackCache().observe(caught(fail))
+    assert calls == []
+    assert report.formatted.startswith("Traceback")
+    assert report.render() == report.formatted
+    assert len(calls) == 1
+
+
+def test_sweep_reports_the_end_of_a_burst():
+    cache = TracebackCache(summary_every=100, summary_interval=0.05)
+    for _ in range(5):
+        cache.observe(caught(fail), "WARNING")
+    assert cache.sweep() == []
+
+    time.sleep(0.06)
+    [(level, summary)] = cache.sweep()
+    assert level == "WARNING"
+    assert summary.startswith("ValueError: boom [fingerprint ") and summary.endswith("seen 5 times]")
+    assert cache.sweep() == []
+    assert cache.flush() == []
+
+
+def test_flush_reports_every_unreported_repeat():
+    cache = TracebackCache(summary_every=100, summary_interval=3600)
+    cache.observe(caught(fail))
+    assert cache.flush() == []
+    cache.observe(caught(fail))
+    cache.observe(caught(fail_elsewhere))
+    cache.observe(caught(fail_elsewhere))
+    summaries = cache.flush()
+    assert len(summaries) == 2
+    assert all(summary.endswith(", seen 2 times]") for _, summary in summaries)
+
+
+def test_evicted_repeats_are_reported():
+    cache = TracebackCache(max_entries=1, summary_every=100, summary_interval=3600)
+    cache.observe(caught(fail))
+    cache.observe(caught(fail))
+    cache.observe(caught(fail_elsewhere))
+    [(level, summary)] = cache.flush()
+    assert summary.endswith("seen 2 times]")
+
+
+@pytest.fixture
+def messages():
+    from logease.modules.logger import Logger
+
+    logger = Logger().logger
+    handler = logging.Handler()
+    collected = []
+    handler.emit = lambda record: collected.append((record.levelname, record.getMessage()))
+    logger.addHandler(handler)
+    yield collected
+    logger.removeHandler(handler)
+
+
+def test_exception_tracer_summaries_are_logged_at_exit(messages):
+    from logease.modules.logger import Logger
+
+    cache = TracebackCache(summary_every=100, summary_interval=3600)
+
+    @exception_tracer(level="WARNING", cache=cache)
+    def risky():
+        raise KeyError("missing")
+
+    for _ in range(3):
+        with pytest.raises(KeyError):
+            risky()
+    assert len(messages) == 1
+
+    Logger().flush()
+    level, summary = messages[-1]
+    assert level == "WARNING"
+    assert summary.startswith("KeyError: 'missing' [fingerprint ") and summary.endswith("seen 3 times]")
@@ -0,0 +1,141 @@
+import json
+import logging
+
+import pytest
+
+from logease.config.settings import LogConfig
+from logease.decorators.detail import as_json_tracer
+from logease.modules.levels import LEVEL_TABLE, resolve_level
+from logease.modules.logger import Logger
+from logease.utils.encoding import JSONFormatter
+
+
+@pytest.fixture
+def logger(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOGEASE_CONFIG_FILE", str(tmp_path / "config.json"))
+    monkeypatch.setenv("LOGEASE_CONFIG_WATCH_INTERVAL", "0")
+    logger = Logger()
+    logger.reload()
+    yield logger
+    for target in [None, *logger.levels.runtime_overrides]:
+        logger.clear_level(target)
+    logger.levels.configure("DEBUG", {})
+    logger.setup(LogConfig())
+
+
+def save(**values):
+    config = LogConfig()
+    for key, value in values.items():
+        config.change_config_values(key, value)
+    config.save()
+
+
+def test_reload_keeps_runtime_levels_when_levels_did_not_change(logger):
+    logger.set_level("ERROR")
+    logger.set_level("WARNING", "myapp.payments")
+
+    save(dedup_max_keys=10)
+    assert logger.reload()
+
+    assert logger.levels.root_level == logging.ERROR
+    assert logger.levels.override("myapp.payments.charge") == logging.WARNING
+
+
+def test_reload_of_changed_levels_keeps_runtime_levels_on_top(logger):
+    logger.set_level("ERROR")
+    logger.set_level("WARNING", "myapp.payments")
+
+    save(level="INFO", levels="myapp.payments=DEBUG,myapp.jobs=CRITICAL")
+    assert logger.reload()
+
+    assert logger.levels.root_level == logging.ERROR
+    assert logger.levels.override("myapp.payments.charge") == logging.WARNING
+    assert logger.levels.override("myapp.jobs.run") == logging.CRITICAL
+
+    logger.clear_level()
+    logger.clear_level("myapp.payments")
+    assert logger.levels.root_level == logging.INFO
+    assert logger.levels.override("myapp.payments.charge") == logging.DEBUG
+
+
+def test_reload_skips_invalid_persisted_levels(logger, tmp_path, capsys):
+    (tmp_path / "config.json").write_text('{"level": "FOO", "levels": "myapp=LOUD", "smtp_port": "abc"}')
+    assert logger.reload()
+
+    assert logger.levels.root_level == logging.DEBUG
+    assert logger.levels.override("myapp.jobs") is None
+    assert "'FOO' for level" in capsys.readouterr().err
+
+
+def test_as_json_tracer_encodes_wide_integers(logger):
+    entries = []
+    handler = logging.Handler()
+    handler.setFormatter(JSONFormatter())
+    handler.emit = lambda record: entries.append(json.loads(handler.format(record)))
+    logger.logger.addHandler(handler)
+    try:
+        @as_json_tracer()
+        def big():
+            return 2 ** 70
+
+        big()
+    finally:
+        logger.logger.removeHandler(handler)
+
+    assert entries[-1]["return_value"] == 2 ** 70
+
+
+@pytest.fixture
+def records(logger):
+    collected = []
+    handler = logging.Handler()
+    handler.emit = collected.append
+    logger.logger.addHandler(handler)
+    yield collected
+    logger.logger.removeHandler(handler)
+
+
+def test_lazy_fields_are_evaluated_only_for_records_that_pass_the_level(logger, records):
+    calls = []
+
+    def expensive():
+        calls.append(1)
+        return 42
+
+    logger.set_level("WARNING")
+    logger.debug("skipped", answer=expensive)
+    logger.info("skipped", answer=expensive)
+    assert calls == []
+    assert records == []
+
+    logger.warning("kept", answer=expensive, plain="value")
+    assert calls == [1]
+    assert records[-1].fields == {"answer": 42, "plain": "value"}
+
+
+def test_failing_lazy_field_is_replaced_by_the_error(logger, records):
+    logger.info("state", size=lambda: 1 / 0)
+    assert records[-1].fields == {"size": "<ZeroDivisionError: division by zero>"}
+
+
+@pytest.mark.parametrize("name", ["message", "level", "timestamp"])
+def test_reserved_field_names_are_rejected(logger, records, name):
+    with pytest.raises(TypeError, match=f"names {name} are reserved"):
+        logger.info("login", **{name: "x"})
+    with pytest.raises(TypeError, match="reserved"):
+        logger.log("login", "INFO", fields={name: "x"})
+    assert records == []
+
+
+@pytest.mark.parametrize("level", ["warning", "WARNING", "Warning", 30])
+def test_level_table_resolves_common_spellings(level):
+
+    assert LEVEL_TABLE[level] == ("WARNING", 30)
+    assert resolve_level(level) == ("WARNING", 30)
+
+
+def test_unusual_level_spellings_fall_back_to_upper_case():
+
+    assert resolve_level("wArNiNg") == ("WARNING", 30)
+    with pytest.raises(ValueError, match="Unsupported log level: LOUD"):
+        resolve_level("LOUD")
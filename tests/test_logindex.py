@@ -0,0 +1,47 @@
+import logging
+
+import pytest
+
+from logease.utils.encoding import JSONFormatter
+from logease.utils.logindex import LogIndex, parse_time
+
+TEXT_FORMATTER = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+
+def write_records(path, formatter, count=300, start=1_700_000_000.0):
+    with open(path, "w") as stream:
+        for i in range(count):
+            level = logging.ERROR if i % 10 == 0 else logging.INFO
+            record = logging.makeLogRecord(
+                {"name": "app", "msg": f"record {i}", "levelno": level, "levelname": logging.getLevelName(level)}
+            )
+            record.created = start + i
+            record.msecs = 0
+            stream.write(formatter.format(record) + "\n")
+    return start
+
+
+@pytest.mark.parametrize("formatter", [TEXT_FORMATTER, JSONFormatter()], ids=["text", "json"])
+def test_search_by_time_and_level(tmp_path, formatter):
+    path = tmp_path / "app.log"
+    start = write_records(path, formatter)
+    index = LogIndex(str(path), block_size=512)
+
+    records = list(index.search(start=start + 100, end=start + 200, levels={"ERROR"}))
+
+    assert len(records) == 10
+    assert b"record 100" in records[0] and b"record 190" in records[-1]
+    assert len(index.offsets) > 1
+
+
+def test_search_rejects_files_without_records(tmp_path):
+    path = tmp_path / "other.log"
+    path.write_text("not a log line\nnor this one\n")
+
+    with pytest.raises(ValueError):
+        list(LogIndex(str(path)).search())
+
+
+def test_parse_time_rejects_unknown_values():
+    with pytest.raises(ValueError, match="yesterday"):
+        parse_time("yesterday")
@@ -0,0 +1,42 @@
+import gzip
+import logging
+
+from logease.handlers.offload import ProcessPoolHandler
+
+
+def make_logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.handlers = [handler]
+    return logger
+
+
+def test_records_are_formatted_in_workers_and_written_in_order(tmp_path):
+    path = tmp_path / "app.log"
+    target = logging.FileHandler(path)
+    target.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    handler = ProcessPoolHandler(target, workers=2, chunk_size=64)
+    logger = make_logger("test.offload.text", handler)
+
+    for i in range(500):
+        logger.info("record %d", i)
+    handler.close()
+
+    assert path.read_text().splitlines() == [f"INFO record {i}" for i in range(500)]
+    assert handler.metrics()["offload_dropped"] == 0
+
+
+def test_compressed_chunks_form_a_valid_gzip_file(tmp_path):
+    path = tmp_path / "app.log.gz"
+    target = logging.FileHandler(path)
+    target.setFormatter(logging.Formatter("%(message)s"))
+    handler = ProcessPoolHandler(target, workers=1, chunk_size=50, compress=True)
+    logger = make_logger("test.offload.gzip", handler)
+
+    for i in range(200):
+        logger.info("record %d", i)
+    handler.close()
+
+    with gzip.open(path, "rt") as stream:
+        assert stream.read().splitlines() == [f"record {i}" for i in range(200)]
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import threading
+
+import pytest
+
+from logease.modules.logger import Logger
+from logease.modules.recorder import FlightRecorder
+
+
+@pytest.fixture
+def target():
+    logger = logging.getLogger("logease-test-recorder")
+    logger.propagate = False
+    collected = []
+    handler = logging.Handler()
+    handler.emit = collected.append
+    logger.addHandler(handler)
+    yield logger, collected
+    logger.removeHandler(handler)
+
+
+def test_dump_replays_the_last_records_of_the_current_thread(target):
+    logger, collected = target
+    recorder = FlightRecorder(capacity=3, level="WARNING")
+    assert recorder.buffers("INFO") and not recorder.buffers("WARNING")
+
+    for n in range(5):
+        recorder.record("DEBUG", f"step {n}", {"n": lambda n=n: n})
+    other = threading.Thread(target=recorder.record, args=("INFO", "other thread"))
+    other.start()
+    other.join()
+
+    assert recorder.dump(logger) == 3
+    assert [record.getMessage() for record in collected] == ["step 2", "step 3", "step 4"]
+    assert [record.fields for record in collected] == [{"n": 2}, {"n": 3}, {"n": 4}]
+    assert all(record.flight_recorder and record.levelno == logging.DEBUG for record in collected)
+    assert recorder.dump(logger) == 0
+
+
+def test_tasks_keep_separate_buffers(target):
+    logger, collected = target
+    recorder = FlightRecorder(capacity=10)
+
+    async def work(name, fail):
+        recorder.record("INFO", f"{name} started")
+        await asyncio.sleep(0)
+        if fail:
+            recorder.dump(logger)
+
+    async def main():
+        await asyncio.gather(work("a", fail=False), work("b", fail=True))
+
+    asyncio.run(main())
+    assert [record.getMessage() for record in collected] == ["b started"]
+
+
+def test_error_dumps_the_buffered_records_before_itself(target):
+    logger, collected = target
+    app = Logger()
+    app.logger.addHandler(logger.handlers[0])
+    app.enable_flight_recorder(capacity=10, level="WARNING")
+    try:
+        app.info("loading cart")
+        app.debug("cache miss")
+        assert collected == []
+
+        app.error("payment failed")
+        assert [record.getMessage() for record in collected] == ["loading cart", "cache miss", "payment failed"]
+    finally:
+        app.disable_flight_recorder()
+        app.logger.removeHandler(logger.handlers[0])
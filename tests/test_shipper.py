@@ -0,0 +1,241 @@
+import json
+import socket
+import asyncio
+import threading
+from collections import Counter
+
+import pytest
+
+from logease.handlers.resilience import CircuitBreaker, RetryPolicy
+from logease.handlers.shipper import AsyncHTTPShipper
+
+
+class Collector:
+    """
+    A keep-alive HTTP server on its own loop and thread that answers requests in order, each
+    after `delay` seconds, and counts the records of the requests it accepts.
+    """
+
+    def __init__(self, delay=0.0, statuses=(), port=0):
+        self.delay = delay
+        self.port = port
+        self.statuses = list(statuses)
+        self.records = Counter()
+        self.requests = 0
+        self.max_outstanding = 0
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self._serve, args=(ready,), daemon=True)
+        self.thread.start()
+        ready.wait()
+
+    def _serve(self, ready):
+        asyncio.set_event_loop(self.loop)
+        self.server = self.loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", self.port))
+        self.port = self.server.sockets[0].getsockname()[1]
+        ready.set()
+        self.loop.run_forever()
+
+    async def _handle(self, reader, writer):
+        pending = asyncio.Queue()
+        outstanding = 0
+
+        async def respond():
+            nonlocal outstanding
+            while True:
+                body = await pending.get()
+                await asyncio.sleep(self.delay)
+                status = self.statuses.pop(0) if self.statuses else 200
+                if status < 300:
+                    self.records.update(line["message"] for line in map(json.loads, body.splitlines()))
+                writer.write(b"HTTP/1.1 %d X\r\nContent-Length: 0\r\n\r\n" % status)
+                outstanding -= 1
+
+        responder = asyncio.ensure_future(respond())
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+                body = await reader.readexactly(length)
+                self.requests += 1
+                outstanding += 1
+                self.max_outstanding = max(self.max_outstanding, outstanding)
+                pending.put_nowait(body)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            while not pending.empty() or outstanding:
+                await asyncio.sleep(0.01)
+            responder.cancel()
+            writer.close()
+
+    def url(self):
+        return f"http://127.0.0.1:{self.port}/logs"
+
+    async def _shutdown(self):
+        self.server.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+        self.loop.close()
+
+
+@pytest.fixture
+def collector():
+    servers = []
+
+    def start(**kwargs):
+        servers.append(Collector(**kwargs))
+        return servers[-1]
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def entries(count):
+    return [json.dumps({"message": str(n)}) for n in range(count)]
+
+
+def assert_exactly_once(server, count):
+    assert set(server.records) == {str(n) for n in range(count)}
+    assert max(server.records.values()) == 1
+
+
+def test_aclose_sends_every_record_once(collector):
+    server = collector()
+
+    async def main():
+        shipper = AsyncHTTPShipper(server.url(), batch_size=50, linger=0.01)
+        shipper.start()
+        for entry in entries(500):
+            await shipper.put(entry)
+        await shipper.aclose()
+        return shipper
+
+    shipper = asyncio.run(main())
+    assert_exactly_once(server, 500)
+    assert shipper.metrics()["sent"] == 500
+
+
+def test_loop_shutdown_sends_every_record_once(collector):
+    # Responses are slow, so the loop shuts down while pipelined requests are still unanswered.
+    server = collector(delay=0.05)
+    shipper = AsyncHTTPShipper(server.url(), batch_size=100, pipeline=4, timeout=10)
+    for entry in entries(3000):
+        shipper.submit(entry)
+
+    async def main():
+        shipper.start()
+        await asyncio.sleep(0.08)
+
+    asyncio.run(main())
+    assert_exactly_once(server, 3000)
+    assert shipper.metrics()["sent"] == 3000
+
+
+def test_ready_batches_are_pipelined(collector):
+    server = collector(delay=0.02)
+    shipper = AsyncHTTPShipper(server.url(), batch_size=100, pipeline=4)
+    for entry in entries(800):
+        shipper.submit(entry)
+
+    async def main():
+        shipper.start()
+        await shipper.aclose()
+
+    asyncio.run(main())
+    assert_exactly_once(server, 800)
+    assert server.requests == 8
+    assert server.max_outstanding == 4
+
+
+def test_retryable_status_is_retried(collector):
+    server = collector(statuses=[503])
+
+    async def main():
+        shipper = AsyncHTTPShipper(server.url(), batch_size=10, retry=RetryPolicy(backoff=0.01))
+        shipper.start()
+        for entry in entries(10):
+            await shipper.put(entry)
+        await shipper.aclose()
+        return shipper
+
+    shipper = asyncio.run(main())
+    assert server.requests == 2
+    assert_exactly_once(server, 10)
+    assert shipper.metrics()["sent"] == 10
+    assert shipper.metrics()["dropped"] == 0
+
+
+def test_queue_bound_drops_overflow(collector):
+    server = collector()
+
+    async def main():
+        shipper = AsyncHTTPShipper(server.url(), max_queue=10)
+        shipper.start()
+        accepted = [shipper.submit(entry) for entry in entries(25)]
+        assert shipper.metrics()["queue_depth"] == 10
+        await shipper.aclose()
+        return shipper, accepted
+
+    shipper, accepted = asyncio.run(main())
+    assert accepted.count(True) == 10
+    assert shipper.metrics()["dropped"] == 15
+    assert_exactly_once(server, 10)
+
+
+def test_queue_bound_applies_before_start():
+    shipper = AsyncHTTPShipper("http://127.0.0.1:9/logs", max_queue=10)
+    accepted = [shipper.submit(entry) for entry in entries(12)]
+    assert accepted.count(False) == 2
+    assert shipper.metrics() == {
+        "sent": 0,
+        "dropped": 2,
+        "requests": 0,
+        "queue_depth": 10,
+        "breaker_state": shipper.breaker.state,
+    }
+
+
+def test_failed_probe_opens_the_breaker_again(collector):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    url = f"http://127.0.0.1:{port}/logs"
+
+    async def ship(shipper, first):
+        for entry in entries(10):
+            await shipper.put(entry.replace('"0"', f'"{first}"'))
+        await shipper.flush()
+
+    async def main():
+        shipper = AsyncHTTPShipper(
+            url, batch_size=10, retry=RetryPolicy(retries=1, backoff=0.01), breaker=CircuitBreaker(1, 0.2)
+        )
+        shipper.start()
+        await ship(shipper, "down")
+        assert shipper.breaker.state == CircuitBreaker.OPEN
+
+        # The endpoint is still down when the breaker lets the probe through.
+        await asyncio.sleep(0.25)
+        await ship(shipper, "probe")
+        assert shipper.breaker.state == CircuitBreaker.OPEN
+
+        server = collector(port=port)
+        await asyncio.sleep(0.25)
+        await ship(shipper, "up")
+        await shipper.aclose()
+        return shipper, server
+
+    shipper, server = asyncio.run(main())
+    assert shipper.breaker.state == CircuitBreaker.CLOSED
+    assert shipper.metrics()["sent"] == 10
+    assert shipper.metrics()["dropped"] == 20
+    assert server.records["up"] == 1
@@ -0,0 +1,135 @@
+import io
+import logging
+import threading
+
+import pytest
+
+from logease.handlers.threadbuffer import ThreadBufferHandler
+from logease.utils.ring import SPSCBuffer
+
+
+class Collector(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.closed = False
+        self.entered = threading.Event()
+        self.unblocked = threading.Event()
+        self.unblocked.set()
+
+    def emit(self, record):
+        self.entered.set()
+        self.unblocked.wait()
+        self.messages.append(record.getMessage())
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+def record(msg, args=(), created=None, level=logging.INFO):
+    attributes = {"msg": msg, "args": args, "levelno": level, "levelname": logging.getLevelName(level)}
+    if created is not None:
+        attributes["created"] = created
+    return logging.makeLogRecord(attributes)
+
+
+@pytest.fixture
+def collector():
+    return Collector()
+
+
+def test_buffer_keeps_order_across_the_wrap_around():
+    buffer = SPSCBuffer(4)
+    for n in range(3):
+        assert buffer.push(n)
+    assert buffer.take() == [0, 1, 2]
+    for n in range(3, 7):
+        assert buffer.push(n)
+    assert len(buffer) == 4
+    assert buffer.take() == [3, 4, 5, 6]
+    assert buffer.take() == []
+
+
+def test_full_buffer_refuses_items():
+    buffer = SPSCBuffer(2)
+    assert [buffer.push(n) for n in range(3)] == [True, True, False]
+    assert buffer.take() == [0, 1]
+    assert buffer.push(2)
+
+    with pytest.raises(ValueError):
+        SPSCBuffer(0)
+
+
+def test_records_of_all_threads_are_merged_by_timestamp(collector):
+    handler = ThreadBufferHandler([collector], interval=60)
+
+    def log(times):
+        for created in times:
+            handler.handle(record(str(created), created=created))
+
+    threads = [threading.Thread(target=log, args=(times,)) for times in ([1.0, 3.0, 5.0], [2.0, 4.0, 6.0])]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    handler.flush()
+
+    assert collector.messages == ["1.0", "2.0", "3.0", "4.0", "5.0", "6.0"]
+    assert handler.metrics()["thread_buffers"] == 0
+    handler.close()
+
+
+def test_full_buffer_drops_records_after_the_timeout(collector):
+    handler = ThreadBufferHandler([collector], capacity=4, interval=60, timeout=0.05)
+    collector.unblocked.clear()
+    handler.handle(record("0"))
+    handler.handle(record("1"))
+    # The drainer is now stuck delivering the first records.
+    assert collector.entered.wait(5)
+    for n in range(2, 7):
+        handler.handle(record(str(n)))
+    assert handler.dropped == 1
+
+    collector.unblocked.set()
+    handler.flush()
+    assert collector.messages == [str(n) for n in range(6)]
+    handler.close()
+
+
+def test_flush_writes_stream_records_at_once_and_applies_levels():
+    stream = io.StringIO()
+    console = logging.StreamHandler(stream)
+    console.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    console.setLevel(logging.INFO)
+    handler = ThreadBufferHandler([console], interval=60)
+
+    handler.handle(record("hidden", level=logging.DEBUG))
+    handler.handle(record("user %s", ("ada",)))
+    handler.handle(record("disk %d%% full", (93,), level=logging.WARNING))
+    assert stream.getvalue() == ""
+
+    handler.flush()
+    assert stream.getvalue() == "INFO user ada\nWARNING disk 93% full\n"
+    handler.close()
+
+
+def test_close_delivers_the_buffered_records_and_closes_the_targets(collector):
+    handler = ThreadBufferHandler([collector], interval=60)
+    handler.handle(record("last words"))
+    handler.close()
+
+    assert collector.messages == ["last words"]
+    assert collector.closed
+    assert not handler._thread.is_alive()
+
+
+def test_message_is_rendered_before_the_arguments_change(collector):
+    handler = ThreadBufferHandler([collector], interval=60)
+    items = ["a"]
+    handler.handle(record("items: %s", (items,)))
+    items.append("b")
+    handler.flush()
+
+    assert collector.messages == ["items: ['a']"]
+    handler.close()
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+
+import pytest
+
+from logease.decorators.tracer import class_tracer
+from logease.modules.logger import Logger
+
+
+@pytest.fixture
+def messages():
+    logger = Logger().logger
+    collected = []
+    handler = logging.Handler()
+    handler.emit = lambda record: collected.append(record.getMessage())
+    logger.addHandler(handler)
+    yield collected
+    logger.removeHandler(handler)
+
+
+def test_class_is_instrumented_in_place(messages):
+    class Base:
+        __slots__ = ()
+
+    @class_tracer(level="DEBUG", exclude=("health*",))
+    class OrderService(Base):
+        __slots__ = ("orders",)
+
+        def __init__(self):
+            self.orders = []
+
+        def place(self, order_id):
+            self.orders.append(order_id)
+            return order_id
+
+        def health(self):
+            return "ok"
+
+        def _internal(self):
+            return "hidden"
+
+        @staticmethod
+        def tax(amount):
+            return amount * 0.2
+
+        @classmethod
+        def create(cls):
+            return cls()
+
+        async def ship(self, order_id):
+            return f"shipped {order_id}"
+
+    assert OrderService.__name__ == "OrderService"
+    assert OrderService.__mro__ == (OrderService, Base, object)
+    service = OrderService.create()
+    assert isinstance(service, OrderService)
+    assert not hasattr(service, "__dict__")
+    messages.clear()
+
+    assert service.place(5) == 5
+    assert service.health() == "ok"
+    assert service._internal() == "hidden"
+    assert OrderService.tax(10) == 2.0
+    assert asyncio.run(service.ship(5)) == "shipped 5"
+
+    assert messages == [
+        "Calling method place with args: (5,), kwargs: {}",
+        "Method place returned 5",
+        "Calling method tax with args: (10,), kwargs: {}",
+        "Method tax returned 2.0",
+        "Calling method ship with args: (5,), kwargs: {}",
+        "Method ship returned shipped 5",
+    ]
+
+
+def test_exceptions_are_logged_and_reraised(messages):
+    @class_tracer
+    class Payments:
+        def charge(self):
+            raise RuntimeError("card declined")
+
+    with pytest.raises(RuntimeError):
+        Payments().charge()
+    assert messages[-1] == "Method charge raised an exception: card declined"